@@ -1,7 +1,8 @@
 import pandas as pd
+import numpy as np
 from typing import Dict, Any, List
 
-def calculate_benchmark(data: pd.DataFrame, initial_capital: float) -> Dict[str, Any]:
+def calculate_benchmark(data: pd.DataFrame, initial_capital: float, max_points: int = 0) -> Dict[str, Any]:
     """
     Simulates a Buy & Hold Benchmark.
     Buys at first Close, Holds until last Close.
@@ -10,6 +11,7 @@ def calculate_benchmark(data: pd.DataFrame, initial_capital: float) -> Dict[str,
     Args:
         data: DataFrame with at least 'Close' column.
         initial_capital: Starting cash.
+        max_points: If set, only every k-th point (plus the last) is kept in the curve.
         
     Returns:
         Dict containing benchmark equity curve and metrics.
@@ -25,8 +27,16 @@ def calculate_benchmark(data: pd.DataFrame, initial_capital: float) -> Dict[str,
     equity_series = (data['Close'] / entry_price) * initial_capital
     
     # Create Equity Curve List
+    curve_series = equity_series
+    if max_points > 0 and len(equity_series) > max_points:
+        stride = -(-len(equity_series) // max_points)
+        keep = np.zeros(len(equity_series), dtype=bool)
+        keep[::stride] = True
+        keep[-1] = True
+        curve_series = equity_series[keep]
+
     equity_curve = []
-    for date, value in equity_series.items():
+    for date, value in curve_series.items():
         equity_curve.append({
             "date": date,
             "equity": value,
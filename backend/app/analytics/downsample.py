@@ -0,0 +1,143 @@
+"""
+Shape-preserving downsampling of equity curves for charting.
+
+Both methods work on one or several series over the same bars (e.g. a strategy and its
+benchmark) and return one shared set of bar indices, so the downsampled curves stay
+aligned on the same dates:
+
+  - "minmax": splits the bars into buckets and keeps each series' lowest and highest
+    bar per bucket. Fully vectorized; every peak and drawdown trough survives, so the
+    max drawdown read off the chart matches the full-resolution one.
+  - "lttb": Largest-Triangle-Three-Buckets keeps the bar per bucket that forms the
+    largest triangle with its neighbours (smoother lines, one bar per bucket).
+
+The first and last bars are always kept, as are any `keep` indices (e.g. trade dates)
+that fit in half the budget.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+
+DOWNSAMPLE_METHODS = ("minmax", "lttb")
+
+def _as_series(values) -> np.ndarray:
+    y = np.asarray(values, dtype=np.float64)
+    return y.reshape(1, -1) if y.ndim == 1 else y
+
+def minmax_indices(values, max_points: int) -> np.ndarray:
+    """Indices of each series' min and max per bucket, plus the first and last bar."""
+    y = _as_series(values)
+    k, n = y.shape
+    if max_points <= 0 or n <= max_points:
+        return np.arange(n)
+    buckets = (max_points - 2) // (2 * k)
+    if buckets < 1:
+        raise ValueError(f"max_points must be at least {2 + 2 * k} for {k} series")
+
+    m = n - 2
+    size = -(-m // buckets)
+    buckets = -(-m // size)
+    lows = np.full((k, buckets * size), np.inf)
+    highs = np.full((k, buckets * size), -np.inf)
+    lows[:, :m] = highs[:, :m] = y[:, 1:-1]
+    offsets = 1 + np.arange(buckets) * size
+
+    picks = np.concatenate([
+        (lows.reshape(k, buckets, size).argmin(axis=2) + offsets).ravel(),
+        (highs.reshape(k, buckets, size).argmax(axis=2) + offsets).ravel(),
+    ])
+    return np.unique(np.concatenate(([0, n - 1], picks)))
+
+def lttb_indices(values, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets over bar positions. With several series each is
+    scaled to unit range and their triangle areas are summed.
+    """
+    y = _as_series(values)
+    n = y.shape[1]
+    if max_points <= 0 or n <= max_points:
+        return np.arange(n)
+    if max_points < 3:
+        raise ValueError("max_points must be at least 3")
+
+    span = np.ptp(y, axis=1, keepdims=True)
+    span[span == 0] = 1.0
+    y = y / span
+    x = np.arange(n, dtype=np.float64)
+
+    # max_points - 2 buckets over the interior bars; the last bucket's "next" is the final bar
+    edges = np.append(np.linspace(1, n - 1, max_points - 1).astype(np.int64), n)
+    out = np.empty(max_points, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi, next_hi = edges[i], edges[i + 1], edges[i + 2]
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[:, hi:next_hi].mean(axis=1, keepdims=True)
+        ya = y[:, a:a + 1]
+        area = np.abs((x[a] - avg_x) * (y[:, lo:hi] - ya) - (x[a] - x[lo:hi]) * (avg_y - ya)).sum(axis=0)
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+def downsample_indices(
+    values,
+    max_points: int,
+    method: str = "minmax",
+    keep: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """
+    Sorted indices of the bars to keep (at most `max_points`). `keep` indices are
+    always included if they fit in half the budget, and otherwise ignored.
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}'. Available: {list(DOWNSAMPLE_METHODS)}")
+    n = _as_series(values).shape[1]
+    if max_points <= 0 or n <= max_points:
+        return np.arange(n)
+
+    forced = np.unique(np.asarray(keep if keep is not None else [], dtype=np.int64))
+    forced = forced[(forced > 0) & (forced < n - 1)]
+    if len(forced) > max_points // 2:
+        forced = forced[:0]
+
+    select = minmax_indices if method == "minmax" else lttb_indices
+    indices = select(values, max_points - len(forced))
+    if len(forced):
+        indices = np.union1d(indices, forced)
+    return indices
+
+def downsample_curves(
+    curves: List[Optional[List[Dict[str, Any]]]],
+    max_points: int,
+    method: str = "minmax",
+    key: str = "equity",
+    keep_dates: Optional[Sequence[Any]] = None,
+) -> List[Optional[List[Dict[str, Any]]]]:
+    """
+    Downsamples equity curves (lists of {"date", key, ...} points). Curves of the same
+    length are treated as the same bars and share one index selection (missing curves
+    stay None); `keep_dates` are looked up on the first curve.
+    """
+    present = [curve for curve in curves if curve]
+    if max_points <= 0 or not present:
+        return curves
+
+    reference = present[0]
+    if any(len(curve) != len(reference) for curve in present):
+        # Not on the same bars: downsample each on its own
+        return [
+            downsample_curves([curve], max_points, method, key, keep_dates)[0] if curve else curve
+            for curve in curves
+        ]
+    if len(reference) <= max_points:
+        return curves
+
+    keep = None
+    if keep_dates:
+        positions = {point["date"]: i for i, point in enumerate(reference)}
+        keep = [positions[date] for date in keep_dates if date in positions]
+
+    values = np.array([[point[key] for point in curve] for curve in present], dtype=np.float64)
+    indices = downsample_indices(values, max_points, method, keep)
+    return [[curve[i] for i in indices] if curve else curve for curve in curves]
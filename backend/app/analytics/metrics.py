@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
+from backend.app.engine.ledger import TradeLedger
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,10 +9,86 @@ logger = logging.getLogger(__name__)
 # Annualization factor for daily data
 TRADING_DAYS = 252
 
-def calculate_metrics(equity_curve: List[Dict[str, Any]], trades: List[Dict[str, Any]], initial_capital: float) -> Dict[str, float]:
+# Closed trades: the engine's ledger, or plain TradeRecord-shaped dicts
+Trades = Union[TradeLedger, List[Dict[str, Any]]]
+
+class EquityAccumulator:
+    """
+    Running equity statistics (Welford mean/variance of returns, running peak and
+    drawdown), updated once per bar. Lets `calculate_metrics` produce the same equity
+    metrics without the full curve in memory (e.g. when the stored curve is downsampled).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.first_date = None
+        self.last_date = None
+        self.final_equity = None
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        self.return_count = 0
+        self.return_mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, date, equity: float):
+        if self.count:
+            ret = equity / self.final_equity - 1.0
+            self.return_count += 1
+            delta = ret - self.return_mean
+            self.return_mean += delta / self.return_count
+            self._m2 += delta * (ret - self.return_mean)
+        else:
+            self.first_date = date
+        self.count += 1
+        self.last_date = date
+        self.final_equity = equity
+
+        if equity > self.peak:
+            self.peak = equity
+        if self.peak > 0:
+            drawdown = (equity - self.peak) / self.peak
+            if drawdown < self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    @classmethod
+    def from_array(cls, equity: np.ndarray, first_date, last_date) -> "EquityAccumulator":
+        """The statistics of a whole equity series at once (same as calling `update` per bar)."""
+        stats = cls()
+        equity = np.asarray(equity, dtype=np.float64)
+        if not len(equity):
+            return stats
+        stats.count = len(equity)
+        stats.first_date, stats.last_date = first_date, last_date
+        stats.final_equity = float(equity[-1])
+
+        peak = np.maximum.accumulate(equity)
+        stats.peak = float(peak[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, (equity - peak) / peak, 0.0)
+        stats.max_drawdown = min(0.0, float(drawdown.min()))
+
+        if len(equity) > 1:
+            returns = equity[1:] / equity[:-1] - 1.0
+            stats.return_count = len(returns)
+            stats.return_mean = float(returns.mean())
+            stats._m2 = float(((returns - stats.return_mean) ** 2).sum())
+        return stats
+
+    @property
+    def return_std(self) -> float:
+        """Sample standard deviation (ddof=1), matching pandas."""
+        return np.sqrt(self._m2 / (self.return_count - 1)) if self.return_count > 1 else np.nan
+
+def calculate_metrics(
+    equity_curve: List[Dict[str, Any]],
+    trades: Trades,
+    initial_capital: float,
+    equity_stats: Optional[EquityAccumulator] = None
+) -> Dict[str, float]:
     """
     Calculates Performance Metrics based on equity curve and trade list.
     Robustly handles edge cases like empty data, insufficient periods, or no trades.
+    If `equity_stats` is given, equity metrics come from it instead of the curve.
     
     Returns default zeroed metrics on failure rather than crashing.
     """
@@ -29,6 +106,9 @@ def calculate_metrics(equity_curve: List[Dict[str, Any]], trades: List[Dict[str,
         "total_trades": len(trades) if trades else 0
     }
 
+    if equity_stats is not None:
+        return _metrics_from_stats(metrics, equity_stats, trades, initial_capital)
+
     # Guard: Empty Equity Curve
     if not equity_curve:
         logger.warning("calculate_metrics called with empty equity_curve.")
@@ -93,22 +173,52 @@ def calculate_metrics(equity_curve: List[Dict[str, Any]], trades: List[Dict[str,
         # Return whatever we calculated so far, or defaults
         return metrics
 
+    return _trade_metrics(metrics, trades)
+
+def _metrics_from_stats(
+    metrics: Dict[str, float],
+    stats: EquityAccumulator,
+    trades: Trades,
+    initial_capital: float
+) -> Dict[str, float]:
+    """Equity metrics from streaming accumulators (same definitions as the curve-based path)."""
+    if stats.count < 2:
+        logger.warning("Insufficient data points (< 2) for metric calculation.")
+        return metrics
+
+    final_equity = stats.final_equity
+    metrics["total_return"] = (final_equity - initial_capital) / initial_capital
+    metrics["volatility"] = stats.return_std * np.sqrt(TRADING_DAYS)
+    if metrics["volatility"] > 1e-9:
+        metrics["sharpe_ratio"] = stats.return_mean * TRADING_DAYS / metrics["volatility"]
+    metrics["max_drawdown"] = stats.max_drawdown
+
+    days = (pd.Timestamp(stats.last_date) - pd.Timestamp(stats.first_date)).days
+    if days > 0 and final_equity > 0 and initial_capital > 0:
+        metrics["cagr"] = (final_equity / initial_capital) ** (1 / (days / 365.25)) - 1
+
+    return _trade_metrics(metrics, trades)
+
+def _trade_metrics(metrics: Dict[str, float], trades: Trades) -> Dict[str, float]:
     # 6. Trade Metrics
     if trades:
         try:
-            pnls = [t.get('pnl_net', 0.0) for t in trades]
-            winning_trades = [p for p in pnls if p > 0]
-            losing_trades = [p for p in pnls if p <= 0]
+            if isinstance(trades, TradeLedger):
+                pnls = trades["pnl_net"]
+            else:
+                pnls = np.array([t.get('pnl_net', 0.0) for t in trades], dtype=np.float64)
+            winning_trades = pnls[pnls > 0]
+            losing_trades = pnls[pnls <= 0]
             
             total_trades = len(pnls)
             
             if total_trades > 0:
                 metrics["win_rate"] = len(winning_trades) / total_trades
             
-            metrics["avg_trade_net_pnl"] = np.mean(pnls) if pnls else 0.0
+            metrics["avg_trade_net_pnl"] = float(np.mean(pnls)) if total_trades else 0.0
             
-            gross_profit = sum(winning_trades)
-            gross_loss = abs(sum(losing_trades))
+            gross_profit = float(winning_trades.sum())
+            gross_loss = abs(float(losing_trades.sum()))
             
             if gross_loss > 1e-9:
                 metrics["profit_factor"] = gross_profit / gross_loss
@@ -1,39 +1,28 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from backend.app.schemas.request import BacktestRequest
 from backend.app.schemas.response import BacktestResponse
-from backend.app.data.market_data import market_data_service, DataValidationError
-from backend.app.engine.backtester import Backtester
-
-# Strategy Imports
-from backend.app.strategies.ma_crossover import MaCrossover
-try:
-    from backend.app.strategies.rsi_mean_reversion import RsiMeanReversion
-except ImportError:
-    RsiMeanReversion = None
-
-try:
-    from backend.app.strategies.momentum import MomentumStrategy
-except ImportError:
-    MomentumStrategy = None
-
-from backend.app.analytics.metrics import calculate_metrics
-from backend.app.analytics.benchmark import calculate_benchmark
+from backend.app.data.validators import DataValidationError
+from backend.app.strategies import strategy_registry
 from backend.app.core.config import settings
+from backend.app.utils.artifact_store import artifact_store
+from backend.app.utils.profiling import profile_call
 import logging
 import traceback
-import pandas as pd
-import numpy as np
 import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+# The engine, data provider and analytics (Backtrader, yfinance, pandas) are imported
+# inside the functions that use them, so importing the app stays fast
+if TYPE_CHECKING:
+    import pandas as pd
+    from backend.app.engine.journal import EventJournal
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Centralized Strategy Registry
-STRATEGY_MAP = {
-    "ma_crossover": MaCrossover,
-    "rsi_mean_reversion": RsiMeanReversion,
-    "momentum": MomentumStrategy
-}
+# Centralized Strategy Registry (lazy: strategies are imported on first lookup)
+STRATEGY_MAP = strategy_registry
 
 def sanitize_float(value: float) -> float:
     """Safely convert Infinity/NaN to 0.0 for JSON serialization."""
@@ -43,83 +32,218 @@ def sanitize_float(value: float) -> float:
         return 0.0
     return float(value)
 
-@router.post("/backtest", response_model=BacktestResponse)
-async def run_backtest(request: BacktestRequest):
+def resolve_strategy(name: str):
+    """Looks up a registered strategy class or raises a 400."""
+    strategy_cls = STRATEGY_MAP.get(name)
+    if not strategy_cls:
+        available = STRATEGY_MAP.available()
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Strategy '{name}' not found. Available: {available}"
+        )
+    return strategy_cls
+
+def load_market_data(request: BacktestRequest) -> "pd.DataFrame":
+    """Fetches the request's price history with normalized column names."""
+    from backend.app.data.market_data import market_data_service
+
+    data = market_data_service.fetch_historical_data(
+        request.ticker, 
+        str(request.start_date), 
+        str(request.end_date),
+        allow_mock=request.allow_mock_data
+    )
+    
+    # Normalize Columns (Verify consistency)
+    data.columns = [c.capitalize() for c in data.columns]
+    return data
+
+def fallback_warnings(data: "pd.DataFrame", ticker: str) -> List[str]:
+    """A warning when the data is synthetic (mock fallback must never be silent)."""
+    if data.attrs.get("fallback_reason"):
+        return [f"Using mock data for {ticker}: {data.attrs['fallback_reason']}"]
+    return []
+
+def execute_backtest(request: BacktestRequest, data: Optional["pd.DataFrame"] = None) -> Dict[str, Any]:
     """
-    Execute a backtest for a given strategy and parameters.
-    Wraps entire execution in try/except to prevent 500 crashes.
+    Runs the full backtest pipeline (data -> engine -> metrics -> benchmark) synchronously.
+    Shared by the HTTP endpoint and the batch/shard executors, which may pass the
+    request's `data` already loaded (see load_market_data).
+    Raises HTTPException, DataValidationError or ValueError on failure.
     """
-    try:
-        logger.info(f"Received backtest request for {request.ticker} with {request.strategy}")
+    from backend.app.engine.backtester import Backtester
+    from backend.app.engine.journal import EventJournal
+    from backend.app.engine.declarative import compile_strategy, run_declarative_backtest
+    from backend.app.analytics.metrics import calculate_metrics
+    from backend.app.analytics.benchmark import calculate_benchmark
+    from backend.app.analytics.downsample import downsample_curves
 
-        # 1. Validate Strategy
-        strategy_cls = STRATEGY_MAP.get(request.strategy)
-        if not strategy_cls:
-            available = [k for k in STRATEGY_MAP.keys() if STRATEGY_MAP[k] is not None]
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Strategy '{request.strategy}' not found. Available: {available}"
-            )
-
-        # 2. Fetch Data
-        data = market_data_service.fetch_historical_data(
-            request.ticker, 
-            str(request.start_date), 
-            str(request.end_date)
+    # 1. Validate Strategy (declarative specs are compiled instead of looked up)
+    if request.strategy_spec is not None:
+        compiled = compile_strategy(request.strategy_spec)
+    else:
+        strategy_cls = resolve_strategy(request.strategy)
+
+    # 2. Fetch Data
+    if data is None:
+        data = load_market_data(request)
+    
+    # 3. Run Backtest
+    low_memory = settings.LOW_MEMORY_MODE if request.low_memory is None else request.low_memory
+    curve_points = settings.LOW_MEMORY_CURVE_POINTS if low_memory else 0
+    journal = EventJournal(settings.JOURNAL_CAPACITY) if request.journal else None
+    if request.strategy_spec is not None:
+        bt_result = run_declarative_backtest(
+            compiled,
+            data,
+            ticker=request.ticker,
+            initial_capital=request.initial_capital,
+            transaction_cost=settings.TRANSACTION_COST,
+            slippage=settings.SLIPPAGE,
+            low_memory=low_memory,
+            max_curve_points=curve_points,
         )
-        
-        # 2b. Normalize Columns (Verify consistency)
-        data.columns = [c.capitalize() for c in data.columns]
-        
-        # 3. Run Backtest
+    else:
         backtester = Backtester(
             strategy_cls=strategy_cls,
             data=data,
             params=request.parameters,
             initial_capital=request.initial_capital,
             transaction_cost=settings.TRANSACTION_COST,
-            slippage=settings.SLIPPAGE
+            slippage=settings.SLIPPAGE,
+            checkpoint_key=f"{request.ticker}:{request.start_date}",
+            low_memory=low_memory,
+            max_curve_points=curve_points,
+            journal=journal,
+            timeframes=request.timeframes
         )
         bt_result = backtester.run()
-        
-        # 4. Calculate Metrics
-        metrics = calculate_metrics(
-            bt_result['equity_curve'], 
-            bt_result['trades'], 
-            request.initial_capital
+    
+    # 4. Calculate Metrics
+    metrics = calculate_metrics(
+        bt_result['equity_curve'], 
+        bt_result['trades'], 
+        request.initial_capital,
+        equity_stats=bt_result.get('equity_stats')
+    )
+    
+    # 4b. Sanitize Metrics (Inf/NaN -> 0.0)
+    sanitized_metrics = {k: sanitize_float(v) for k, v in metrics.items()}
+    
+    # 4c. Serialize Trades (non-finite values -> 0.0), straight from the ledger columns
+    trades = bt_result['trades']
+    if not trades.ticker:
+        trades.ticker = request.ticker
+    sanitized_trades = trades.to_dicts()
+
+    # 5. Calculate Benchmark
+    try:
+        benchmark_res = calculate_benchmark(data, request.initial_capital, max_points=curve_points)
+        # Sanitize benchmark metrics if they exist
+        if benchmark_res and 'metrics' in benchmark_res:
+            benchmark_res['metrics'] = {k: sanitize_float(v) for k, v in benchmark_res['metrics'].items()}
+    except Exception as e:
+        logger.error(f"Benchmark calculation failed: {e}")
+        benchmark_res = None
+    
+    # 5b. Downsample the curves for charting (metrics above used every bar). Both curves
+    # share one selection so they stay aligned by date, and trade dates keep their markers.
+    equity_curve = bt_result['equity_curve']
+    max_points = settings.CURVE_MAX_POINTS if request.max_points is None else request.max_points
+    if max_points:
+        trade_dates = [trade[column] for trade in sanitized_trades for column in ("entry_date", "exit_date")]
+        equity_curve, benchmark_curve = downsample_curves(
+            [equity_curve, benchmark_res.get('equity_curve') if benchmark_res else None],
+            max_points,
+            method=settings.CURVE_DOWNSAMPLE_METHOD,
+            keep_dates=trade_dates,
         )
-        
-        # 4b. Sanitize Metrics (Inf/NaN -> 0.0)
-        sanitized_metrics = {k: sanitize_float(v) for k, v in metrics.items()}
-        
-        # 4c. Sanitize Trades (exit_price None -> 0.0)
-        sanitized_trades = []
-        for t in bt_result['trades']:
-            t_clean = t.copy()
-            t_clean['exit_price'] = sanitize_float(t.get('exit_price'))
-            t_clean['entry_price'] = sanitize_float(t.get('entry_price'))
-            t_clean['pnl'] = sanitize_float(t.get('pnl'))
-            t_clean['pnl_net'] = sanitize_float(t.get('pnl_net'))
-            t_clean['size'] = sanitize_float(t.get('size'))
-            t_clean['duration'] = sanitize_float(t.get('duration'))
-            sanitized_trades.append(t_clean)
-
-        # 5. Calculate Benchmark
-        try:
-            benchmark_res = calculate_benchmark(data, request.initial_capital)
-            # Sanitize benchmark metrics if they exist
-            if benchmark_res and 'metrics' in benchmark_res:
-                benchmark_res['metrics'] = {k: sanitize_float(v) for k, v in benchmark_res['metrics'].items()}
-        except Exception as e:
-            logger.error(f"Benchmark calculation failed: {e}")
-            benchmark_res = None
-        
-        return {
-            "metrics": sanitized_metrics,
-            "equity_curve": bt_result['equity_curve'],
-            "trades": sanitized_trades,
-            "benchmark": benchmark_res
-        }
+        if benchmark_curve is not None:
+            benchmark_res['equity_curve'] = benchmark_curve
+
+    # 6. Report where the data came from (synthetic fallback must never be silent)
+    warnings = fallback_warnings(data, request.ticker)
+    for issue in data.attrs.get("validation", {}).get("warnings", []):
+        warnings.append(f"Data quality for {request.ticker}: {issue}")
+
+    return {
+        "metrics": sanitized_metrics,
+        "equity_curve": equity_curve,
+        "trades": sanitized_trades,
+        "benchmark": benchmark_res,
+        "data_source": data.attrs.get("data_source"),
+        "warnings": warnings,
+        "journal": store_journal(journal, request) if journal is not None else None
+    }
+
+def store_journal(journal: "EventJournal", request: BacktestRequest) -> Dict[str, Any]:
+    """
+    Stores a run's event journal as an artifact (binary events; NDJSON is rendered on
+    request) and returns its summary with the order analytics.
+    """
+    analytics = journal.order_analytics()
+    summary = {"events": len(journal), "dropped": journal.dropped, "analytics": analytics}
+    journal_id = artifact_store.put(
+        "journal",
+        {"events.npy": journal.to_binary()},
+        meta={
+            **summary,
+            "ticker": request.ticker,
+            "strategy": request.strategy,
+            "parameters": request.parameters,
+        },
+    )
+    if journal.dropped:
+        logger.warning(f"Journal {journal_id} dropped its {journal.dropped} oldest events (JOURNAL_CAPACITY={journal.capacity})")
+    return {**summary, "id": journal_id, "url": f"{settings.API_PREFIX}/journals/{journal_id}"}
+
+def execute_profiled_backtest(request: BacktestRequest) -> Dict[str, Any]:
+    """
+    Runs execute_backtest (plus response serialization) under the profiler, stores the
+    profile as an artifact and attaches a summary to the result.
+    """
+    def run():
+        result = execute_backtest(request)
+        # Serialization is part of the request's cost, so it is measured too
+        return BacktestResponse.model_validate(result).model_dump(mode="json")
+
+    result, capture = profile_call(run, mode=settings.PROFILER_MODE, interval=settings.PROFILE_SAMPLE_INTERVAL)
+    breakdown = capture.breakdown()
+    summary = {
+        "mode": capture.mode,
+        "wall_seconds": capture.wall_seconds,
+        "samples": capture.sampler.samples,
+        "breakdown": breakdown,
+    }
+    profile_id = artifact_store.put(
+        "profile",
+        capture.artifacts(),
+        meta={
+            **summary,
+            "ticker": request.ticker,
+            "strategy": request.strategy,
+            "parameters": request.parameters,
+        },
+    )
+    logger.info(f"Stored profile {profile_id} ({capture.wall_seconds:.3f}s, {capture.sampler.samples} samples)")
+    result["profile"] = {**summary, "id": profile_id, "url": f"{settings.API_PREFIX}/profiles/{profile_id}"}
+    return result
+
+@router.post("/backtest", response_model=BacktestResponse)
+async def run_backtest(request: BacktestRequest):
+    """
+    Execute a backtest for a given strategy and parameters.
+    Wraps entire execution in try/except to prevent 500 crashes.
+    """
+    try:
+        logger.info(f"Received backtest request for {request.ticker} with {request.strategy}")
+        if request.profile:
+            if not settings.PROFILING_ENABLED:
+                raise HTTPException(status_code=403, detail="Profiling is disabled on this server (PROFILING_ENABLED)")
+            return await run_in_threadpool(execute_profiled_backtest, request)
+
+        # CPU-bound work runs in the threadpool so the event loop stays responsive
+        return await run_in_threadpool(execute_backtest, request)
 
     except HTTPException as e:
         raise e
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, HTTPException
+from backend.app.schemas.request import BatchBacktestRequest, SweepRequest, ShardRequest, BacktestRequest
+from backend.app.schemas.response import BatchResponse, ShardResponse
+from backend.app.cluster.worker import execute_locally
+from backend.app.cluster.coordinator import SweepCoordinator
+from backend.app.core.config import settings
+from typing import List
+import logging
+import time
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Guard against accidental grid explosions
+MAX_BATCH_SIZE = 10000
+
+async def _execute_batch(requests: List[BacktestRequest], include_curves: bool) -> dict:
+    """
+    Runs a batch on the configured cluster (coordinator mode) or on the local compute pool.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch of {len(requests)} exceeds the limit of {MAX_BATCH_SIZE} backtests"
+        )
+
+    started = time.perf_counter()
+    stats = {}
+    if settings.coordinator_workers:
+        coordinator = SweepCoordinator.from_settings()
+        logger.info(f"Dispatching {len(requests)} backtests to {len(coordinator.workers)} workers")
+        items = await coordinator.run(requests, include_curves=include_curves)
+        stats = {
+            **coordinator.stats,
+            "shards": coordinator.shard_count,
+            "workers": coordinator.worker_stats(),
+        }
+    else:
+        logger.info(f"Running {len(requests)} backtests on the local compute pool")
+        items = await execute_locally(list(range(len(requests))), requests, include_curves)
+
+    succeeded = sum(1 for item in items if item["status"] == "ok")
+    return {
+        "results": items,
+        "stats": {
+            "total": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "elapsed_seconds": time.perf_counter() - started,
+            **stats,
+        },
+    }
+
+@router.post("/backtest/batch", response_model=BatchResponse)
+async def run_batch(request: BatchBacktestRequest):
+    """
+    Execute many independent backtests.
+    Individual failures are reported per item instead of failing the whole batch.
+    """
+    return await _execute_batch(request.requests, request.include_curves)
+
+@router.post("/sweep", response_model=BatchResponse)
+async def run_sweep(request: SweepRequest):
+    """
+    Execute a parameter sweep: one backtest per combination in `parameter_grid`.
+    """
+    return await _execute_batch(request.expand(), request.include_curves)
+
+@router.post("/shards", response_model=ShardResponse)
+async def run_shard(request: ShardRequest):
+    """
+    Worker endpoint used by a coordinator. Always executes on the local compute pool.
+    """
+    if len(request.indices) != len(request.requests):
+        raise HTTPException(status_code=400, detail="indices and requests must have the same length")
+
+    logger.info(f"Executing shard {request.shard_id} ({len(request.requests)} backtests)")
+    items = await execute_locally(request.indices, request.requests, request.include_curves)
+    return {"shard_id": request.shard_id, "results": items}
@@ -1,7 +1,17 @@
 from fastapi import APIRouter
+from backend.app.core.config import settings
+from backend.app.cluster.worker import active_jobs
+from backend.app.utils.warmup import startup_timer
 
 router = APIRouter()
 
 @router.get("/health")
 def health_check():
-    return {"status": "ok", "version": "1.0.0"}
+    return {
+        "status": "ok",
+        "version": "1.0.0",
+        "role": "coordinator" if settings.coordinator_workers else "worker",
+        "capacity": settings.worker_capacity,
+        "active_jobs": active_jobs(),
+        "startup": startup_timer.snapshot(),
+    }
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+from backend.app.utils.artifact_store import artifact_store
+
+router = APIRouter()
+
+JOURNAL_FILE = "events.npy"
+JOURNAL_FORMATS = ["json", "ndjson", "binary"]
+
+@router.get("/journals/{journal_id}")
+def get_journal(
+    journal_id: str,
+    format: str = Query("json", description="json (summary and order analytics), ndjson (one event per line) or binary (.npy)"),
+):
+    """
+    Retrieves the event journal recorded by a `journal: true` backtest request.
+    `binary` is a NumPy structured array: `np.load(path)` (dtype EVENT_DTYPE).
+    """
+    meta = artifact_store.get(journal_id, kind="journal")
+    if meta is None:
+        raise HTTPException(status_code=404, detail=f"Journal '{journal_id}' not found (it may have been pruned)")
+
+    if format == "json":
+        return {**meta, "formats": JOURNAL_FORMATS}
+    if format not in JOURNAL_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}'. Available: {JOURNAL_FORMATS}")
+
+    content = artifact_store.read(journal_id, JOURNAL_FILE)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Journal '{journal_id}' has no events file")
+    if format == "binary":
+        return Response(
+            content,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{journal_id}.npy"'},
+        )
+
+    # Imported here so the router doesn't load NumPy until a journal is rendered
+    from backend.app.engine.journal import EventJournal
+    return Response(EventJournal.ndjson_from(EventJournal.load_binary(content)), media_type="application/x-ndjson")
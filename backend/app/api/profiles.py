@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+from backend.app.utils.artifact_store import artifact_store
+
+router = APIRouter()
+
+# format -> (artifact file, media type)
+PROFILE_FORMATS = {
+    "collapsed": ("stacks.txt", "text/plain"),
+    "text": ("summary.txt", "text/plain"),
+    "pstats": ("profile.pstats", "application/octet-stream"),
+}
+
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    format: str = Query("json", description="json (summary), collapsed (flamegraph stacks), text (pstats report) or pstats (binary)"),
+):
+    """
+    Retrieves a profile captured by a `profile: true` backtest request.
+    `collapsed` output can be fed to flamegraph.pl / speedscope; `pstats` loads with
+    `pstats.Stats(path)` or snakeviz.
+    """
+    meta = artifact_store.get(profile_id, kind="profile")
+    if meta is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found (it may have been pruned)")
+
+    if format == "json":
+        return {
+            **meta,
+            "formats": ["json"] + [fmt for fmt, (name, _) in PROFILE_FORMATS.items() if name in meta["files"]],
+        }
+
+    if format not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}'. Available: {['json', *PROFILE_FORMATS]}")
+    name, media_type = PROFILE_FORMATS[format]
+    content = artifact_store.read(profile_id, name)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' has no {format} output (mode: {meta.get('mode')})")
+
+    if media_type == "text/plain":
+        return PlainTextResponse(content.decode())
+    return Response(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+    )
@@ -0,0 +1,157 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from backend.app.schemas.request import ReplayRequest
+from backend.app.api.backtest import fallback_warnings, resolve_strategy, load_market_data, sanitize_float
+from backend.app.data.validators import DataValidationError
+from backend.app.core.config import settings
+import asyncio
+import concurrent.futures
+import threading
+import logging
+import time
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# How often a blocked engine thread re-checks whether the client went away
+EMIT_POLL_SECONDS = 0.2
+
+@router.websocket("/replay")
+async def replay(websocket: WebSocket):
+    """
+    Replays historical bars through the strategy and streams events as they happen.
+
+    Protocol:
+      1. Client sends a ReplayRequest as JSON (BacktestRequest fields + `speed` in bars/sec).
+      2. Server streams compact messages:
+         {"t": "start", "source", "warnings"}           data provider ("mock" for synthetic data)
+         {"t": "bar", "i", "d", "px", "e", "c", "us"}   per-bar equity/cash and engine latency
+         {"t": "order", "i", "s", "px", "sz", "cm"}      fills ("x" holds the status if not filled)
+         {"t": "trade", "i", "pnl", "net"}               closed trades
+         {"t": "end", "bars", "metrics", "latency"}      final summary (latency: count, mean/p50/p99/max µs)
+         {"t": "error", "detail"}                        failures
+      3. Client may send {"op": "stop"} (or disconnect) at any time to abort the run.
+
+    Messages go through a bounded queue (REPLAY_QUEUE_SIZE): when a client reads slowly
+    the engine thread pauses instead of buffering the whole run in memory.
+    """
+    await websocket.accept()
+    try:
+        request = ReplayRequest(**(await websocket.receive_json()))
+        if request.strategy_spec is not None:
+            raise HTTPException(status_code=400, detail="Declarative strategies run vectorized and cannot be replayed bar by bar")
+        strategy_cls = resolve_strategy(request.strategy)
+        data = await run_in_threadpool(load_market_data, request)
+    except ValidationError as e:
+        await websocket.send_json({"t": "error", "detail": e.errors(include_url=False, include_context=False)})
+        await websocket.close()
+        return
+    except HTTPException as e:
+        await websocket.send_json({"t": "error", "detail": e.detail})
+        await websocket.close()
+        return
+    except (DataValidationError, ValueError) as e:
+        await websocket.send_json({"t": "error", "detail": str(e)})
+        await websocket.close()
+        return
+    except WebSocketDisconnect:
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.REPLAY_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def emit(message: dict) -> bool:
+        """Engine-thread side: blocks while the queue is full, gives up once stopped."""
+        future = asyncio.run_coroutine_threadsafe(queue.put(message), loop)
+        while True:
+            try:
+                future.result(timeout=EMIT_POLL_SECONDS)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+
+    def produce():
+        # Imported here so loading the router doesn't pull in the engine
+        from backend.app.engine.backtester import Backtester
+        from backend.app.engine.streaming import StreamingAnalyzer
+        from backend.app.analytics.metrics import calculate_metrics
+
+        try:
+            emit({
+                "t": "start",
+                "source": data.attrs.get("data_source"),
+                "warnings": fallback_warnings(data, request.ticker),
+            })
+            result = Backtester(
+                strategy_cls=strategy_cls,
+                data=data,
+                params=request.parameters,
+                initial_capital=request.initial_capital,
+                transaction_cost=settings.TRANSACTION_COST,
+                slippage=settings.SLIPPAGE,
+                analyzers=[(StreamingAnalyzer, {"_name": "stream", "emit": emit})],
+                timeframes=request.timeframes,
+            ).run()
+            stream = result.get("analysis", {}).get("stream", {})
+            if not stop.is_set():
+                metrics = calculate_metrics(result["equity_curve"], result["trades"], request.initial_capital)
+                emit({
+                    "t": "end",
+                    "bars": len(result["equity_curve"]),
+                    "metrics": {k: sanitize_float(v) for k, v in metrics.items()},
+                    "latency": stream.get("latency", {}),
+                })
+        except Exception as e:
+            logger.error(f"Replay failed: {e}")
+            emit({"t": "error", "detail": str(e)})
+        finally:
+            emit(None)
+
+    async def listen():
+        """Stops the run when the client asks to or goes away."""
+        try:
+            while True:
+                message = await websocket.receive_json()
+                if isinstance(message, dict) and message.get("op") == "stop":
+                    break
+        except (WebSocketDisconnect, ValueError):
+            pass
+        stop.set()
+
+    producer = loop.run_in_executor(None, produce)
+    listener = asyncio.create_task(listen())
+    interval = 1.0 / request.speed if request.speed > 0 else 0.0
+    started = time.monotonic()
+    bars_sent = 0
+
+    try:
+        while True:
+            message = await queue.get()
+            if message is None or stop.is_set():
+                break
+            if interval and message["t"] == "bar":
+                # Pace bar messages to the requested speed
+                delay = started + bars_sent * interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                bars_sent += 1
+            await websocket.send_json(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        stop.set()
+        listener.cancel()
+        # Unblock a producer waiting on a full queue, then let it wind down
+        while not producer.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.sleep(EMIT_POLL_SECONDS / 2)
+
+    try:
+        await websocket.close()
+    except RuntimeError:
+        pass  # Already closed by the client
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from backend.app.schemas.request import ScanRequest
+from backend.app.schemas.response import ScanResponse, MetricCard
+from backend.app.api.backtest import sanitize_float
+from backend.app.core.config import settings
+import logging
+import traceback
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/scan", response_model=ScanResponse)
+async def run_scan(request: ScanRequest):
+    """
+    Scan a universe for current strategy signals, with each ticker's historical
+    performance, ranked by signal and `rank_by`.
+    """
+    if len(request.tickers) > settings.SCAN_MAX_TICKERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Universe of {len(request.tickers)} exceeds the limit of {settings.SCAN_MAX_TICKERS} tickers"
+        )
+    if request.rank_by not in MetricCard.model_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot rank by '{request.rank_by}'. Available: {list(MetricCard.model_fields)}"
+        )
+
+    # Imported here so loading the router doesn't pull in the data provider and NumPy
+    from backend.app.engine.scanner import UniverseScanner, rank_results
+
+    try:
+        logger.info(f"Scanning {len(request.tickers)} tickers for {request.strategies}")
+        scanner = UniverseScanner(
+            transaction_cost=settings.TRANSACTION_COST,
+            slippage=settings.SLIPPAGE,
+        )
+        rows, errors, stats = await run_in_threadpool(
+            scanner.scan,
+            request.tickers,
+            str(request.start_date),
+            str(request.end_date),
+            request.strategies,
+            request.parameters,
+            request.initial_capital,
+            request.allow_mock_data,
+        )
+    except (ValueError, TypeError) as e:
+        # Unknown strategies or bad parameter names
+        logger.error(f"Scan error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error during scan:\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+    ranked = rank_results(rows, request.rank_by, request.signals, request.top)
+    for row in ranked:
+        row["metrics"] = {k: sanitize_float(v) for k, v in row["metrics"].items()}
+
+    return {"results": ranked, "errors": errors, "stats": stats}
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from backend.app.schemas.request import CostSensitivityRequest
+from backend.app.schemas.response import CostSensitivityResponse
+from backend.app.api.backtest import fallback_warnings, load_market_data, resolve_strategy, sanitize_float
+from backend.app.data.validators import DataValidationError
+from backend.app.core.config import settings
+from typing import Any, Dict
+import logging
+import traceback
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def execute_cost_sensitivity(request: CostSensitivityRequest) -> Dict[str, Any]:
+    """Simulates the request once and re-prices its fills over the cost/slippage grid."""
+    # Imported here so loading the router doesn't pull in the engine
+    from backend.app.engine.sensitivity import run_cost_sensitivity
+
+    strategy_cls = resolve_strategy(request.strategy)
+    data = load_market_data(request)
+    result = run_cost_sensitivity(
+        strategy_cls,
+        data,
+        request.parameters,
+        request.transaction_costs,
+        request.slippages,
+        initial_capital=request.initial_capital,
+        transaction_cost=settings.TRANSACTION_COST,
+        slippage=settings.SLIPPAGE,
+        timeframes=request.timeframes,
+    )
+    for point in [result["base"], *result["points"]]:
+        point["metrics"] = {k: sanitize_float(v) for k, v in point["metrics"].items()}
+
+    warnings = fallback_warnings(data, request.ticker) + result["warnings"]
+    return {**result, "data_source": data.attrs.get("data_source"), "warnings": warnings}
+
+@router.post("/cost-sensitivity", response_model=CostSensitivityResponse)
+async def run_cost_sensitivity_analysis(request: CostSensitivityRequest):
+    """
+    How a strategy holds up under different transaction costs and slippage.
+    The backtest is simulated once; its fills are then re-priced for every combination
+    of `transaction_costs` x `slippages`, returning a MetricCard per combination.
+    """
+    try:
+        logger.info(
+            f"Cost sensitivity for {request.ticker} with {request.strategy}: "
+            f"{len(request.transaction_costs)} x {len(request.slippages)} cost levels"
+        )
+        return await run_in_threadpool(execute_cost_sensitivity, request)
+    except HTTPException as e:
+        raise e
+    except DataValidationError as e:
+        logger.error(f"Data error: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        logger.error(f"Execution error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error during cost sensitivity:\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from backend.app.schemas.request import BacktestRequest
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Consecutive transport failures after which a worker is taken out of rotation
+MAX_WORKER_FAILURES = 3
+
+# Upper bound on concurrent copies of one shard (original + speculative steals)
+MAX_SHARD_COPIES = 2
+
+# A shard becomes a straggler once it has run this many times longer than the average shard
+STRAGGLER_FACTOR = 1.5
+MIN_STEAL_SECONDS = 1.0
+
+# How often idle slots re-check for stragglers
+IDLE_POLL_SECONDS = 0.25
+
+@dataclass
+class WorkerNode:
+    url: str
+    capacity: int = 1
+    healthy: bool = True
+    failures: int = 0
+    completed: int = 0
+
+@dataclass
+class Shard:
+    shard_id: int
+    indices: List[int]
+    requests: List[BacktestRequest]
+    attempts: int = 0
+    started_at: Optional[float] = None
+    tasks: Set[asyncio.Task] = field(default_factory=set)
+    nodes: Set[str] = field(default_factory=set)
+    done: bool = False
+
+class SweepCoordinator:
+    """
+    Splits a batch of backtests into shards and dispatches them to worker nodes over HTTP.
+
+    - Capacity: each worker advertises `capacity` on /api/health; the coordinator keeps
+      that many shards in flight per worker.
+    - Retries: failed dispatches are re-queued until SHARD_MAX_RETRIES is exhausted.
+    - Work stealing: once the queue drains, idle slots speculatively re-run the oldest
+      in-flight shard; the first copy to finish wins and the others are cancelled.
+    """
+
+    def __init__(
+        self,
+        workers: List[str],
+        shard_size: int = 8,
+        max_retries: int = 3,
+        timeout: float = 300.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        if not workers:
+            raise ValueError("SweepCoordinator requires at least one worker URL")
+        self.workers = [WorkerNode(url=url.rstrip("/")) for url in workers]
+        self.shard_size = max(1, shard_size)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._client = client
+
+        self._queue: List[Shard] = []
+        self._shards: List[Shard] = []
+        self._results: Dict[int, List[Dict[str, Any]]] = {}
+        self._changed: Optional[asyncio.Event] = None
+        self._durations: List[float] = []
+        self.stats = {"dispatches": 0, "retries": 0, "stolen": 0}
+
+    @classmethod
+    def from_settings(cls) -> "SweepCoordinator":
+        return cls(
+            workers=settings.coordinator_workers,
+            shard_size=settings.SHARD_SIZE,
+            max_retries=settings.SHARD_MAX_RETRIES,
+            timeout=settings.SHARD_TIMEOUT_SECONDS,
+        )
+
+    async def discover(self, client: httpx.AsyncClient):
+        """Polls every worker's health endpoint for its advertised capacity."""
+        async def probe(node: WorkerNode):
+            try:
+                resp = await client.get(f"{node.url}{settings.API_PREFIX}/health", timeout=5.0)
+                resp.raise_for_status()
+                node.capacity = max(1, int(resp.json().get("capacity", 1)))
+                node.healthy = True
+            except Exception as e:
+                logger.warning(f"Worker {node.url} unavailable: {e}")
+                node.healthy = False
+
+        await asyncio.gather(*(probe(node) for node in self.workers))
+
+    async def run(self, requests: List[BacktestRequest], include_curves: bool = False) -> List[Dict[str, Any]]:
+        """
+        Executes all requests across the worker pool.
+        Returns one result item per request, in input order.
+        """
+        self._changed = asyncio.Event()
+        self._shards = [
+            Shard(
+                shard_id=shard_id,
+                indices=list(range(start, min(start + self.shard_size, len(requests)))),
+                requests=requests[start:start + self.shard_size],
+            )
+            for shard_id, start in enumerate(range(0, len(requests), self.shard_size))
+        ]
+        self._queue = list(self._shards)
+        self._results = {}
+        self._durations = []
+
+        client = self._client or httpx.AsyncClient(timeout=self.timeout)
+        try:
+            await self.discover(client)
+            slots = [
+                self._slot(node, client, include_curves)
+                for node in self.workers if node.healthy
+                for _ in range(node.capacity)
+            ]
+            if slots:
+                await asyncio.gather(*slots)
+        finally:
+            if self._client is None:
+                await client.aclose()
+
+        # Anything left unfinished means every worker dropped out
+        for shard in self._shards:
+            if not shard.done:
+                self._fail_shard(shard, "No healthy workers available")
+
+        items = [item for shard in self._shards for item in self._results[shard.shard_id]]
+        return sorted(items, key=lambda item: item["index"])
+
+    @property
+    def finished(self) -> bool:
+        return all(shard.done for shard in self._shards)
+
+    def _next_shard(self, node: WorkerNode) -> Optional[Shard]:
+        """Pops queued work, or steals a straggling in-flight shard if the queue is empty."""
+        while self._queue:
+            shard = self._queue.pop(0)
+            if not shard.done:
+                return shard
+
+        avg = sum(self._durations) / len(self._durations) if self._durations else 0.0
+        threshold = max(MIN_STEAL_SECONDS, STRAGGLER_FACTOR * avg)
+        now = time.monotonic()
+        candidates = [
+            s for s in self._shards
+            if not s.done and s.tasks and len(s.tasks) < MAX_SHARD_COPIES
+            and node.url not in s.nodes
+            and now - (s.started_at or now) >= threshold
+        ]
+        if not candidates:
+            return None
+        shard = min(candidates, key=lambda s: s.started_at or 0.0)
+        self.stats["stolen"] += 1
+        logger.info(f"Stealing straggler shard {shard.shard_id}")
+        return shard
+
+    async def _slot(self, node: WorkerNode, client: httpx.AsyncClient, include_curves: bool):
+        """One unit of worker capacity: keeps pulling shards until the batch is finished."""
+        while not self.finished and node.healthy:
+            shard = self._next_shard(node)
+            if shard is None:
+                # Nothing to do right now; wait for a completion, a re-queue or a straggler
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=IDLE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._dispatch(node, client, shard, include_curves))
+            shard.tasks.add(task)
+            shard.nodes.add(node.url)
+            if shard.started_at is None:
+                shard.started_at = time.monotonic()
+            error = None
+            try:
+                items = await task
+            except asyncio.CancelledError:
+                shard.tasks.discard(task)
+                shard.nodes.discard(node.url)
+                if asyncio.current_task().cancelling():
+                    raise
+                # Another copy of this shard finished first
+                continue
+            except Exception as e:
+                error = e
+            shard.tasks.discard(task)
+            shard.nodes.discard(node.url)
+
+            if error is not None:
+                self._on_failure(node, shard, error)
+                continue
+
+            if not shard.done:
+                for item in items:
+                    item["worker"] = node.url
+                self._results[shard.shard_id] = items
+                shard.done = True
+                node.completed += 1
+                self._durations.append(time.monotonic() - shard.started_at)
+                for other in list(shard.tasks):
+                    other.cancel()
+            self._changed.set()
+
+        # Last slot standing must not leave waiters blocked forever
+        self._changed.set()
+
+    async def _dispatch(
+        self,
+        node: WorkerNode,
+        client: httpx.AsyncClient,
+        shard: Shard,
+        include_curves: bool,
+    ) -> List[Dict[str, Any]]:
+        self.stats["dispatches"] += 1
+        payload = {
+            "shard_id": shard.shard_id,
+            "indices": shard.indices,
+            "requests": [req.model_dump(mode="json") for req in shard.requests],
+            "include_curves": include_curves,
+        }
+        resp = await client.post(f"{node.url}{settings.API_PREFIX}/shards", json=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        node.failures = 0
+        return resp.json()["results"]
+
+    def _on_failure(self, node: WorkerNode, shard: Shard, error: Exception):
+        logger.warning(f"Shard {shard.shard_id} failed on {node.url}: {error}")
+        node.failures += 1
+        if node.failures >= MAX_WORKER_FAILURES:
+            logger.error(f"Removing worker {node.url} after {node.failures} consecutive failures")
+            node.healthy = False
+
+        if shard.done or shard.tasks:
+            # Finished elsewhere, or another copy is still running
+            pass
+        elif shard.attempts < self.max_retries:
+            shard.attempts += 1
+            self.stats["retries"] += 1
+            shard.started_at = None
+            self._queue.insert(0, shard)
+        else:
+            self._fail_shard(shard, f"Shard failed after {shard.attempts + 1} attempts: {error}")
+        self._changed.set()
+
+    def _fail_shard(self, shard: Shard, message: str):
+        self._results[shard.shard_id] = [
+            {
+                "index": idx,
+                "ticker": req.ticker,
+                "strategy": req.strategy,
+                "parameters": req.parameters,
+                "status": "error",
+                "error": message,
+            }
+            for idx, req in zip(shard.indices, shard.requests)
+        ]
+        shard.done = True
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    def worker_stats(self) -> Dict[str, int]:
+        return {node.url: node.completed for node in self.workers}
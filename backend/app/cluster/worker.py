@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from backend.app.schemas.request import BacktestRequest
+from backend.app.data.validators import DataValidationError, stamp_report
+
+if TYPE_CHECKING:
+    import pandas as pd
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Process-wide compute pool shared by batch, sweep and shard execution
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_active_jobs = 0
+
+def get_compute_pool() -> ProcessPoolExecutor:
+    """
+    Returns the lazily created compute pool (one process per unit of capacity).
+    Uses 'spawn' so children never inherit the server's event loop or thread locks.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.worker_capacity,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+def _reset_compute_pool():
+    """Drops a broken pool so the next job gets a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def warm_worker_process() -> int:
+    """Runs in a pool process: loads the engine and touches its hot paths. Returns the pid."""
+    from backend.app.utils.warmup import touch_hot_paths
+
+    touch_hot_paths()
+    return os.getpid()
+
+def prewarm_compute_pool() -> List[Future]:
+    """
+    Starts the pool processes now instead of on the first job, one warm-up task per
+    process ('spawn' pools start a process per submission while none is idle).
+    """
+    pool = get_compute_pool()
+    return [pool.submit(warm_worker_process) for _ in range(settings.worker_capacity)]
+
+def active_jobs() -> int:
+    return _active_jobs
+
+def _job_item(index: int, request: BacktestRequest) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "ticker": request.ticker,
+        "strategy": request.strategy,
+        "parameters": request.parameters,
+        "status": "ok",
+    }
+
+def _fail(item: Dict[str, Any], error: BaseException) -> Dict[str, Any]:
+    """Records a job failure on its item (the message a client sees)."""
+    if isinstance(error, HTTPException):
+        item.update(status="error", error=str(error.detail))
+    elif isinstance(error, (DataValidationError, ValueError)):
+        item.update(status="error", error=str(error))
+    else:
+        logger.error(f"Unexpected error in batch job {item['index']}: {error}")
+        item.update(status="error", error=f"Internal error: {error}")
+    return item
+
+def run_backtest_job(
+    index: int,
+    payload: Dict[str, Any],
+    include_curves: bool,
+    data: Optional["pd.DataFrame"] = None,
+) -> Dict[str, Any]:
+    """
+    Executes one backtest inside a compute pool process, on `data` if the parent
+    already loaded it (otherwise the job fetches it).
+    Never raises: failures are reported as an error item so one bad request can't sink a shard.
+    """
+    # Imported here so the pool process only pays for the engine when it actually runs a job
+    from backend.app.api.backtest import execute_backtest
+
+    request = BacktestRequest(**payload)
+    item = _job_item(index, request)
+    if data is not None and data.attrs.get("validation"):
+        # Unpickled on new buffers with the content the parent validated: the report still holds
+        stamp_report(data)
+    try:
+        result = execute_backtest(request, data=data)
+        item["metrics"] = result["metrics"]
+        item["data_source"] = result.get("data_source")
+        item["warnings"] = result.get("warnings", [])
+        if result.get("journal"):
+            item["journal"] = result["journal"]
+        if include_curves:
+            item["result"] = result
+    except Exception as e:
+        _fail(item, e)
+    return item
+
+DataKey = Tuple[str, str, str, Optional[bool]]
+
+def _data_key(request: BacktestRequest) -> DataKey:
+    return (request.ticker, str(request.start_date), str(request.end_date), request.allow_mock_data)
+
+def prefetch_market_data(requests: List[BacktestRequest]) -> Dict[DataKey, Union["pd.DataFrame", Exception]]:
+    """
+    Loads each distinct (ticker, date range, mock policy) of a batch once, in this
+    process, with the data service's bounded fetch pool. Returns the frame (columns
+    normalized as by load_market_data) or the raised exception per key.
+    """
+    from backend.app.data.market_data import market_data_service
+
+    groups: Dict[Tuple[str, str, Optional[bool]], List[str]] = {}
+    for ticker, start, end, allow_mock in dict.fromkeys(_data_key(request) for request in requests):
+        groups.setdefault((start, end, allow_mock), []).append(ticker)
+
+    loaded = {}
+    for (start, end, allow_mock), tickers in groups.items():
+        for ticker, result in market_data_service.fetch_many(tickers, start, end, allow_mock).items():
+            if not isinstance(result, Exception):
+                result.columns = [c.capitalize() for c in result.columns]
+            loaded[(ticker, start, end, allow_mock)] = result
+    return loaded
+
+async def execute_locally(
+    indices: List[int],
+    requests: List[BacktestRequest],
+    include_curves: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Runs a list of backtests on this node's compute pool and returns items in input order.
+    """
+    global _active_jobs
+    loop = asyncio.get_running_loop()
+    pool = get_compute_pool()
+
+    # Each distinct series is fetched once here rather than once per job. Frames in
+    # shared memory are attached by the jobs themselves (zero-copy); others are pickled.
+    market_data = await loop.run_in_executor(None, prefetch_market_data, requests)
+
+    async def run(idx: int, req: BacktestRequest) -> Dict[str, Any]:
+        data = market_data[_data_key(req)]
+        if isinstance(data, Exception):
+            return _fail(_job_item(idx, req), data)
+        if "shared_segment" in data.attrs:
+            data = None
+        return await loop.run_in_executor(pool, run_backtest_job, idx, req.model_dump(mode="json"), include_curves, data)
+
+    futures = [run(idx, req) for idx, req in zip(indices, requests)]
+    _active_jobs += len(futures)
+    try:
+        outcomes = await asyncio.gather(*futures, return_exceptions=True)
+    finally:
+        _active_jobs -= len(futures)
+
+    items = []
+    for idx, req, outcome in zip(indices, requests, outcomes):
+        if isinstance(outcome, BaseException):
+            if isinstance(outcome, BrokenProcessPool):
+                logger.error("Compute pool crashed; recreating it for subsequent jobs.")
+                _reset_compute_pool()
+            outcome = {**_job_item(idx, req), "status": "error", "error": f"Worker process failure: {outcome}"}
+        items.append(outcome)
+    return items
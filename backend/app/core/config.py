@@ -12,7 +12,20 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api"
     
     # Data Data
-    DATA_PROVIDER: str = "yfinance"
+    DATA_PROVIDER: str = "yfinance"  # "yfinance" or "mock"
+    DATA_FETCH_CONCURRENCY: int = 8  # Distinct tickers fetched in parallel
+    DATA_FETCH_MAX_RETRIES: int = 3  # Retries on rate limits / transient errors
+    DATA_FETCH_BACKOFF_BASE: float = 0.5  # Seconds; doubles per attempt (full jitter)
+    DATA_FETCH_BACKOFF_MAX: float = 8.0
+    MOCK_DATA_FALLBACK: bool = False  # Default when a request doesn't set allow_mock_data
+    DATA_VALIDATION_STRICT: bool = False  # Reject OHLC inconsistencies instead of reporting them as warnings
+    RESAMPLE_CACHE_ENTRIES: int = 64  # Cached multi-timeframe aggregates (series x timeframe), LRU
+
+    # Shared-Memory Market Data (cross-process cache for multi-worker deployments, POSIX only)
+    SHARED_MEMORY_ENABLED: bool = False
+    SHARED_MEMORY_MAX_BYTES: int = 512 * 1024 * 1024
+    SHARED_MEMORY_TTL_SECONDS: float = 3600.0  # Republish from the provider after this age
+    SHARED_MEMORY_REGISTRY: str = ""  # Registry file (default: <tmpdir>/atss-shm-registry.json)
     
     # Backtest Defaults
     DEFAULT_INITIAL_CAPITAL: float = 100000.0
@@ -25,11 +38,63 @@ class Settings(BaseSettings):
     
     # CORS
     FRONTEND_URL: str = "http://localhost:5173"
+
+    # Distributed Sweeps
+    WORKER_CAPACITY: int = 0  # Concurrent backtests per node (0 = CPU count)
+    COORDINATOR_WORKERS: str = ""  # Comma-separated worker base URLs
+    SHARD_SIZE: int = 8
+    SHARD_MAX_RETRIES: int = 3
+    SHARD_TIMEOUT_SECONDS: float = 300.0
+
+    # Incremental Backtests
+    CHECKPOINT_ENABLED: bool = True
+    CHECKPOINT_MAX_ENTRIES: int = 32
+
+    # Bar Replay (WebSocket)
+    REPLAY_QUEUE_SIZE: int = 256  # Max buffered messages per connection before the engine pauses
+
+    # Universe Scanner
+    SCAN_CHUNK_SIZE: int = 100  # Tickers per vectorized chunk
+    SCAN_MAX_WORKERS: int = 4  # Chunks processed concurrently
+    SCAN_MAX_TICKERS: int = 5000
+
+    # Low-Memory Mode (very long histories)
+    LOW_MEMORY_MODE: bool = False  # Default for requests that don't set `low_memory`
+    LOW_MEMORY_CURVE_POINTS: int = 2000  # Stored equity/benchmark points in low-memory mode (0 = every bar)
+
+    # Chart Curves (metrics always use every bar)
+    CURVE_MAX_POINTS: int = 0  # Default for requests that don't set `max_points` (0 = every bar)
+    CURVE_DOWNSAMPLE_METHOD: str = "minmax"  # "minmax" (keeps peaks/troughs) or "lttb"
+
+    # Profiling (opt-in per request with `profile: true`)
+    PROFILING_ENABLED: bool = False
+    PROFILER_MODE: str = "deterministic"  # "deterministic" (cProfile + sampler) or "sampling"
+    PROFILE_SAMPLE_INTERVAL: float = 0.005  # Seconds between stack samples
+
+    # Order Event Journal (opt-in per request with `journal: true`)
+    JOURNAL_CAPACITY: int = 65536  # Events kept per run; older ones are overwritten beyond this
+
+    # Run Artifacts (profiles, event journals), shared by the worker processes of a host
+    ARTIFACT_DIR: str = ""  # Default: <tmpdir>/atss-artifacts
+    ARTIFACT_MAX_ENTRIES: int = 100
+
+    # Start-up Warm-up (load the engine and pre-fork the compute pool before serving)
+    WARMUP_ENABLED: bool = False
+    WARMUP_PREFORK_POOL: bool = True
+    WARMUP_BUDGET_SECONDS: float = 10.0  # Target time from process start to first response
     
     @property
     def cors_origins(self) -> List[str]:
         return ["*"]
 
+    @property
+    def worker_capacity(self) -> int:
+        return self.WORKER_CAPACITY if self.WORKER_CAPACITY > 0 else (os.cpu_count() or 1)
+
+    @property
+    def coordinator_workers(self) -> List[str]:
+        return [url.strip().rstrip("/") for url in self.COORDINATOR_WORKERS.split(",") if url.strip()]
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,58 +1,308 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import logging
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from backend.app.data.validators import validate_market_data, DataValidationError
+from typing import Dict, List, Optional, Tuple, Union
+from backend.app.data.validators import validate_market_data, recorded_report, stamp_report, DataValidationError
+from backend.app.data.shared_memory import SharedMarketDataStore
+from backend.app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+class RateLimitError(Exception):
+    """Raised by providers when the upstream API throttles us. Retried with backoff."""
+
+class TransientProviderError(Exception):
+    """Raised by providers for network hiccups worth retrying."""
+
+class MarketDataProvider:
+    """
+    Source of raw daily OHLCV bars.
+    Implementations return a DataFrame indexed by date (empty if the ticker has no data)
+    and raise RateLimitError / TransientProviderError for retryable failures.
+    """
+    name = "base"
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Yahoo Finance provider. Keeps one HTTP session per fetch thread so connections
+    (and cookies/crumbs) are reused across requests instead of renegotiated each call.
+    """
+    name = "yfinance"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            from curl_cffi import requests as curl_requests
+            session = self._local.session = curl_requests.Session(impersonate="chrome")
+        return session
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        try:
+            df = yf.Ticker(ticker, session=self._session()).history(
+                start=start_date,
+                end=end_date,
+                auto_adjust=True,
+                actions=False,
+                raise_errors=True,
+            )
+        except yf.exceptions.YFRateLimitError as e:
+            raise RateLimitError(str(e))
+        except (yf.exceptions.YFPricesMissingError, yf.exceptions.YFTickerMissingError):
+            return pd.DataFrame()
+        except (ConnectionError, TimeoutError, OSError) as e:
+            raise TransientProviderError(str(e))
+        except Exception as e:
+            # curl_cffi raises its own exception hierarchy for transport failures
+            if type(e).__module__.startswith("curl_cffi"):
+                raise TransientProviderError(str(e))
+            raise
+
+        if df.empty:
+            return df
+        # Daily bars: keep the exchange-local calendar date
+        if getattr(df.index, "tz", None) is not None:
+            df.index = df.index.tz_localize(None)
+        return df
+
+class MockDataProvider(MarketDataProvider):
+    """
+    Synthetic provider (geometric brownian motion). Useful for offline development and
+    for running local worker fleets without network access (DATA_PROVIDER="mock").
+    Series are seeded by (ticker, start, end), so every process generates the same data.
+    """
+    name = "mock"
+
+    def download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        seed = zlib.crc32(f"{ticker}|{start_date}|{end_date}".encode())
+        df = market_data_service.generate_mock_data(ticker, start_date, end_date, seed=seed)
+        df.columns = [c.capitalize() for c in df.columns]
+        return df
+
+PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "mock": MockDataProvider,
+}
+
 class MarketDataService:
-    def fetch_historical_data(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Fetches validated historical data.
+
+    - Identical concurrent fetches are coalesced (single flight): one caller downloads,
+      the others wait for its result.
+    - Distinct tickers can be fetched concurrently with `fetch_many` on a bounded pool.
+    - Rate limits and transient errors are retried with jittered exponential backoff.
+    - Falling back to mock data is opt-in per call (or MOCK_DATA_FALLBACK, off by
+      default), covers only empty results and an unavailable provider, and is
+      reported via `df.attrs["data_source"]` / `df.attrs["fallback_reason"]`.
+    - With a shared store (SHARED_MEMORY_ENABLED), provider data is published once to
+      shared memory and every process reads the same read-only copy.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[MarketDataProvider] = None,
+        max_workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        shared: Optional[SharedMarketDataStore] = None,
+    ):
+        self.provider = provider or PROVIDERS.get(settings.DATA_PROVIDER, YFinanceProvider)()
+        self.max_workers = max_workers or settings.DATA_FETCH_CONCURRENCY
+        self.max_retries = settings.DATA_FETCH_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = settings.DATA_FETCH_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = settings.DATA_FETCH_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.shared = shared
+
+        self._inflight: Dict[Tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def fetch_historical_data(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        allow_mock: Optional[bool] = None,
+    ) -> pd.DataFrame:
+        """
+        Fetches historical market data from the configured provider.
+        Falls back to mock data (on empty results or an unavailable provider) only if
+        `allow_mock` (default: MOCK_DATA_FALLBACK) is set.
+        Every caller receives its own copy of the frame.
+        """
+        if allow_mock is None:
+            allow_mock = settings.MOCK_DATA_FALLBACK
+        key = (ticker, start_date, end_date, allow_mock)
+        shared_key = (self.provider.name, ticker, start_date, end_date)
+
+        if self.shared is not None:
+            df = self._get_shared(shared_key)
+            if df is not None:
+                # Reuses the publisher's validation report (nothing is rechecked)
+                return self._copy(validate_market_data(df, ticker))
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            logger.info(f"Joining in-flight fetch for {ticker}")
+            return self._copy(future.result())
+
+        try:
+            df = self._fetch(ticker, start_date, end_date, allow_mock)
+            if self.shared is not None and df.attrs.get("data_source") == self.provider.name:
+                df = self._publish_shared(shared_key, df)
+            future.set_result(df)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        return self._copy(df)
+
+    def fetch_many(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        allow_mock: Optional[bool] = None,
+    ) -> Dict[str, Union[pd.DataFrame, Exception]]:
         """
-        Fetches historical market data from yfinance.
-        Falls back to mock data if yfinance is rate-limited or fails.
+        Fetches several tickers concurrently on the shared bounded pool.
+        Returns a frame or the raised exception for each ticker.
         """
+        pool = self._get_pool()
+        futures = {
+            ticker: pool.submit(self.fetch_historical_data, ticker, start_date, end_date, allow_mock)
+            for ticker in tickers
+        }
+        results = {}
+        for ticker, future in futures.items():
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                results[ticker] = e
+        return results
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="market-data")
+            return self._pool
+
+    @staticmethod
+    def _copy(df: pd.DataFrame) -> pd.DataFrame:
+        # Shared-memory frames are read-only: callers get their own container over the same data
+        out = df.copy(deep="shared_segment" not in df.attrs)
+        out.attrs = dict(df.attrs)
+        if recorded_report(df):
+            # Same content on new buffers: the report still holds
+            stamp_report(out)
+        return out
+
+    def _get_shared(self, key: Tuple) -> Optional[pd.DataFrame]:
+        try:
+            return self.shared.get(key)
+        except OSError as e:
+            logger.warning(f"Shared market data lookup failed for {key}: {e}")
+            return None
+
+    def _publish_shared(self, key: Tuple, df: pd.DataFrame) -> pd.DataFrame:
+        try:
+            published = self.shared.publish(key, df, self.provider.name)
+        except OSError as e:
+            logger.warning(f"Could not publish {key} to shared memory: {e}")
+            return df
+        return published if published is not None else df
+
+    def _fetch(self, ticker: str, start_date: str, end_date: str, allow_mock: bool) -> pd.DataFrame:
         try:
             logger.info(f"Fetching data for {ticker} from {start_date} to {end_date}")
-            
-            df = yf.download(
-                ticker, 
-                start=start_date, 
-                end=end_date, 
-                progress=False,
-                auto_adjust=True
-            )
-            
+            df = self._download_with_retry(ticker, start_date, end_date)
+
             if df.empty:
-                logger.warning(f"yfinance returned empty data for {ticker}. Attempting fallback...")
-                return self.generate_mock_data(ticker, start_date, end_date)
+                if allow_mock:
+                    logger.warning(f"{self.provider.name} returned empty data for {ticker}. Using mock data.")
+                    return self._mock(ticker, start_date, end_date, f"{self.provider.name} returned no data")
+                raise DataValidationError(f"No data found for ticker: {ticker}")
 
-            # yfinance with auto_adjust=True returns: Open, High, Low, Close, Volume
             # Ensure the index is Datetime
             df.index = pd.to_datetime(df.index)
-            
+
             # Additional Handling for MultiIndex columns if necessary
             if isinstance(df.columns, pd.MultiIndex):
                 df.columns = df.columns.get_level_values(0)
 
             # Validate
             df = validate_market_data(df, ticker)
-            
+            df.attrs["data_source"] = self.provider.name
+
             logger.info(f"Successfully fetched {len(df)} rows for {ticker}")
             return df
 
         except DataValidationError as e:
             logger.error(f"Validation error for {ticker}: {str(e)}")
             raise e
+        except (RateLimitError, TransientProviderError) as e:
+            # Provider unavailable after all retries: the only failure mock data stands in for
+            logger.error(f"Failed to fetch data for {ticker}: {str(e)}")
+            if allow_mock:
+                logger.warning(f"{self.provider.name} unavailable for {ticker}. Using mock data.")
+                return self._mock(ticker, start_date, end_date, f"{self.provider.name} unavailable: {e}")
+            raise ValueError(f"Failed to fetch data for {ticker}: {str(e)}")
         except Exception as e:
             logger.error(f"Failed to fetch data for {ticker}: {str(e)}")
             raise ValueError(f"Failed to fetch data for {ticker}: {str(e)}")
 
-    def generate_mock_data(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    def _download_with_retry(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Calls the provider, retrying throttling/transient errors with full-jitter backoff."""
+        attempt = 0
+        while True:
+            try:
+                return self.provider.download(ticker, start_date, end_date)
+            except (RateLimitError, TransientProviderError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                logger.warning(
+                    f"{type(e).__name__} fetching {ticker} (attempt {attempt + 1}/{self.max_retries + 1}): "
+                    f"retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    def _mock(self, ticker: str, start_date: str, end_date: str, reason: str) -> pd.DataFrame:
+        df = self.generate_mock_data(ticker, start_date, end_date)
+        df.columns = [c.capitalize() for c in df.columns]
+        df = validate_market_data(df, ticker)
+        df.attrs["data_source"] = "mock"
+        df.attrs["fallback_reason"] = reason
+        return df
+
+    def generate_mock_data(self, ticker: str, start_date: str, end_date: str, seed: Optional[int] = None) -> pd.DataFrame:
         """
         Generates synthetic OHLCV data using a geometric brownian motion model.
         Used as a fallback when live data is unavailable.
+        Draws from NumPy's global random state unless a `seed` is given.
         """
         logger.warning(f"Generating SCOPED MOCK DATA for {ticker}")
         
@@ -70,16 +320,17 @@ class MarketDataService:
         sigma = 0.02 # Volatility
         
         import numpy as np
-        returns = np.random.normal(mu, sigma, n)
+        rng = np.random if seed is None else np.random.RandomState(seed)
+        returns = rng.normal(mu, sigma, n)
         price_path = start_price * (1 + returns).cumprod()
         
         # Create DataFrame
         df = pd.DataFrame(index=dates)
         df['close'] = price_path
-        df['open'] = df['close'] * (1 + np.random.normal(0, 0.005, n))
-        df['high'] = df[['open', 'close']].max(axis=1) * (1 + abs(np.random.normal(0, 0.01, n)))
-        df['low'] = df[['open', 'close']].min(axis=1) * (1 - abs(np.random.normal(0, 0.01, n)))
-        df['volume'] = np.random.randint(100000, 5000000, n)
+        df['open'] = df['close'] * (1 + rng.normal(0, 0.005, n))
+        df['high'] = df[['open', 'close']].max(axis=1) * (1 + abs(rng.normal(0, 0.01, n)))
+        df['low'] = df[['open', 'close']].min(axis=1) * (1 - abs(rng.normal(0, 0.01, n)))
+        df['volume'] = rng.randint(100000, 5000000, n)
         
         df.index.name = 'Date'
         
@@ -89,5 +340,18 @@ class MarketDataService:
         
         return df
 
+def _shared_store() -> Optional[SharedMarketDataStore]:
+    if not settings.SHARED_MEMORY_ENABLED:
+        return None
+    try:
+        return SharedMarketDataStore(
+            max_bytes=settings.SHARED_MEMORY_MAX_BYTES,
+            ttl_seconds=settings.SHARED_MEMORY_TTL_SECONDS,
+            registry_path=settings.SHARED_MEMORY_REGISTRY or None,
+        )
+    except RuntimeError as e:
+        logger.warning(f"Shared-memory market data disabled: {e}")
+        return None
+
 # Singleton or utility usage
-market_data_service = MarketDataService()
+market_data_service = MarketDataService(shared=_shared_store())
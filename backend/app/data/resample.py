@@ -0,0 +1,267 @@
+"""
+Multi-timeframe OHLCV aggregates of a base series.
+
+Timeframes: "daily", "weekly" (ISO weeks, Monday to Sunday), "monthly", and intraday
+buckets "<N>min" / "<N>h" counted from midnight. Each aggregate bar is stamped with the
+timestamp of the last base bar it contains, so on the base timeline it appears only once
+all of its bars have closed: a daily strategy sees a week's bar on that week's last
+trading day, never earlier.
+
+Aggregates are built in one vectorized pass (reduceat over contiguous buckets) and cached
+per base series (provider and ticker) and timeframe. A date range of a cached series is
+answered from its aggregate with `ResampledSeries.range` / `slice`: two binary searches,
+a view of the whole buckets inside the range and the two partial edge buckets
+recomputed, so the result is exactly the aggregate of that range on its own.
+"""
+
+import re
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+from backend.app.data.validators import REQUIRED_COLUMNS, fingerprint_frame, recorded_report
+from backend.app.core.config import settings
+
+NAMED_TIMEFRAMES = ("daily", "weekly", "monthly")
+_INTRADAY = re.compile(r"^([1-9][0-9]*)(min|h)$")
+
+def parse_timeframe(timeframe: str) -> Tuple[str, int]:
+    """
+    Splits a timeframe into (unit, count): ("days", 1), ("weeks", 1), ("months", 1) or
+    ("minutes", N).
+
+    Raises:
+        ValueError: For unknown timeframes.
+    """
+    if timeframe in NAMED_TIMEFRAMES:
+        return {"daily": "days", "weekly": "weeks", "monthly": "months"}[timeframe], 1
+    match = _INTRADAY.match(timeframe)
+    if match is None:
+        raise ValueError(
+            f"Unknown timeframe '{timeframe}'. Use one of {list(NAMED_TIMEFRAMES)} or '<N>min' / '<N>h'"
+        )
+    count = int(match.group(1))
+    return "minutes", count * 60 if match.group(2) == "h" else count
+
+def bucket_codes(index: pd.DatetimeIndex, timeframe: str) -> np.ndarray:
+    """Integer bucket id of each bar; bars of the same aggregate bar share an id."""
+    unit, count = parse_timeframe(timeframe)
+    values = index.values  # Casts floor to the unit, whatever the index resolution
+    if unit == "days":
+        return values.astype("datetime64[D]").astype(np.int64)
+    if unit == "weeks":
+        # 1970-01-01 was a Thursday: shift so weeks start on Monday
+        return (values.astype("datetime64[D]").astype(np.int64) + 3) // 7
+    if unit == "months":
+        return values.astype("datetime64[M]").astype(np.int64)
+    return values.astype("datetime64[m]").astype(np.int64) // count
+
+@dataclass
+class ResampledSeries:
+    """An aggregate of a base series at one timeframe, with the base bars it was built from."""
+    timeframe: str
+    frame: pd.DataFrame        # OHLCV, indexed by each bucket's last base bar timestamp
+    first_bar: np.ndarray      # Base position of each bucket's first bar
+    last_bar: np.ndarray       # Base position of each bucket's last bar
+    base_index: np.ndarray     # Base timestamps (datetime64[ns])
+    base_values: np.ndarray    # Base OHLCV, shape (5, n)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def range(self, lo: int, hi: int) -> "ResampledSeries":
+        """
+        The aggregate of base bars [lo, hi), equal to build_aggregate on those bars:
+        whole buckets are a view, and the partial buckets at either edge are recomputed
+        from the base bars they keep.
+
+        Raises:
+            ValueError: If the timeframe isn't coarser than the sub-range (as for
+                build_aggregate).
+        """
+        if lo == 0 and hi == len(self.base_index):
+            return self
+        k0 = int(np.searchsorted(self.last_bar, lo, side="left"))
+        k1 = int(np.searchsorted(self.first_bar, hi, side="left"))
+        first = np.maximum(self.first_bar[k0:k1], lo) - lo
+        last = np.minimum(self.last_bar[k0:k1], hi - 1) - lo
+        if hi - lo > 1 and len(first) == hi - lo:
+            raise ValueError(f"Timeframe '{self.timeframe}' is not coarser than the base series")
+
+        frame = self.frame.iloc[k0:k1]
+        edges = [row for row in {0, len(first) - 1} if len(first) and (
+            first[row] + lo != self.first_bar[k0 + row] or last[row] + lo != self.last_bar[k0 + row]
+        )]
+        if edges:
+            values = frame.to_numpy(dtype=np.float64, copy=True)
+            stamps = frame.index.values.copy()
+            for row in edges:
+                bars = slice(first[row] + lo, last[row] + lo + 1)
+                open_, high, low, close, volume = self.base_values[:, bars]
+                values[row] = (open_[0], high.max(), low.min(), close[-1], np.nan_to_num(volume).sum())
+                stamps[row] = self.base_index[last[row] + lo]
+            frame = pd.DataFrame(values, index=pd.DatetimeIndex(stamps, name=frame.index.name), columns=frame.columns)
+        return ResampledSeries(
+            timeframe=self.timeframe,
+            frame=frame,
+            first_bar=first,
+            last_bar=last,
+            base_index=self.base_index[lo:hi],
+            base_values=self.base_values[:, lo:hi],
+        )
+
+    def slice(self, start=None, end=None) -> pd.DataFrame:
+        """Aggregate of the base bars within [start, end] (see range)."""
+        lo = self.base_index.searchsorted(np.datetime64(pd.Timestamp(start).as_unit("ns")), side="left") if start is not None else 0
+        hi = self.base_index.searchsorted(np.datetime64(pd.Timestamp(end).as_unit("ns")), side="right") if end is not None else len(self.base_index)
+        return self.range(int(lo), int(max(lo, hi))).frame
+
+    def locate(self, df: pd.DataFrame) -> Optional[Tuple[int, int]]:
+        """
+        Base positions [lo, hi) of `df` if it is a contiguous run of this series' base
+        bars with the same values, else None. Checking is a vectorized comparison, far
+        cheaper than aggregating.
+        """
+        if not len(df) or not isinstance(df.index, pd.DatetimeIndex) or any(column not in df.columns for column in REQUIRED_COLUMNS):
+            return None
+        index = df.index.values.astype("datetime64[ns]", copy=False)
+        lo = int(self.base_index.searchsorted(index[0], side="left"))
+        hi = lo + len(df)
+        if hi > len(self.base_index) or self.base_index[lo] != index[0] or self.base_index[hi - 1] != index[-1]:
+            return None
+        if not np.array_equal(self.base_index[lo:hi], index):
+            return None
+        for row, column in enumerate(REQUIRED_COLUMNS):
+            if not np.array_equal(self.base_values[row, lo:hi], df[column].to_numpy(dtype=np.float64), equal_nan=True):
+                return None
+        return lo, hi
+
+def build_aggregate(df: pd.DataFrame, timeframe: str) -> ResampledSeries:
+    """
+    Aggregates a base series (Open: first, High: max, Low: min, Close: last, Volume:
+    sum) in one pass.
+
+    Raises:
+        ValueError: For unknown timeframes, unsorted data, or timeframes that aren't
+            coarser than the base series.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("Resampling needs a DatetimeIndex")
+    if len(df) > 1 and not (np.diff(df.index.asi8) > 0).all():
+        raise ValueError("Resampling needs a sorted index without duplicates (validate the data first)")
+
+    codes = bucket_codes(df.index, timeframe)
+    first = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.zeros(0, dtype=np.int64)
+    last = np.r_[first[1:] - 1, len(codes) - 1] if len(codes) else first
+    if len(df) > 1 and len(first) == len(df):
+        raise ValueError(f"Timeframe '{timeframe}' is not coarser than the base series")
+
+    open_, high, low, close, volume = (df[column].to_numpy(dtype=np.float64) for column in REQUIRED_COLUMNS)
+    if len(first):
+        columns = {
+            "Open": open_[first],
+            "High": np.maximum.reduceat(high, first),
+            "Low": np.minimum.reduceat(low, first),
+            "Close": close[last],
+            "Volume": np.add.reduceat(np.nan_to_num(volume), first),
+        }
+    else:
+        columns = {column: np.zeros(0) for column in REQUIRED_COLUMNS}
+    frame = pd.DataFrame(columns, index=df.index[last])
+    return ResampledSeries(
+        timeframe=timeframe,
+        frame=frame,
+        first_bar=first,
+        last_bar=last,
+        base_index=df.index.values.astype("datetime64[ns]", copy=False),
+        base_values=np.vstack([open_, high, low, close, volume]) if len(df) else np.zeros((5, 0)),
+    )
+
+def series_identity(df: pd.DataFrame) -> Hashable:
+    """
+    Which base series a frame is taken from: its provider and ticker when it carries a
+    validation report (any date range of the same series shares it), else its content
+    fingerprint.
+    """
+    report = df.attrs.get("validation")
+    if report and report.get("ticker"):
+        return ("series", df.attrs.get("data_source"), report["ticker"])
+    return ("frame", fingerprint_frame(df, columns=REQUIRED_COLUMNS))
+
+class ResampleCache:
+    """
+    Thread-safe, LRU-bounded in-memory store of aggregates, keyed by base series (see
+    series_identity) and timeframe. A frame that is a date range of the cached series,
+    with the same values, is answered by slicing its aggregate (ResampledSeries.range);
+    otherwise (another range, or values that differ, e.g. a derived frame) it is
+    aggregated, and the new aggregate replaces the cached one when it covers at least
+    the same bars. Validated frames already matched once skip the value comparison
+    while their recorded fingerprint still describes them (see recorded_report).
+    """
+
+    MAX_KNOWN_RANGES = 256
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, str], ResampledSeries]" = OrderedDict()
+        self._known: "Dict[Tuple[Hashable, str], Dict[str, Tuple[int, int]]]" = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, df: pd.DataFrame, timeframe: str) -> ResampledSeries:
+        """The aggregate of `df` at `timeframe`, sliced from the cached series or built."""
+        parse_timeframe(timeframe)
+        key = (series_identity(df), timeframe)
+        report = recorded_report(df)
+        fingerprint = report["fingerprint"] if report else None
+        with self._lock:
+            series = self._entries.get(key)
+            span = self._known.get(key, {}).get(fingerprint) if series is not None and fingerprint else None
+
+        if series is not None and span is None:
+            span = series.locate(df)
+            if span is not None and fingerprint:
+                with self._lock:
+                    known = self._known.setdefault(key, {})
+                    if len(known) >= self.MAX_KNOWN_RANGES:
+                        known.clear()
+                    known[fingerprint] = span
+        if span is not None:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+            return series.range(*span)
+
+        with self._lock:
+            self.misses += 1
+        built = build_aggregate(df, timeframe)
+        if self.max_entries > 0:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is None or (
+                    len(built.base_index) and len(cached.base_index) and
+                    built.base_index[0] <= cached.base_index[0] and built.base_index[-1] >= cached.base_index[-1]
+                ):
+                    self._entries[key] = built
+                    self._known.pop(key, None)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._known.pop(evicted, None)
+        return built
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._known.clear()
+
+# Singleton shared by all requests in this process
+resample_cache = ResampleCache(max_entries=settings.RESAMPLE_CACHE_ENTRIES)
+
+def resample(df: pd.DataFrame, timeframe: str, cache: Optional[ResampleCache] = None) -> ResampledSeries:
+    """Cached aggregate of a base series (see ResampleCache)."""
+    return (cache or resample_cache).get(df, timeframe)
@@ -0,0 +1,350 @@
+"""
+Cross-process market data cache in POSIX shared memory.
+
+The first process (uvicorn worker or compute-pool process) to load a validated series
+publishes it as one contiguous segment: a small header, the int64 timestamps and a
+(5, n) float64 OHLCV block. Other processes attach to the segment and build a read-only
+DataFrame directly on top of it, without copying.
+
+Bookkeeping lives in a small JSON registry guarded by an exclusive file lock:
+  - segment names are derived from the registry path and the (provider, ticker, start,
+    end) key, so every process sharing a registry computes the same name, and each
+    registry owns its own name namespace;
+  - each entry lists the PIDs currently mapping it (one reference per process, dropped
+    when the last frame built on it is garbage collected, or at exit);
+  - entries are evicted least-recently-used once the total exceeds the byte budget, or
+    when older than the TTL. Evicting only unlinks the name: processes still mapping
+    the segment keep valid memory until they detach;
+  - references held by dead PIDs, and segments of this registry's namespace orphaned
+    by a crash mid-publish, are cleaned up by the next process that touches the
+    registry. Other registries' segments are never touched.
+
+Segments are unregistered from multiprocessing's resource tracker, otherwise the
+tracker would unlink them when the process that created them exits.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from backend.app.data.validators import stamp_report
+
+try:
+    import fcntl
+except ImportError:  # Windows: no POSIX file locks, the shared cache stays disabled
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "atss_"
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+MAGIC = b"ATSSMD01"
+HEADER_BYTES = 64  # magic + row count, padded so the arrays stay 64-byte aligned
+SHM_DIR = "/dev/shm"
+# A segment on disk but not in the registry is only an orphan once its publisher had
+# ample time to register it
+ORPHAN_GRACE_SECONDS = 60.0
+
+def segment_namespace(registry_path: str) -> str:
+    """Name prefix of a registry's segments: SEGMENT_PREFIX plus a short hash of its path."""
+    path = os.path.realpath(registry_path)
+    return SEGMENT_PREFIX + hashlib.blake2b(path.encode(), digest_size=3).hexdigest() + "_"
+
+def segment_name(key: Tuple, namespace: str = SEGMENT_PREFIX) -> str:
+    """Deterministic, short (macOS caps names at 31 chars) segment name for a cache key."""
+    return namespace + hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+
+def segment_size(rows: int) -> int:
+    return HEADER_BYTES + rows * 8 * (1 + len(FIELDS))
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """Opens a segment without handing its lifetime to the resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        pass  # Python < 3.13
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+def _unlink_segment(name: str):
+    try:
+        # Opening registers with the tracker and unlink() unregisters: balanced
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class SharedMarketDataStore:
+    """
+    Shared-memory OHLCV cache (see module docstring). Thread-safe within a process,
+    and process-safe through the registry file lock.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, registry_path: Optional[str] = None):
+        if fcntl is None:
+            raise RuntimeError("Shared-memory market data requires POSIX file locking")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.registry_path = registry_path or os.path.join(tempfile.gettempdir(), "atss-shm-registry.json")
+        self.namespace = segment_namespace(self.registry_path)
+        self._lock = threading.Lock()
+        # name -> (segment handle, weakref to the base array, entry metadata)
+        self._attached: Dict[str, Tuple[shared_memory.SharedMemory, weakref.ref, Dict[str, Any]]] = {}
+        atexit.register(self.detach_all)
+
+    # -- Registry --------------------------------------------------------------
+
+    @contextmanager
+    def _registry(self) -> Iterator[Dict[str, Any]]:
+        """Exclusive, read-modify-write access to the registry."""
+        with open(self.registry_path + ".lock", "a+") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.registry_path) as f:
+                        registry = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    registry = {}
+                registry.setdefault("segments", {})
+                before = json.dumps(registry, sort_keys=True)
+                yield registry
+                if json.dumps(registry, sort_keys=True) != before:
+                    tmp = f"{self.registry_path}.{os.getpid()}.tmp"
+                    with open(tmp, "w") as f:
+                        json.dump(registry, f)
+                    os.replace(tmp, self.registry_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _cleanup_locked(self, registry: Dict[str, Any]):
+        """Drops dead-PID references, expired entries and crash-orphaned segments."""
+        segments = registry["segments"]
+        now = time.time()
+        for name, entry in list(segments.items()):
+            entry["refs"] = [pid for pid in entry["refs"] if _pid_alive(pid)]
+            if self.ttl_seconds > 0 and now - entry["created"] > self.ttl_seconds:
+                _unlink_segment(name)
+                del segments[name]
+
+        if os.path.isdir(SHM_DIR):
+            for filename in os.listdir(SHM_DIR):
+                # Only this registry's namespace: other registries' segments aren't ours to judge
+                if not filename.startswith(self.namespace) or filename in segments:
+                    continue
+                try:
+                    age = now - os.stat(os.path.join(SHM_DIR, filename)).st_mtime
+                except FileNotFoundError:
+                    continue
+                if age > ORPHAN_GRACE_SECONDS:
+                    logger.warning(f"Removing orphaned shared-memory segment {filename}")
+                    _unlink_segment(filename)
+
+    def _evict_locked(self, registry: Dict[str, Any], incoming: int):
+        """Unlinks least-recently-used segments until `incoming` more bytes fit the budget."""
+        segments = registry["segments"]
+        total = sum(entry["bytes"] for entry in segments.values())
+        # Unreferenced entries go first; unlinking a mapped segment is safe but frees nothing yet
+        order = sorted(segments, key=lambda n: (bool(segments[n]["refs"]), segments[n]["last_used"]))
+        for name in order:
+            if total + incoming <= self.max_bytes:
+                break
+            total -= segments[name]["bytes"]
+            logger.info(f"Evicting shared market data {segments[name]['key']}")
+            _unlink_segment(name)
+            del segments[name]
+
+    @staticmethod
+    def _free_shm_bytes() -> Optional[int]:
+        try:
+            stat = os.statvfs(SHM_DIR)
+        except (OSError, AttributeError):
+            return None
+        return stat.f_bavail * stat.f_frsize
+
+    # -- Local mappings --------------------------------------------------------
+
+    def _reap(self):
+        """Closes mappings whose frames have all been garbage collected and drops our references."""
+        with self._lock:
+            dead = [name for name, (_, ref, _) in self._attached.items() if ref() is None]
+            for name in dead:
+                shm, _, _ = self._attached.pop(name)
+                shm.close()
+        if dead:
+            with self._registry() as registry:
+                pid = os.getpid()
+                for name in dead:
+                    entry = registry["segments"].get(name)
+                    if entry and pid in entry["refs"]:
+                        entry["refs"].remove(pid)
+
+    def _map(self, name: str, shm: shared_memory.SharedMemory, meta: Dict[str, Any]) -> np.ndarray:
+        base = np.ndarray((segment_size(meta["rows"]),), dtype=np.uint8, buffer=shm.buf)
+        base.flags.writeable = False
+        self._attached[name] = (shm, weakref.ref(base), meta)
+        return base
+
+    @staticmethod
+    def _frame(base: np.ndarray, meta: Dict[str, Any], name: str) -> pd.DataFrame:
+        rows = meta["rows"]
+        index = base[HEADER_BYTES:HEADER_BYTES + rows * 8].view("M8[ns]")
+        values = base[HEADER_BYTES + rows * 8:].view(np.float64).reshape(len(FIELDS), rows)
+        # values.T is an F-ordered (n, 5) view: pandas keeps it as a single block, no copy
+        df = pd.DataFrame(values.T, index=pd.DatetimeIndex(index, name="Date", copy=False), columns=list(FIELDS), copy=False)
+        df.attrs["data_source"] = meta["source"]
+        df.attrs["shared_segment"] = name
+        if meta.get("validation"):
+            # Published frames were validated by the publisher; readers reuse its report
+            df.attrs["validation"] = dict(meta["validation"])
+            stamp_report(df)
+        return df
+
+    # -- Public API ------------------------------------------------------------
+
+    def get(self, key: Tuple) -> Optional[pd.DataFrame]:
+        """Returns a zero-copy, read-only frame for `key` if some process published it."""
+        name = segment_name(key, self.namespace)
+        self._reap()
+        with self._lock:
+            with self._registry() as registry:
+                entry = registry["segments"].get(name)
+                if entry is None:
+                    return None
+                if self.ttl_seconds > 0 and time.time() - entry["created"] > self.ttl_seconds:
+                    return None
+                entry["last_used"] = time.time()
+
+                attached = self._attached.get(name)
+                base = attached[1]() if attached else None
+                if base is None:
+                    try:
+                        shm = _open_segment(name)
+                    except FileNotFoundError:
+                        del registry["segments"][name]
+                        return None
+                    meta = {"rows": entry["rows"], "source": entry["source"], "validation": entry.get("validation")}
+                    base = self._map(name, shm, meta)
+                    if os.getpid() not in entry["refs"]:
+                        entry["refs"].append(os.getpid())
+                meta = self._attached[name][2]
+            return self._frame(base, meta, name)
+
+    def publish(self, key: Tuple, df: pd.DataFrame, source: str) -> Optional[pd.DataFrame]:
+        """
+        Publishes a validated frame and returns the shared-memory backed equivalent
+        (or None if it does not fit). If another process published it first, attaches to theirs.
+        """
+        rows = len(df)
+        size = segment_size(rows)
+        if rows == 0 or size > self.max_bytes:
+            return None
+
+        existing = self.get(key)
+        if existing is not None:
+            return existing
+
+        name = segment_name(key, self.namespace)
+        with self._lock:
+            with self._registry() as registry:
+                self._cleanup_locked(registry)
+                if name in registry["segments"]:
+                    return None  # Published concurrently; served by the next get()
+                self._evict_locked(registry, size)
+                free = self._free_shm_bytes()
+                if free is not None and free < size:
+                    # Writing past the tmpfs limit would SIGBUS instead of raising
+                    logger.warning(f"Not enough free shared memory to publish {key}")
+                    return None
+
+                try:
+                    shm = _open_segment(name, create=True, size=size)
+                except FileExistsError:
+                    # Unregistered leftover of a crashed publisher (publishers hold the lock)
+                    _unlink_segment(name)
+                    shm = _open_segment(name, create=True, size=size)
+
+                try:
+                    shm.buf[:len(MAGIC)] = MAGIC
+                    np.ndarray((1,), dtype=np.int64, buffer=shm.buf, offset=len(MAGIC))[0] = rows
+                    np.ndarray((rows,), dtype=np.int64, buffer=shm.buf, offset=HEADER_BYTES)[:] = (
+                        df.index.values.astype("M8[ns]").view(np.int64)
+                    )
+                    np.ndarray((len(FIELDS), rows), dtype=np.float64, buffer=shm.buf, offset=HEADER_BYTES + rows * 8)[:] = (
+                        df[list(FIELDS)].to_numpy(dtype=np.float64).T
+                    )
+                except Exception:
+                    shm.close()
+                    shm.unlink()
+                    raise
+
+                now = time.time()
+                registry["segments"][name] = {
+                    "key": repr(key),
+                    "bytes": size,
+                    "rows": rows,
+                    "source": source,
+                    "created": now,
+                    "last_used": now,
+                    "refs": [os.getpid()],
+                    "validation": df.attrs.get("validation"),
+                }
+                base = self._map(name, shm, {"rows": rows, "source": source, "validation": df.attrs.get("validation")})
+            logger.info(f"Published {key} to shared memory ({size / 1e6:.1f} MB)")
+            return self._frame(base, self._attached[name][2], name)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._registry() as registry:
+            self._cleanup_locked(registry)
+            segments = registry["segments"]
+            return {
+                "segments": len(segments),
+                "bytes": sum(entry["bytes"] for entry in segments.values()),
+                "max_bytes": self.max_bytes,
+                "attached_here": len(self._attached),
+            }
+
+    def clear(self):
+        """Unlinks every published segment (mapped frames stay valid until released)."""
+        with self._lock, self._registry() as registry:
+            for name in list(registry["segments"]):
+                _unlink_segment(name)
+            registry["segments"].clear()
+
+    def detach_all(self):
+        """Drops this process's references (called at exit)."""
+        with self._lock:
+            names = list(self._attached)
+            self._attached.clear()
+        if not names:
+            return
+        try:
+            with self._registry() as registry:
+                pid = os.getpid()
+                for name in names:
+                    entry = registry["segments"].get(name)
+                    if entry and pid in entry["refs"]:
+                        entry["refs"].remove(pid)
+        except OSError:
+            pass
@@ -1,34 +1,154 @@
-import pandas as pd
-from typing import List, Optional
+import hashlib
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from backend.app.core.config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 REQUIRED_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
 
+# OHLC consistency checks: name -> message. Fatal in strict mode, warnings otherwise.
+CONSISTENCY_CHECKS = {
+    "non_positive_price": "bars with a zero or negative price",
+    "high_below_open_close": "bars with High below Open/Close",
+    "low_above_open_close": "bars with Low above Open/Close",
+    "negative_volume": "bars with negative Volume",
+}
+
 class DataValidationError(Exception):
     """Custom exception for data validation failures."""
     def __init__(self, message: str, details: Optional[dict] = None):
         super().__init__(message)
         self.details = details
 
-def validate_market_data(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+@dataclass
+class ValidationReport:
+    """Outcome of validate_market_data, stored in `df.attrs["validation"]` as a dict."""
+    ticker: str
+    rows: int                       # Rows after cleaning
+    fingerprint: str                # fingerprint_frame(df, columns=REQUIRED_COLUMNS) of the result
+    strict: bool = False
+    cached: bool = False            # Report reused from an earlier validation: checks skipped
+    resorted: bool = False          # Index was out of order
+    duplicates_dropped: int = 0
+    missing_volume: int = 0         # NaN volumes are tolerated, NaN prices are not
+    issues: Dict[str, int] = field(default_factory=dict)  # CONSISTENCY_CHECKS name -> bar count
+    warnings: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def _index_values(index) -> "np.ndarray":
+    import numpy as np
+    import pandas as pd
+
+    return index.asi8 if isinstance(index, pd.DatetimeIndex) else np.asarray(index.values)
+
+def _digest(index_values: "np.ndarray", columns: List["np.ndarray"]) -> str:
+    import numpy as np
+
+    # Column by column, so float64 columns are hashed in place without an (n, k) copy.
+    # A content id, not a security boundary: SHA-1 is hardware-accelerated on most CPUs
+    # and measured ~2x faster than BLAKE2 here.
+    h = hashlib.sha1(usedforsecurity=False)
+    h.update(np.ascontiguousarray(index_values))
+    for column in columns:
+        h.update(np.ascontiguousarray(column))
+    return h.hexdigest()
+
+def buffer_identity(df: "pd.DataFrame") -> List[int]:
+    """
+    Row count and memory addresses of the index and OHLCV buffers. Frames derived from
+    a validated frame (arithmetic, fillna/ffill, assigning a price column, row slices,
+    deep copies) get new buffers, so they don't match the identity recorded for it.
+    """
+    import numpy as np
+
+    arrays = [_index_values(df.index)] + [np.asarray(df[column]) for column in REQUIRED_COLUMNS if column in df.columns]
+    return [len(df)] + [array.__array_interface__["data"][0] for array in arrays]
+
+def stamp_report(df: "pd.DataFrame"):
+    """Ties the frame's validation report to its current buffers (see recorded_report)."""
+    df.attrs["validated_buffers"] = buffer_identity(df)
+
+def recorded_report(df: "pd.DataFrame") -> Optional[Dict[str, Any]]:
+    """
+    The validation report a frame carries, if it still describes the frame. Reports
+    travel in `df.attrs`, and pandas copies attrs onto every derived frame, so a report
+    only counts while the frame still holds the buffers it was stamped on (service
+    copies and shared-memory frames are restamped). Values edited in place, on the same
+    buffers, are not detected: validated frames are treated as read-only.
+    """
+    report = df.attrs.get("validation")
+    if not report or report.get("rows") != len(df):
+        return None
+    if df.attrs.get("validated_buffers") != buffer_identity(df):
+        return None
+    return report
+
+def canonical_columns(df: "pd.DataFrame") -> List[str]:
+    """The frame's columns with OHLCV first, in REQUIRED_COLUMNS order (providers differ)."""
+    present = set(df.columns)
+    return [column for column in REQUIRED_COLUMNS if column in present] + [
+        column for column in df.columns if column not in REQUIRED_COLUMNS
+    ]
+
+def fingerprint_frame(df: "pd.DataFrame", rows: Optional[int] = None, columns: Optional[List[str]] = None) -> str:
     """
-    Validates the structure and integrity of market data.
-    
+    Content hash of the first `rows` bars (index + values of `columns`, default all in
+    canonical order). Used to prove a new series extends exactly the series a
+    checkpoint was taken on. Whole validated frames reuse the fingerprint recorded when
+    they were validated.
+    """
+    import numpy as np
+
+    columns = canonical_columns(df) if columns is None else list(columns)
+    if rows is None or rows == len(df):
+        report = recorded_report(df)
+        if report and columns == REQUIRED_COLUMNS:
+            return report["fingerprint"]
+    if rows is not None:
+        df = df.iloc[:rows]
+    return _digest(_index_values(df.index), [df[column].to_numpy(dtype=np.float64) for column in columns])
+
+def _enforce(report: ValidationReport, ticker: str):
+    if report.strict and report.issues:
+        raise DataValidationError(
+            f"Data for {ticker} failed consistency checks: {'; '.join(report.warnings)}",
+            details=report.issues,
+        )
+
+def validate_frame(df: "pd.DataFrame", ticker: str, strict: Optional[bool] = None) -> Tuple["pd.DataFrame", ValidationReport]:
+    """
+    Validates the structure and integrity of market data in one vectorized pass over
+    the OHLCV columns: missing prices, OHLC consistency (positive prices,
+    High >= max(Open, Close), Low <= min(Open, Close), Volume >= 0), index order and
+    duplicates. Frames that carry a report from an earlier validation are not rechecked.
+
     Args:
         df: The pandas DataFrame containing historical data.
         ticker: The symbol being validated (for error messages).
-        
+        strict: Reject consistency issues instead of reporting them (default: DATA_VALIDATION_STRICT).
+
     Returns:
-        The validated DataFrame (potentially with types cast).
-        
+        The validated DataFrame (the input itself when it is already clean, otherwise one
+        sorted / de-duplicated copy) and its report.
+
     Raises:
         DataValidationError: If validation fails.
     """
+    import numpy as np
+
+    strict = settings.DATA_VALIDATION_STRICT if strict is None else strict
+
     # 1. Check if empty
     if df is None or df.empty:
         raise DataValidationError(f"No data found for ticker: {ticker}")
 
     # 2. Check Required Columns
-    # yfinance sometimes returns MultiIndex columns or extra columns. 
+    # yfinance sometimes returns MultiIndex columns or extra columns.
     # We expect a flat index with standard OHLCV.
     missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_cols:
@@ -37,26 +157,83 @@ def validate_market_data(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
             details={"missing": missing_cols, "found": list(df.columns)}
         )
 
-    # 3. Check for NaNs in critical columns
-    # We allow some NaNs in Volume if necessary, but Price data must be solid.
-    null_counts = df[REQUIRED_COLUMNS].isnull().sum()
-    if null_counts.sum() > 0:
-        # For simulation, we can't accept gaps in price data easily.
-        # Dropping small % of rows might be okay, but for now we strictly reject or warn.
-        # Let's strictly reject if any price data is missing.
-        price_nulls = null_counts.drop("Volume", errors='ignore').sum()
-        if price_nulls > 0:
-             raise DataValidationError(
-                f"Data for {ticker} contains {price_nulls} missing price values.",
-                details=null_counts.to_dict()
-            )
-
-    # 4. Check Index Monotonicity (Time Sorted)
-    if not df.index.is_monotonic_increasing:
-        df = df.sort_index()
-    
-    # 5. Check for Duplicates
-    if df.index.has_duplicates:
-        df = df[~df.index.duplicated(keep='first')]
-
-    return df
+    # 3. Already validated (a copy handed out by the data service, or a shared-memory
+    # frame validated by its publisher): reuse the recorded report, recheck nothing
+    known = recorded_report(df)
+    if known:
+        report = ValidationReport(**{**known, "ticker": ticker, "cached": True})
+        if strict and not report.strict:
+            report.strict = True
+            _enforce(report, ticker)
+        return df, report
+
+    # Zero-copy views of float64 columns (others are converted once)
+    try:
+        open_, high, low, close, volume = (df[column].to_numpy(dtype=np.float64) for column in REQUIRED_COLUMNS)
+    except (TypeError, ValueError) as e:
+        raise DataValidationError(f"Data for {ticker} has non-numeric OHLCV values: {e}")
+    index = _index_values(df.index)
+
+    # 4. Check for NaNs in critical columns
+    # Volume may be missing, but we can't simulate across gaps in price data.
+    null_counts = [int(np.isnan(column).sum()) for column in (open_, high, low, close, volume)]
+    price_nulls = sum(null_counts[:4])
+    if price_nulls > 0:
+        raise DataValidationError(
+            f"Data for {ticker} contains {price_nulls} missing price values.",
+            details=dict(zip(REQUIRED_COLUMNS, null_counts))
+        )
+
+    # 5. OHLC consistency (comparisons with a NaN volume are simply False)
+    upper = np.maximum(open_, close)
+    lower = np.minimum(open_, close)
+    counts = {
+        "non_positive_price": int(((lower <= 0) | (low <= 0) | (high <= 0)).sum()),
+        "high_below_open_close": int((high < upper).sum()),
+        "low_above_open_close": int((low > lower).sum()),
+        "negative_volume": int((volume < 0).sum()),
+    }
+    issues = {name: count for name, count in counts.items() if count}
+
+    # 6. Index order and duplicates, fixed with at most one copy
+    resorted = bool((np.diff(index) < 0).any())
+    order = np.argsort(index, kind="stable") if resorted else None
+    ordered = index[order] if resorted else index
+    first = np.ones(len(ordered), dtype=bool)
+    first[1:] = ordered[1:] != ordered[:-1]
+    duplicates = int(len(first) - first.sum())
+
+    columns = [open_, high, low, close, volume]
+    if resorted or duplicates:
+        take = order[first] if resorted else np.flatnonzero(first)
+        df = df.iloc[take]
+        index = _index_values(df.index)
+        columns = [df[column].to_numpy(dtype=np.float64) for column in REQUIRED_COLUMNS]
+
+    # 7. Fingerprint the content once; it travels with the frame from here on
+    report = ValidationReport(
+        ticker=ticker,
+        rows=len(df),
+        fingerprint=_digest(index, columns),
+        strict=strict,
+        resorted=resorted,
+        duplicates_dropped=duplicates,
+        missing_volume=null_counts[4],
+        issues=issues,
+        warnings=[f"{count} {CONSISTENCY_CHECKS[name]}" for name, count in issues.items()],
+    )
+    _enforce(report, ticker)
+    return df, report
+
+def validate_market_data(df: "pd.DataFrame", ticker: str, strict: Optional[bool] = None) -> "pd.DataFrame":
+    """
+    Validates market data (see validate_frame) and returns the validated frame, with
+    the report in `df.attrs["validation"]`, stamped on the frame's buffers.
+
+    Raises:
+        DataValidationError: If validation fails.
+    """
+    validated, report = validate_frame(df, ticker, strict)
+    validated.attrs["validation"] = report.to_dict()
+    stamp_report(validated)
+    return validated
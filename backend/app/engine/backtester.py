@@ -1,13 +1,28 @@
 import backtrader as bt
 import pandas as pd
-from typing import Type, Dict, Any, List
+from typing import Type, Dict, Any, List, Optional, Tuple
 from backend.app.strategies.base import StrategyBase
 from backend.app.engine.execution import AccountAnalyzer, TradeLogger
+from backend.app.engine.ledger import TradeLedger
+from backend.app.engine.journal import EventJournal
+from backend.app.data.resample import parse_timeframe, resample
+from backend.app.engine.checkpoint import (
+    BacktestCheckpoint, capture_checkpoint, checkpoint_store, fingerprint_frame
+)
 from backend.app.core.config import settings
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Backtrader time frames of resampled feeds (parse_timeframe units)
+BT_TIMEFRAMES = {
+    "days": bt.TimeFrame.Days,
+    "weeks": bt.TimeFrame.Weeks,
+    "months": bt.TimeFrame.Months,
+    "minutes": bt.TimeFrame.Minutes,
+}
+
 class Backtester:
     """
     Wrapper around Backtrader Cerebro engine.
@@ -21,21 +36,97 @@ class Backtester:
         params: Dict[str, Any],
         initial_capital: float = 100000.0,
         transaction_cost: float = 0.001,
-        slippage: float = 0.0005
+        slippage: float = 0.0005,
+        checkpoint_key: Optional[str] = None,
+        analyzers: Optional[List[Tuple[type, Dict[str, Any]]]] = None,
+        low_memory: bool = False,
+        max_curve_points: int = 0,
+        journal: Optional[EventJournal] = None,
+        timeframes: Optional[List[str]] = None
     ):
-        self.cerebro = bt.Cerebro(runonce=False) # Disable runonce to avoid IndexError on short data/warmup
         self.strategy_cls = strategy_cls
+        # Higher-timeframe feeds: the strategy's own, then any requested for this run
+        self.timeframes = list(dict.fromkeys([*getattr(strategy_cls, 'timeframes', ()), *(timeframes or [])]))
+        for timeframe in self.timeframes:
+            parse_timeframe(timeframe)
+        # Low-memory mode: bounded line buffers (if the strategy allows it), a downsampled
+        # stored curve and streaming equity statistics
+        self.low_memory = low_memory
+        self.max_curve_points = max_curve_points if low_memory else 0
+        # (Backtrader can't bound the buffers of several feeds: multi-timeframe runs keep them)
+        self.exactbars = 1 if low_memory and getattr(strategy_cls, 'bounded_buffers', False) and not self.timeframes else 0
+        self.cerebro = self._new_cerebro()
         self.data = data
         self.params = params
         self.initial_capital = initial_capital
         self.transaction_cost = transaction_cost
         self.slippage = slippage
+        self.extra_analyzers = analyzers or []
+        # Order events are recorded into the journal by the strategy
+        self.journal = journal
+        # Checkpoints are only interchangeable between runs with identical configuration.
+        # A journaled run replays every bar, so its journal covers the whole history.
+        # Checkpoints restore the base feed only, so multi-timeframe runs always run in full.
+        self.checkpoint_key = None
+        if (checkpoint_key and settings.CHECKPOINT_ENABLED and not low_memory
+                and journal is None and not self.timeframes):
+            self.checkpoint_key = "|".join([
+                checkpoint_key,
+                f"{strategy_cls.__module__}.{strategy_cls.__qualname__}",
+                json.dumps(params, sort_keys=True, default=str),
+                repr((initial_capital, transaction_cost, slippage)),
+            ])
+
+    def _new_cerebro(self) -> bt.Cerebro:
+        # Disable runonce to avoid IndexError on short data/warmup
+        return bt.Cerebro(runonce=False, exactbars=self.exactbars)
+
+    def _find_checkpoint(self) -> Optional[BacktestCheckpoint]:
+        """
+        Returns a stored checkpoint whose series is an exact prefix of the current data.
+        """
+        if not self.checkpoint_key:
+            return None
+        checkpoint = checkpoint_store.get(self.checkpoint_key)
+        if checkpoint is None or checkpoint.bars > len(self.data):
+            return None
+        if checkpoint.bars < checkpoint.minperiod:
+            return None
+        if fingerprint_frame(self.data, checkpoint.bars) != checkpoint.fingerprint:
+            logger.info("Checkpoint prefix does not match current data (revised history). Running in full.")
+            return None
+        return checkpoint
 
     def run(self):
         """
         Runs the backtest.
         Returns a dictionary containing the equity curve, trades, and final stats.
         Handles inadequate data length or strategy errors gracefully.
+
+        If a checkpoint exists for the same configuration and the data extends its series,
+        only the new bars are simulated (after a warm-up replay) and the result is identical
+        to a full rerun.
+        """
+        checkpoint = self._find_checkpoint()
+        if checkpoint is not None:
+            if checkpoint.bars == len(self.data):
+                logger.info("Checkpoint covers the full series. Reusing stored results.")
+                return {
+                    "equity_curve": list(checkpoint.equity_curve),
+                    "trades": checkpoint.trades.copy(),
+                    "final_value": checkpoint.equity_curve[-1]["equity"] if checkpoint.equity_curve else self.initial_capital
+                }
+            try:
+                return self._run_engine(checkpoint)
+            except Exception as e:
+                logger.warning(f"Resuming from checkpoint failed ({e}). Falling back to a full run.")
+                self.cerebro = self._new_cerebro()
+
+        return self._run_engine()
+
+    def _run_engine(self, checkpoint: Optional[BacktestCheckpoint] = None):
+        """
+        Configures and runs Cerebro, either on the full data or resumed from a checkpoint.
         """
         try:
             # 0. Pre-validation
@@ -47,9 +138,35 @@ class Backtester:
             # 1. Setup Data Feed
             # Backtrader uses its own data feed structure.
             # We assume data is a pandas DataFrame with datetime index.
-            data_feed = bt.feeds.PandasData(dataname=self.data)
+            data = self.data
+            strategy_params = dict(self.params)
+            if self.journal is not None:
+                strategy_params['journal'] = self.journal
+            skip_bars = 0
+            if checkpoint is not None:
+                # Replay just enough history to warm up indicators, then re-apply the
+                # checkpoint on its last bar and continue on the new bars
+                warmup_start = checkpoint.bars - checkpoint.minperiod
+                data = self.data.iloc[warmup_start:]
+                skip_bars = checkpoint.minperiod
+                strategy_params.update(checkpoint=checkpoint, checkpoint_bar=skip_bars)
+                logger.info(f"Resuming from checkpoint at bar {checkpoint.bars}: {len(self.data) - checkpoint.bars} new bars")
+
+            data_feed = bt.feeds.PandasData(dataname=data)
             self.cerebro.adddata(data_feed)
 
+            # 1b. Higher-timeframe feeds, cached per series: a date range of a series already
+            # aggregated is sliced from it. Each bar is stamped with the last base bar of
+            # its period, so the feeds line up with the base feed.
+            for timeframe in self.timeframes:
+                unit, count = parse_timeframe(timeframe)
+                self.cerebro.adddata(bt.feeds.PandasData(
+                    dataname=resample(self.data, timeframe).frame,
+                    name=timeframe,
+                    timeframe=BT_TIMEFRAMES[unit],
+                    compression=count,
+                ))
+
             # 2. Setup Broker (Cash, Commission, Slippage)
             self.cerebro.broker.setcash(self.initial_capital)
             self.cerebro.broker.setcommission(commission=self.transaction_cost)
@@ -58,12 +175,21 @@ class Backtester:
             self.cerebro.broker.set_slippage_perc(perc=self.slippage)
 
             # 3. Add Strategy
-            self.cerebro.addstrategy(self.strategy_cls, **self.params)
+            self.cerebro.addstrategy(self.strategy_cls, **strategy_params)
 
             # 4. Add Analyzers
             # We attach our custom analyzers for strict accounting
-            self.cerebro.addanalyzer(AccountAnalyzer, _name='account')
+            self.cerebro.addanalyzer(
+                AccountAnalyzer,
+                _name='account',
+                skip_bars=skip_bars,
+                capacity=len(data),
+                max_points=self.max_curve_points,
+                track_stats=self.low_memory
+            )
             self.cerebro.addanalyzer(TradeLogger, _name='trades')
+            for analyzer_cls, analyzer_kwargs in self.extra_analyzers:
+                self.cerebro.addanalyzer(analyzer_cls, **analyzer_kwargs)
             
             # 5. Run
             logger.info(f"Starting Backtest with Capital: {self.initial_capital}")
@@ -76,7 +202,7 @@ class Backtester:
                 logger.warning("Backtest finished but no strategy instance returned.")
                 return {
                     "equity_curve": [],
-                    "trades": [],
+                    "trades": TradeLedger(),
                     "final_value": self.initial_capital
                 }
 
@@ -86,18 +212,38 @@ class Backtester:
             account_data = max_strat.analyzers.account.get_analysis()
             trade_data = max_strat.analyzers.trades.get_analysis()
 
+            equity_curve = account_data.get('equity_curve', [])
+            trades = trade_data.get('trades', TradeLedger())
+            if checkpoint is not None:
+                equity_curve = checkpoint.equity_curve + equity_curve
+                trades = TradeLedger.concat([checkpoint.trades, trades])
+
+            # 7. Snapshot end-of-run state for incremental continuation
+            if self.checkpoint_key and equity_curve:
+                checkpoint_store.put(
+                    self.checkpoint_key,
+                    capture_checkpoint(max_strat, self.data, equity_curve, trades)
+                )
+
             return {
-                "equity_curve": account_data.get('equity_curve', []),
-                "trades": trade_data.get('trades', []),
-                "final_value": self.cerebro.broker.getvalue()
+                "equity_curve": equity_curve,
+                "trades": trades,
+                "final_value": self.cerebro.broker.getvalue(),
+                "equity_stats": account_data.get('stats'),
+                "analysis": {
+                    kwargs['_name']: getattr(max_strat.analyzers, kwargs['_name']).get_analysis()
+                    for _, kwargs in self.extra_analyzers if '_name' in kwargs
+                }
             }
 
         except IndexError as e:
+            if checkpoint is not None:
+                raise
             logger.error(f"Backtrader Index Error (likely insufficient data for indicators): {e}")
             # Return empty results implies "No trades possible" rather than 500
             return {
                 "equity_curve": [],
-                "trades": [],
+                "trades": TradeLedger(),
                 "final_value": self.initial_capital
             }
         except Exception as e:
@@ -0,0 +1,175 @@
+import backtrader as bt
+import pandas as pd
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+from backend.app.core.config import settings
+from backend.app.data.validators import fingerprint_frame
+from backend.app.engine.ledger import TradeLedger
+
+logger = logging.getLogger(__name__)
+
+def iter_indicator_lines(owner) -> Iterator[Any]:
+    """
+    Walks every indicator (and nested sub-indicator / line operation) of a strategy
+    in construction order, yielding each line buffer. Order is deterministic for a
+    given strategy class and parameters, so two runs yield matching sequences.
+    """
+    for node in owner._lineiterators[bt.LineIterator.IndType]:
+        if isinstance(node, bt.linebuffer.LineBuffer):
+            yield node
+        else:
+            yield from node.lines
+            yield from iter_indicator_lines(node)
+
+@dataclass
+class BacktestCheckpoint:
+    """
+    End-of-run engine state, sufficient to continue the same backtest on new bars.
+    """
+    bars: int                      # Number of bars processed (checkpoint bar = bars - 1)
+    fingerprint: str               # fingerprint_frame(data, bars)
+    minperiod: int                 # Strategy warm-up length
+    cash: float
+    position_size: float
+    position_price: float
+    open_trade: Optional[Dict[str, Any]]
+    open_fills: Optional[Dict[str, float]]  # TradeLogger fills of the open trade
+    pending_orders: List[Tuple[bool, float]]  # (is_buy, size) market orders awaiting the next bar
+    indicator_values: List[float]  # Last value of every indicator line
+    strategy_state: Dict[str, Any] = field(default_factory=dict)
+    # Accumulated outputs of the runs so far; metrics are recomputed over the full
+    # series so a resumed result matches a full rerun exactly
+    equity_curve: List[Dict[str, Any]] = field(default_factory=list)
+    trades: TradeLedger = field(default_factory=TradeLedger)
+
+def capture_checkpoint(strategy, data: pd.DataFrame, equity_curve: list, trades: TradeLedger) -> BacktestCheckpoint:
+    """
+    Snapshots broker, open trade, pending orders and indicator state after cerebro.run().
+    """
+    broker = strategy.broker
+    feed = strategy.datas[0]
+    position = broker.getposition(feed)
+
+    open_trade = None
+    trades_for_data = strategy._trades[feed][0]
+    if trades_for_data and trades_for_data[-1].isopen:
+        t = trades_for_data[-1]
+        open_trade = {
+            "size": t.size,
+            "price": t.price,
+            "value": t.value,
+            "commission": t.commission,
+            "pnl": t.pnl,
+            "pnlcomm": t.pnlcomm,
+            "dtopen": t.dtopen,
+            "barlen": t.barlen,
+            "long": t.long,
+        }
+
+    trade_logger = getattr(strategy.analyzers, 'trades', None)
+    open_fills = trade_logger.get_open_fills(feed) if trade_logger is not None else None
+
+    pending = [
+        (order.isbuy(), abs(order.created.size))
+        for order in list(broker.submitted) + list(broker.pending)
+        if order is not None and order.alive()
+    ]
+
+    return BacktestCheckpoint(
+        bars=len(data),
+        fingerprint=fingerprint_frame(data),
+        minperiod=strategy._minperiod,
+        cash=broker.getcash(),
+        position_size=position.size,
+        position_price=position.price,
+        open_trade=open_trade,
+        open_fills=open_fills,
+        pending_orders=pending,
+        indicator_values=[line[0] for line in iter_indicator_lines(strategy)],
+        strategy_state=strategy.get_checkpoint_state(),
+        equity_curve=list(equity_curve),
+        trades=trades.copy(),
+    )
+
+def restore_checkpoint(strategy, checkpoint: BacktestCheckpoint):
+    """
+    Re-applies a checkpoint on the checkpoint bar of a resumed run.
+    Indicators have already been recomputed from the warm-up window; their last values
+    are overwritten anyway so recursive indicators continue from the exact same state.
+    """
+    broker = strategy.broker
+    feed = strategy.datas[0]
+
+    lines = list(iter_indicator_lines(strategy))
+    if len(lines) != len(checkpoint.indicator_values):
+        raise ValueError("Checkpoint indicator layout does not match the strategy")
+    for line, value in zip(lines, checkpoint.indicator_values):
+        line[0] = value
+
+    broker.cash = checkpoint.cash
+    broker.positions[feed] = bt.Position(checkpoint.position_size, checkpoint.position_price)
+
+    if checkpoint.open_trade:
+        ot = checkpoint.open_trade
+        trade = bt.Trade(data=feed, tradeid=0, historyon=strategy._tradehistoryon)
+        trade.size = ot["size"]
+        trade.price = ot["price"]
+        trade.value = ot["value"]
+        trade.commission = ot["commission"]
+        trade.pnl = ot["pnl"]
+        trade.pnlcomm = ot["pnlcomm"]
+        trade.dtopen = ot["dtopen"]
+        trade.baropen = len(feed) - ot["barlen"]
+        trade.barlen = ot["barlen"]
+        trade.long = ot["long"]
+        trade.isopen = True
+        trade.status = trade.Open
+        strategy._trades[feed][0].append(trade)
+
+    trade_logger = getattr(strategy.analyzers, 'trades', None)
+    if checkpoint.open_fills and trade_logger is not None:
+        trade_logger.set_open_fills(feed, checkpoint.open_fills)
+
+    for is_buy, size in checkpoint.pending_orders:
+        if is_buy:
+            strategy.buy(size=size)
+        else:
+            strategy.sell(size=size)
+
+    strategy.restore_checkpoint_state(checkpoint.strategy_state)
+
+class CheckpointStore:
+    """
+    Thread-safe, LRU-bounded in-memory store of backtest checkpoints.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, BacktestCheckpoint]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[BacktestCheckpoint]:
+        with self._lock:
+            checkpoint = self._entries.get(key)
+            if checkpoint is not None:
+                self._entries.move_to_end(key)
+            return checkpoint
+
+    def put(self, key: str, checkpoint: BacktestCheckpoint):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = checkpoint
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Singleton shared by all requests in this process
+checkpoint_store = CheckpointStore(max_entries=settings.CHECKPOINT_MAX_ENTRIES)
@@ -0,0 +1,305 @@
+"""
+Compiler for declarative (JSON) strategy definitions.
+
+Expressions are parsed into canonical tuples, type-checked (numeric vs boolean) and
+evaluated over NumPy arrays with memoization keyed on the canonical form, so every
+distinct sub-expression (e.g. an SMA referenced by several rules, or repeated inline)
+is computed exactly once.
+
+Expression grammar:
+    number                                        constant
+    "close" | "open" | "high" | "low" | "volume"  price field
+    "<name>"                                      indicator declared in `indicators`
+    {"indicator": "sma", "period": 20, "source": "close"}   inline indicator
+    {"op": "gt" | "ge" | "lt" | "le", "left": expr, "right": expr}
+    {"op": "cross_above" | "cross_below", "left": expr, "right": expr}
+    {"op": "and" | "or", "args": [expr, ...]}
+    {"op": "not", "arg": expr}
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Tuple
+from backend.app.analytics.metrics import EquityAccumulator
+from backend.app.engine import vectorized as vec
+from backend.app.engine.ledger import TradeLedger
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+INDICATORS: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    "sma": vec.sma,
+    "ema": vec.ema,
+    "rsi": vec.rsi_sma,
+    "momentum": vec.momentum,
+}
+
+COMPARISONS = {
+    "gt": np.greater,
+    "ge": np.greater_equal,
+    "lt": np.less,
+    "le": np.less_equal,
+}
+
+CROSSES = ("cross_above", "cross_below")
+LOGICAL = ("and", "or")
+
+# Guards against pathological specs
+MAX_NODES = 256
+MAX_PERIOD = 5000
+
+Node = Tuple
+
+class StrategySpecError(ValueError):
+    """Raised when a declarative strategy is malformed."""
+
+class _Parser:
+    def __init__(self, indicators: Dict[str, Dict[str, Any]]):
+        self.indicators = indicators
+        self.nodes = 0
+
+    def indicator(self, spec: Dict[str, Any], where: str) -> Node:
+        kind = spec.get("type", spec.get("indicator"))
+        if kind not in INDICATORS:
+            raise StrategySpecError(f"{where}: unknown indicator '{kind}'. Available: {list(INDICATORS)}")
+        source = spec.get("source", "close")
+        if source not in PRICE_FIELDS:
+            raise StrategySpecError(f"{where}: unknown source '{source}'. Available: {list(PRICE_FIELDS)}")
+        period = spec.get("period")
+        if not isinstance(period, int) or isinstance(period, bool) or not 0 < period <= MAX_PERIOD:
+            raise StrategySpecError(f"{where}: period must be an integer in [1, {MAX_PERIOD}]")
+        return ("ind", kind, source, period)
+
+    def parse(self, expr: Any, where: str) -> Tuple[Node, str]:
+        """Returns (canonical node, 'num' | 'bool')."""
+        self.nodes += 1
+        if self.nodes > MAX_NODES:
+            raise StrategySpecError(f"Strategy has more than {MAX_NODES} expression nodes")
+
+        if isinstance(expr, bool):
+            raise StrategySpecError(f"{where}: booleans are not valid operands")
+        if isinstance(expr, (int, float)):
+            return ("const", float(expr)), "num"
+        if isinstance(expr, str):
+            if expr in PRICE_FIELDS:
+                return ("field", expr), "num"
+            if expr in self.indicators:
+                return self.indicator(self.indicators[expr], f"indicator '{expr}'"), "num"
+            raise StrategySpecError(f"{where}: unknown reference '{expr}'")
+        if not isinstance(expr, dict):
+            raise StrategySpecError(f"{where}: unsupported expression {expr!r}")
+
+        if "indicator" in expr:
+            return self.indicator(expr, where), "num"
+
+        op = expr.get("op")
+        if op in COMPARISONS or op in CROSSES:
+            left, lt = self.parse(expr.get("left"), f"{where}.left")
+            right, rt = self.parse(expr.get("right"), f"{where}.right")
+            if lt != "num" or rt != "num":
+                raise StrategySpecError(f"{where}: '{op}' needs numeric operands")
+            if op in COMPARISONS:
+                return ("cmp", op, left, right), "bool"
+            return ("cross", op, left, right), "bool"
+        if op in LOGICAL:
+            args = expr.get("args")
+            if not isinstance(args, list) or not args:
+                raise StrategySpecError(f"{where}: '{op}' needs a non-empty 'args' list")
+            parsed = []
+            for i, arg in enumerate(args):
+                node, kind = self.parse(arg, f"{where}.args[{i}]")
+                if kind != "bool":
+                    raise StrategySpecError(f"{where}.args[{i}]: '{op}' needs boolean operands")
+                parsed.append(node)
+            # Commutative: canonical order so equivalent rules share one evaluation
+            unique = tuple(sorted(set(parsed), key=repr))
+            return (unique[0] if len(unique) == 1 else (op, unique)), "bool"
+        if op == "not":
+            node, kind = self.parse(expr.get("arg"), f"{where}.arg")
+            if kind != "bool":
+                raise StrategySpecError(f"{where}: 'not' needs a boolean operand")
+            return ("not", node), "bool"
+        raise StrategySpecError(f"{where}: unknown operator '{op}'")
+
+class CompiledStrategy:
+    """
+    Validated entry/exit rules ready to evaluate over (tickers x bars) arrays.
+    """
+
+    def __init__(self, entry: Node, exit: Node, size: float = 1.0):
+        self.entry = entry
+        self.exit = exit
+        self.size = size
+
+    def signals(self, ohlcv: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Evaluates both rules with a shared memo (common-subexpression reuse)."""
+        memo: Dict[Node, np.ndarray] = {}
+        entry = self._eval(self.entry, ohlcv, memo)
+        exit = self._eval(self.exit, ohlcv, memo)
+        return entry, exit
+
+    def _eval(self, node: Node, data: Dict[str, np.ndarray], memo: Dict[Node, np.ndarray]) -> np.ndarray:
+        cached = memo.get(node)
+        if cached is not None:
+            return cached
+
+        kind = node[0]
+        if kind == "const":
+            out = np.float64(node[1])
+        elif kind == "field":
+            out = vec._as_2d(data[node[1]])
+        elif kind == "ind":
+            _, name, source, period = node
+            out = INDICATORS[name](self._eval(("field", source), data, memo), period)
+        elif kind == "cmp":
+            out = COMPARISONS[node[1]](self._eval(node[2], data, memo), self._eval(node[3], data, memo))
+        elif kind == "cross":
+            cross = vec.crossover(self._eval(node[2], data, memo), self._eval(node[3], data, memo))
+            out = cross > 0 if node[1] == "cross_above" else cross < 0
+        elif kind == "and":
+            out = np.logical_and.reduce([self._eval(arg, data, memo) for arg in node[1]])
+        elif kind == "or":
+            out = np.logical_or.reduce([self._eval(arg, data, memo) for arg in node[1]])
+        elif kind == "not":
+            # Comparisons on warm-up NaNs are False; their negation must not fire either
+            out = ~self._eval(node[1], data, memo) & self._valid(node[1], data, memo)
+        else:
+            raise StrategySpecError(f"Unknown node {node!r}")
+
+        memo[node] = out
+        return out
+
+    def _valid(self, node: Node, data: Dict[str, np.ndarray], memo: Dict[Node, np.ndarray]) -> np.ndarray:
+        """Bars where every value `node` depends on is defined (indicators past warm-up)."""
+        key = ("valid", node)
+        cached = memo.get(key)
+        if cached is not None:
+            return cached
+
+        kind = node[0]
+        if kind == "const":
+            out = np.True_
+        elif kind in ("field", "ind"):
+            out = ~np.isnan(self._eval(node, data, memo))
+        elif kind == "cmp":
+            out = self._valid(node[2], data, memo) & self._valid(node[3], data, memo)
+        elif kind == "cross":
+            both = vec._as_2d(self._valid(node[2], data, memo) & self._valid(node[3], data, memo))
+            # A cross also needs the previous bar
+            out = (both == 1.0) & (vec.shift(both, 1) == 1.0)
+        elif kind in ("and", "or"):
+            out = np.logical_and.reduce([self._valid(arg, data, memo) for arg in node[1]])
+        elif kind == "not":
+            out = self._valid(node[1], data, memo)
+        else:
+            raise StrategySpecError(f"Unknown node {node!r}")
+
+        memo[key] = out
+        return out
+
+def compile_strategy(spec: Dict[str, Any]) -> CompiledStrategy:
+    """
+    Validates a declarative spec ({"indicators": {...}, "entry": expr, "exit": expr, "size": n})
+    and compiles it. Raises StrategySpecError with the path of the offending expression.
+    """
+    indicators = spec.get("indicators") or {}
+    if not isinstance(indicators, dict):
+        raise StrategySpecError("indicators must be an object of name -> indicator")
+    for name in indicators:
+        if name in PRICE_FIELDS:
+            raise StrategySpecError(f"indicator name '{name}' shadows a price field")
+
+    parser = _Parser(indicators)
+    # Declared indicators are validated even if no rule references them
+    for name, ind in indicators.items():
+        if not isinstance(ind, dict):
+            raise StrategySpecError(f"indicator '{name}' must be an object")
+        parser.indicator(ind, f"indicator '{name}'")
+
+    rules = {}
+    for rule in ("entry", "exit"):
+        if rule not in spec:
+            raise StrategySpecError(f"'{rule}' rule is required")
+        node, kind = parser.parse(spec[rule], rule)
+        if kind != "bool":
+            raise StrategySpecError(f"'{rule}' must be a condition, not a number")
+        rules[rule] = node
+
+    size = spec.get("size", 1.0)
+    if isinstance(size, bool) or not isinstance(size, (int, float)) or not size > 0:
+        raise StrategySpecError("size must be a positive number of shares")
+
+    return CompiledStrategy(rules["entry"], rules["exit"], size=float(size))
+
+def run_declarative_backtest(
+    compiled: CompiledStrategy,
+    data: pd.DataFrame,
+    ticker: str,
+    initial_capital: float = 100000.0,
+    transaction_cost: float = 0.001,
+    slippage: float = 0.0005,
+    low_memory: bool = False,
+    max_curve_points: int = 0,
+) -> Dict[str, Any]:
+    """
+    Vectorized replacement for Backtester.run() on a single series.
+    Returns the same structure (equity_curve, trades, final_value). As in the engine,
+    `max_curve_points` keeps only every k-th bar (plus the last) in the curve, and
+    `low_memory` adds "equity_stats" computed over every bar.
+    """
+    if data.empty:
+        return {"equity_curve": [], "trades": TradeLedger(ticker), "final_value": initial_capital}
+
+    ohlcv = {f: data[f.capitalize()].to_numpy(dtype=np.float64)[np.newaxis, :] for f in PRICE_FIELDS}
+    entry, exit = compiled.signals(ohlcv)
+    # Entries the cash on hand can't cover are rejected, as by the engine's broker
+    target = vec.positions_within_cash(
+        np.broadcast_to(entry, ohlcv["close"].shape), np.broadcast_to(exit, ohlcv["close"].shape),
+        ohlcv["open"], ohlcv["high"], ohlcv["low"], ohlcv["close"],
+        size=compiled.size,
+        initial_capital=initial_capital,
+        transaction_cost=transaction_cost,
+        slippage=slippage,
+    )[np.newaxis, :]
+    sim = vec.simulate_long_only(
+        ohlcv["open"], ohlcv["high"], ohlcv["low"], ohlcv["close"], target,
+        size=compiled.size,
+        initial_capital=initial_capital,
+        transaction_cost=transaction_cost,
+        slippage=slippage,
+    )
+
+    n = len(data)
+    stride = -(-n // max_curve_points) if max_curve_points > 0 else 1
+    kept = np.unique(np.append(np.arange(0, n, stride), n - 1))
+    dates = [ts.date() for ts in data.index[kept]]
+    equity = sim["equity"][0]
+    equity_curve = [
+        {"date": d, "equity": e, "cash": c}
+        for d, e, c in zip(dates, equity[kept].tolist(), sim["cash"][0][kept].tolist())
+    ]
+
+    rt = vec.round_trips(sim, 1)
+    index = data.index.values.astype("M8[s]")
+    entry_dates, exit_dates = index[rt["entry_bar"]], index[rt["exit_bar"]]
+    trades = TradeLedger.from_arrays(
+        ticker,
+        entry_date=entry_dates,
+        exit_date=exit_dates,
+        entry_price=rt["entry_price"],
+        exit_price=rt["exit_price"],
+        size=rt["size"],
+        pnl=rt["pnl"],
+        pnl_net=rt["pnl_net"],
+        commission=rt["commission"],
+        slippage=rt["slippage"],
+        duration=(exit_dates - entry_dates) // np.timedelta64(1, "D"),
+    )
+
+    result = {
+        "equity_curve": equity_curve,
+        "trades": trades,
+        "final_value": float(equity[-1]),
+    }
+    if low_memory:
+        result["equity_stats"] = EquityAccumulator.from_array(equity, data.index[0].date(), data.index[-1].date())
+    return result
@@ -1,6 +1,11 @@
 import backtrader as bt
+import numpy as np
+import copy
 import logging
-from typing import Dict, Any, List
+from collections import deque
+from typing import Dict, Any, List, Optional
+from backend.app.analytics.metrics import EquityAccumulator
+from backend.app.engine.ledger import TradeLedger
 
 logger = logging.getLogger(__name__)
 
@@ -8,10 +13,31 @@ class AccountAnalyzer(bt.Analyzer):
     """
     Tracks daily portfolio value (Equity Curve).
     Includes Cash and Total Value (realized + unrealized).
+
+    Values are written into preallocated typed arrays (sized from `capacity`, grown if
+    exceeded) rather than one dict per bar. With `max_points`, only every k-th bar (plus
+    the last one) is stored; `track_stats` keeps exact running equity statistics so
+    metrics don't depend on the stored resolution.
     """
+
+    params = (
+        ('skip_bars', 0),  # Warm-up bars of a resumed run, already recorded by the original run
+        ('capacity', 0),  # Expected number of bars
+        ('max_points', 0),  # Approximate cap on stored curve points (0 = every bar)
+        ('track_stats', False),  # Accumulate equity statistics over every bar
+    )
     
     def __init__(self):
-        self.equity_curve = []
+        capacity = max(1, self.params.capacity)
+        self.stride = -(-capacity // self.params.max_points) if self.params.max_points > 0 else 1
+        size = -(-capacity // self.stride) + 1
+        self._dates = np.empty(size, dtype=np.float64)
+        self._equity = np.empty(size, dtype=np.float64)
+        self._cash = np.empty(size, dtype=np.float64)
+        self._stored = 0
+        self._bars = 0
+        self._pending = None  # Latest bar when it fell between stored points
+        self.stats = EquityAccumulator() if self.params.track_stats else None
 
     def next(self):
         # Called every bar
@@ -22,37 +48,112 @@ class AccountAnalyzer(bt.Analyzer):
         Records the current state of the portfolio.
         Safe access to date and values.
         """
-        if not len(self.strategy):
+        if not len(self.strategy) or len(self.strategy) <= self.params.skip_bars:
             return
 
         try:
-            # backtrader dates are floats, convert to datetime
-            dt = self.strategy.datetime.date()
+            # backtrader dates are floats, converted to dates when the curve is read
+            dt = self.strategy.datetime[0]
             value = self.strategy.broker.getvalue()
             cash = self.strategy.broker.getcash()
-            
-            self.equity_curve.append({
-                "date": dt,
-                "equity": value,
-                "cash": cash
-            })
+
+            if self.stats is not None:
+                self.stats.update(dt, value)
+            if self._bars % self.stride == 0:
+                self._store(dt, value, cash)
+                self._pending = None
+            else:
+                self._pending = (dt, value, cash)
+            self._bars += 1
         except Exception as e:
             logger.error(f"Error capturing account state: {e}")
 
+    def _store(self, dt: float, value: float, cash: float):
+        if self._stored == len(self._dates):
+            grow = max(1, len(self._dates))
+            self._dates = np.concatenate([self._dates, np.empty(grow)])
+            self._equity = np.concatenate([self._equity, np.empty(grow)])
+            self._cash = np.concatenate([self._cash, np.empty(grow)])
+        self._dates[self._stored] = dt
+        self._equity[self._stored] = value
+        self._cash[self._stored] = cash
+        self._stored += 1
+
     def get_analysis(self):
-        return {
-            "equity_curve": self.equity_curve
+        if self._pending is not None:
+            # Always keep the final bar so the curve ends on the final equity
+            self._store(*self._pending)
+            self._pending = None
+
+        n = self._stored
+        analysis = {
+            "equity_curve": [
+                {"date": bt.num2date(dt).date(), "equity": equity, "cash": cash}
+                for dt, equity, cash in zip(
+                    self._dates[:n].tolist(), self._equity[:n].tolist(), self._cash[:n].tolist()
+                )
+            ]
         }
+        if self.stats is not None:
+            stats = copy.copy(self.stats)
+            if stats.count:
+                stats.first_date = bt.num2date(stats.first_date).date()
+                stats.last_date = bt.num2date(stats.last_date).date()
+            analysis["stats"] = stats
+        return analysis
 
 
 class TradeLogger(bt.Analyzer):
     """
-    Logs every completed trade with strict lifecycle details.
-    Fixes ZeroDivisionError by avoiding division by trade.size on closed trades.
+    Logs every completed trade into a TradeLedger (structured NumPy array).
+    Fill prices, sizes and slippage are accumulated from order notifications, so exit
+    price and size are real values rather than reconstructed from the closed trade.
+    Slippage is measured against the open of the execution bar (positive = cost).
     """
+
+    params = (
+        ('capacity', 64),  # Initial ledger rows (grows as needed)
+    )
     
     def __init__(self):
-        self.trades = []
+        self.ledger = TradeLedger(capacity=self.params.capacity)
+        self._open: Dict[Any, Dict[str, float]] = {}  # Fills of the trade in progress, per data
+        self._closed: Dict[Any, deque] = {}  # Fully exited fills awaiting their trade notification
+
+    @staticmethod
+    def _new_fills() -> Dict[str, float]:
+        return {"qty": 0.0, "entry_qty": 0.0, "exit_qty": 0.0, "exit_value": 0.0, "slippage": 0.0}
+
+    def notify_order(self, order):
+        """
+        Backtrader hook called on order status changes (before the trade updates).
+        """
+        if order.status != order.Completed or not order.executed.size:
+            return
+
+        data = order.data
+        size = order.executed.size
+        price = order.executed.price
+        slip = price - data.open[0]  # Per unit, signed so that (slip * size) > 0 is a cost
+        fills = self._open.setdefault(data, self._new_fills())
+
+        remaining = size
+        if fills["qty"] and (fills["qty"] > 0) != (size > 0):
+            closing = -fills["qty"] if abs(size) >= abs(fills["qty"]) else size
+            fills["qty"] += closing
+            fills["exit_qty"] += abs(closing)
+            fills["exit_value"] += abs(closing) * price
+            fills["slippage"] += slip * closing
+            remaining = size - closing
+            if fills["qty"] == 0:
+                # Any remainder (a reversal) or later fill belongs to the next trade
+                self._closed.setdefault(data, deque()).append(fills)
+                fills = self._open[data] = self._new_fills()
+
+        if remaining:
+            fills["qty"] += remaining
+            fills["entry_qty"] += abs(remaining)
+            fills["slippage"] += slip * remaining
 
     def notify_trade(self, trade):
         """
@@ -61,54 +162,46 @@ class TradeLogger(bt.Analyzer):
         """
         if trade.isclosed:
             try:
-                # Safe Extraction of Trade Details
-                ticker = trade.data._name if hasattr(trade.data, '_name') else "Unknown"
-                
+                if not self.ledger.ticker:
+                    self.ledger.ticker = getattr(trade.data, '_name', '') or ''
+
+                queue = self._closed.get(trade.data)
+                fills = queue.popleft() if queue else self._open.pop(trade.data, self._new_fills())
+
                 # Dates
                 entry_date = bt.num2date(trade.dtopen)
                 exit_date = bt.num2date(trade.dtclose)
-                
-                # Prices
-                # trade.price is the entry price (average).
-                entry_price = trade.price
-                
-                # Calculate Exit Price safely
-                # PnL = (Exit_Price - Entry_Price) * Size
-                # But trade.size is 0 now.
-                # However, the PnL was realized on the 'initial' size or 'closed' size.
-                # We don't have the closed size explicitly in the 'trade' object easily if partial closures happened,
-                # but assuming single-shot closure or aggregated trade:
-                
-                # Valid fallback: exit_price is None if we can't be sure, 
-                # or simplified: since we know PnL and Entry, strictly strictly:
-                # We can't divide by size=0.
-                exit_price = None 
-
-                # Metrics
-                pnl = trade.pnl          # Gross PnL
-                pnl_net = trade.pnlcomm  # Net PnL (after commissions)
-                
-                # Duration
-                duration = (exit_date - entry_date).days if entry_date and exit_date else 0
-
-                trade_record = {
-                    "ticker": ticker,
-                    "entry_date": entry_date,
-                    "exit_date": exit_date,
-                    "entry_price": entry_price,
-                    "exit_price": exit_price, # Explicitly None to avoid guessing/division errors
-                    "pnl": pnl,
-                    "pnl_net": pnl_net,
-                    "size": 0, # Closed means size is handled. We don't record 'size traded' here unless we track history.
-                    "duration": duration
-                }
-                
-                self.trades.append(trade_record)
+
+                # trade.price is the (average) entry price; the exit price is the
+                # volume-weighted price of the closing fills
+                entry_qty = fills["entry_qty"]
+                exit_price = fills["exit_value"] / fills["exit_qty"] if fills["exit_qty"] else np.nan
+
+                self.ledger.append(
+                    entry_date=entry_date,
+                    exit_date=exit_date,
+                    entry_price=trade.price,
+                    exit_price=exit_price,
+                    size=entry_qty if trade.long else -entry_qty,
+                    pnl=trade.pnl,            # Gross PnL
+                    pnl_net=trade.pnlcomm,    # Net PnL (after commissions)
+                    commission=trade.commission,
+                    slippage=fills["slippage"],
+                    duration=(exit_date - entry_date).days,
+                )
 
             except Exception as e:
                 logger.error(f"Error logging trade: {e}")
+
+    def get_open_fills(self, data) -> Optional[Dict[str, float]]:
+        """Fills of the trade still open on `data` (persisted in checkpoints)."""
+        fills = self._open.get(data)
+        return dict(fills) if fills and fills["qty"] else None
+
+    def set_open_fills(self, data, fills: Dict[str, float]):
+        self._open[data] = dict(fills)
             
     def get_analysis(self):
         return {
-            "trades": self.trades
+            "trades": self.ledger
         }
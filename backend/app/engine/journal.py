@@ -0,0 +1,189 @@
+"""
+In-memory order event journal.
+
+Strategies record every signal, order submission, fill and cancellation as a fixed-size
+structured record in a preallocated ring buffer: one row assignment per event instead of
+a formatted log line. Once the buffer is full the oldest events are overwritten (and
+counted in `dropped`), so memory stays bounded however long the run.
+
+Events export as NDJSON (one JSON object per line) or as a binary `.npy` array of
+EVENT_DTYPE, and `order_analytics` summarizes the order flow (fill rate, fill delay,
+realized slippage versus the signal price, commissions, cancellations).
+"""
+
+import io
+import json
+import numpy as np
+from typing import Any, Dict, Iterator
+
+# Event kinds (EVENT_DTYPE "kind" codes are indices into EVENT_KINDS)
+SIGNAL, SUBMIT, FILL, CANCEL = range(4)
+EVENT_KINDS = ("signal", "submit", "fill", "cancel")
+
+# Why an order ended without filling (CANCEL events' "reason" codes)
+CANCEL_REASONS = ("canceled", "margin", "rejected", "expired")
+
+EVENT_DTYPE = np.dtype([
+    ("kind", "u1"),
+    ("side", "i1"),          # +1 buy, -1 sell
+    ("reason", "u1"),        # CANCEL_REASONS index (cancel events)
+    ("bar", "i4"),           # Bar number within the run (1-based)
+    ("date", "M8[s]"),
+    ("order", "i4"),         # Backtrader order ref (0 for signals)
+    ("price", "f8"),         # Close on the signal bar (signal, submit) or executed price (fill)
+    ("size", "f8"),          # Requested size, NaN if left to the sizer (signal, submit); executed size, signed (fill)
+    ("commission", "f8"),    # Fill commission
+])
+
+# Backtrader date numbers count days from 0001-01-01; this is 1970-01-01
+_EPOCH_DAYS = 719163.0
+
+class EventJournal:
+    """
+    Fixed-capacity ring buffer of EVENT_DTYPE records.
+    `record` is the hot path: one structured row assignment, no allocation.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        if capacity < 1:
+            raise ValueError("Journal capacity must be at least 1")
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.total = 0  # Events recorded, including overwritten ones
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        """Oldest events overwritten because the buffer was full."""
+        return max(0, self.total - self.capacity)
+
+    def record(
+        self,
+        kind: int,
+        bar: int,
+        date_num: float,
+        side: int = 0,
+        order: int = 0,
+        price: float = np.nan,
+        size: float = np.nan,
+        commission: float = 0.0,
+        reason: int = 0,
+    ):
+        """Appends one event; `date_num` is a Backtrader date number (e.g. `data.datetime[0]`)."""
+        self._data[self.total % self.capacity] = (
+            kind, side, reason, bar, round((date_num - _EPOCH_DAYS) * 86400.0),
+            order, price, size, commission,
+        )
+        self.total += 1
+
+    def events(self) -> np.ndarray:
+        """The retained events in chronological order (a copy once the buffer has wrapped)."""
+        if self.total <= self.capacity:
+            return self._data[:self.total]
+        start = self.total % self.capacity
+        return np.concatenate([self._data[start:], self._data[:start]])
+
+    @staticmethod
+    def iter_dicts(events: np.ndarray) -> Iterator[Dict[str, Any]]:
+        """JSON-ready dicts (kind and reason names, ISO dates, null for missing values)."""
+        columns = {name: events[name].tolist() for name in EVENT_DTYPE.names}
+        columns["date"] = np.datetime_as_string(events["date"]).tolist()
+        for i in range(len(events)):
+            kind = columns["kind"][i]
+            event = {
+                "kind": EVENT_KINDS[kind],
+                "bar": columns["bar"][i],
+                "date": columns["date"][i],
+                "side": "buy" if columns["side"][i] > 0 else "sell",
+                "price": columns["price"][i],
+                "size": columns["size"][i],
+            }
+            if kind != SIGNAL:
+                event["order"] = columns["order"][i]
+            if kind == FILL:
+                event["commission"] = columns["commission"][i]
+            if kind == CANCEL:
+                event["reason"] = CANCEL_REASONS[columns["reason"][i]]
+            yield {k: (None if isinstance(v, float) and v != v else v) for k, v in event.items()}
+
+    @staticmethod
+    def ndjson_from(events: np.ndarray) -> bytes:
+        return b"".join(json.dumps(event).encode() + b"\n" for event in EventJournal.iter_dicts(events))
+
+    def to_ndjson(self) -> bytes:
+        """The events as newline-delimited JSON."""
+        return self.ndjson_from(self.events())
+
+    def to_binary(self) -> bytes:
+        """The events as a `.npy` file (EVENT_DTYPE records; `np.load(io.BytesIO(blob))`)."""
+        buffer = io.BytesIO()
+        np.save(buffer, self.events(), allow_pickle=False)
+        return buffer.getvalue()
+
+    @staticmethod
+    def load_binary(blob: bytes) -> np.ndarray:
+        """Reads events written by `to_binary`."""
+        events = np.load(io.BytesIO(blob), allow_pickle=False)
+        if events.dtype != EVENT_DTYPE:
+            raise ValueError(f"Not an event journal: dtype {events.dtype}")
+        return events
+
+    def order_analytics(self) -> Dict[str, Any]:
+        return order_analytics(self.events(), dropped=self.dropped)
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    if not len(values):
+        return {"mean": 0.0, "median": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "mean": float(values.mean()),
+        "median": float(np.median(values)),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(values.max()),
+    }
+
+def order_analytics(events: np.ndarray, dropped: int = 0) -> Dict[str, Any]:
+    """
+    Order-level statistics over journal events. Fills are matched to their submission
+    by order ref; realized slippage is the fill price versus the close on the signal bar
+    (overnight gap plus the broker's slippage), positive when it cost money. Fills whose
+    submission was overwritten are counted but left out of the slippage figures.
+    """
+    kinds = events["kind"]
+    submits = events[kinds == SUBMIT]
+    fills = events[kinds == FILL]
+    cancels = events[kinds == CANCEL]
+
+    # Join fills to submissions on the order ref
+    order = np.argsort(submits["order"], kind="stable")
+    refs = submits["order"][order]
+    pos = np.minimum(np.searchsorted(refs, fills["order"]), max(len(refs) - 1, 0))
+    matched = (refs[pos] == fills["order"]) if len(refs) else np.zeros(len(fills), dtype=bool)
+    submitted = submits[order][pos[matched]]
+    filled = fills[matched]
+
+    signal_price = submitted["price"]
+    side = filled["side"].astype(np.float64)
+    slippage_bps = side * (filled["price"] - signal_price) / signal_price * 1e4
+    slippage_cost = side * (filled["price"] - signal_price) * np.abs(filled["size"])
+    delay_bars = (filled["bar"] - submitted["bar"]).astype(np.float64)
+
+    orders = len(submits)
+    return {
+        "events": int(len(events)),
+        "dropped": int(dropped),
+        "signals": int((kinds == SIGNAL).sum()),
+        "orders": orders,
+        "fills": int(len(fills)),
+        "fill_rate": float(len(np.unique(filled["order"])) / orders) if orders else 0.0,
+        "cancels": {
+            reason: int((cancels["reason"] == code).sum())
+            for code, reason in enumerate(CANCEL_REASONS)
+            if (cancels["reason"] == code).any()
+        },
+        "commission": float(fills["commission"].sum()),
+        "slippage_bps": _distribution(slippage_bps),
+        "slippage_cost": float(slippage_cost.sum()),
+        "fill_delay_bars": _distribution(delay_bars),
+    }
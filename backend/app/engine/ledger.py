@@ -0,0 +1,105 @@
+import numpy as np
+from typing import Any, Dict, Iterable, List
+
+# One row per closed trade. Dates keep second resolution (intraday bars); they are
+# reported as calendar dates.
+TRADE_DTYPE = np.dtype([
+    ("entry_date", "M8[s]"),
+    ("exit_date", "M8[s]"),
+    ("entry_price", "f8"),
+    ("exit_price", "f8"),
+    ("size", "f8"),        # Signed quantity: positive long, negative short
+    ("pnl", "f8"),         # Gross PnL
+    ("pnl_net", "f8"),     # Net PnL (after commissions)
+    ("commission", "f8"),  # Entry + exit commissions
+    ("slippage", "f8"),    # Cost of fills vs the execution bar's open (positive = paid)
+    ("duration", "f8"),    # Days
+])
+
+class TradeLedger:
+    """
+    Closed-trade ledger backed by a growable structured NumPy array.
+    Columns are read directly (`ledger["pnl_net"]`) by metrics; `to_dicts` builds the
+    JSON rows once, at serialization time.
+    """
+
+    def __init__(self, ticker: str = "", capacity: int = 64):
+        self.ticker = ticker
+        self._data = np.zeros(max(1, capacity), dtype=TRADE_DTYPE)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._data[column][:self._size]
+
+    @property
+    def records(self) -> np.ndarray:
+        """View of the filled rows."""
+        return self._data[:self._size]
+
+    def append(
+        self,
+        entry_date,
+        exit_date,
+        entry_price: float,
+        exit_price: float,
+        size: float,
+        pnl: float,
+        pnl_net: float,
+        commission: float,
+        slippage: float,
+        duration: float,
+    ):
+        if self._size == len(self._data):
+            self._data = np.concatenate([self._data, np.zeros(len(self._data), dtype=TRADE_DTYPE)])
+        self._data[self._size] = (
+            np.datetime64(entry_date, "s"), np.datetime64(exit_date, "s"),
+            entry_price, exit_price, size, pnl, pnl_net, commission, slippage, duration,
+        )
+        self._size += 1
+
+    def copy(self) -> "TradeLedger":
+        out = TradeLedger(self.ticker, capacity=self._size)
+        out._data[:self._size] = self.records
+        out._size = self._size
+        return out
+
+    @classmethod
+    def from_arrays(cls, ticker: str = "", **columns: np.ndarray) -> "TradeLedger":
+        """Builds a ledger from per-column arrays of equal length (missing columns are zero)."""
+        n = len(next(iter(columns.values()))) if columns else 0
+        out = cls(ticker, capacity=n)
+        for name, values in columns.items():
+            out._data[name][:n] = values
+        out._size = n
+        return out
+
+    @classmethod
+    def concat(cls, ledgers: Iterable["TradeLedger"]) -> "TradeLedger":
+        ledgers = list(ledgers)
+        records = np.concatenate([ledger.records for ledger in ledgers]) if ledgers else np.zeros(0, TRADE_DTYPE)
+        out = cls(next((ledger.ticker for ledger in ledgers if ledger.ticker), ""), capacity=len(records))
+        out._data[:len(records)] = records
+        out._size = len(records)
+        return out
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Rows as TradeRecord-shaped dicts. Non-finite values are reported as 0.0.
+        Built column-wise, so there is a single pass over the trades.
+        """
+        rows = self.records
+        columns = {
+            "entry_date": rows["entry_date"].astype("M8[D]").tolist(),
+            "exit_date": rows["exit_date"].astype("M8[D]").tolist(),
+        }
+        for name in TRADE_DTYPE.names[2:]:
+            columns[name] = np.nan_to_num(rows[name], nan=0.0, posinf=0.0, neginf=0.0).tolist()
+
+        names = list(columns)
+        return [
+            {"ticker": self.ticker, **dict(zip(names, values))}
+            for values in zip(*columns.values())
+        ]
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Dict, List, Optional, Tuple
+from backend.app.data.market_data import market_data_service
+from backend.app.engine import vectorized as vec
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Current-signal ordering used when ranking (actionable signals first)
+SIGNAL_PRIORITY = {"BUY": 0, "SELL": 1, "HOLD": 2, "NONE": 3}
+
+class UniverseScanner:
+    """
+    Cross-sectional scanner: evaluates built-in strategies over a whole universe at once.
+
+    The universe is processed in chunks of SCAN_CHUNK_SIZE tickers. Tickers of a chunk that
+    share a trading calendar are stacked into (tickers x bars) arrays and run through the
+    vectorized kernels, so indicators, signals, the fill model and metrics are computed
+    for all of them in a single pass, each on its own bars.
+    At most SCAN_MAX_WORKERS chunks are in flight, which bounds peak memory; only the
+    per-ticker summary rows are kept once a chunk is done.
+    """
+
+    def __init__(
+        self,
+        transaction_cost: float = 0.001,
+        slippage: float = 0.0005,
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.transaction_cost = transaction_cost
+        self.slippage = slippage
+        self.chunk_size = max(1, chunk_size or settings.SCAN_CHUNK_SIZE)
+        self.max_workers = max(1, max_workers or settings.SCAN_MAX_WORKERS)
+
+    def scan(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        strategies: List[str],
+        parameters: Dict[str, Dict[str, Any]],
+        initial_capital: float,
+        allow_mock: Optional[bool] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, float]]:
+        """
+        Returns (rows, errors, stats): one row per (ticker, strategy), per-ticker load
+        errors, and run statistics. Rows carry their data source, and a warning when
+        `allow_mock` let a ticker fall back to synthetic data.
+        """
+        unknown = [s for s in strategies if s not in vec.VECTOR_STRATEGIES]
+        if unknown:
+            raise ValueError(
+                f"Strategies {unknown} cannot be scanned. Available: {list(vec.VECTOR_STRATEGIES)}"
+            )
+
+        started = time.perf_counter()
+        chunks = [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+        rows: List[Dict[str, Any]] = []
+        errors: Dict[str, str] = {}
+
+        def collect(futures):
+            for future in futures:
+                chunk_rows, chunk_errors = future.result()
+                rows.extend(chunk_rows)
+                errors.update(chunk_errors)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            in_flight = set()
+            for chunk in chunks:
+                in_flight.add(pool.submit(
+                    self._scan_chunk, chunk, start_date, end_date, strategies, parameters, initial_capital, allow_mock
+                ))
+                if len(in_flight) >= self.max_workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(wait(in_flight).done)
+
+        stats = {
+            "tickers": len(tickers),
+            "scanned": len(tickers) - len(errors),
+            "failed": len(errors),
+            "chunks": len(chunks),
+            "elapsed_seconds": time.perf_counter() - started,
+        }
+        return rows, errors, stats
+
+    def _load_chunk(self, tickers: List[str], start_date: str, end_date: str, allow_mock: Optional[bool] = None):
+        """
+        Fetches a chunk and groups it by trading calendar: tickers with the same dates are
+        stacked as (tickers x bars) arrays on those dates. Nothing is aligned onto a union
+        calendar, so no ticker gets bars it didn't trade (forward-filled flat bars would
+        skew volatility and Sharpe, and carry a stale last close and signal).
+        Also returns each loaded ticker's data source and fallback reason (None if real data).
+        """
+        frames, sources, errors = {}, {}, {}
+        for ticker, result in market_data_service.fetch_many(tickers, start_date, end_date, allow_mock).items():
+            if isinstance(result, Exception):
+                errors[ticker] = str(result)
+            else:
+                result.columns = [c.capitalize() for c in result.columns]
+                frames[ticker] = result
+                sources[ticker] = (result.attrs.get("data_source"), result.attrs.get("fallback_reason"))
+
+        calendars: Dict[bytes, List[str]] = {}
+        for ticker, frame in frames.items():
+            calendars.setdefault(frame.index.values.astype("datetime64[ns]").tobytes(), []).append(ticker)
+
+        groups = []
+        for members in calendars.values():
+            ohlc = {
+                field.lower(): np.ascontiguousarray(np.vstack([frames[t][field].to_numpy(dtype=np.float64) for t in members]))
+                for field in ("Open", "High", "Low", "Close")
+            }
+            groups.append((members, frames[members[0]].index.values, ohlc))
+        return groups, sources, errors
+
+    def _scan_chunk(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        strategies: List[str],
+        parameters: Dict[str, Dict[str, Any]],
+        initial_capital: float,
+        allow_mock: Optional[bool] = None,
+    ):
+        groups, sources, errors = self._load_chunk(tickers, start_date, end_date, allow_mock)
+        rows = []
+        for loaded, dates, ohlc in groups:
+            rows.extend(self._scan_group(loaded, dates, ohlc, sources, strategies, parameters, initial_capital))
+        return rows, errors
+
+    def _scan_group(
+        self,
+        loaded: List[str],
+        dates: np.ndarray,
+        ohlc: Dict[str, np.ndarray],
+        sources: Dict[str, Tuple[Optional[str], Optional[str]]],
+        strategies: List[str],
+        parameters: Dict[str, Dict[str, Any]],
+        initial_capital: float,
+    ) -> List[Dict[str, Any]]:
+        """Summary rows for tickers sharing one calendar, as of its last bar."""
+        rows = []
+        n = len(loaded)
+        last_close = ohlc["close"][:, -1]
+        last_date = pd.Timestamp(dates[-1]).date()
+        for strategy in strategies:
+            entry, exit = vec.VECTOR_STRATEGIES[strategy](ohlc, **parameters.get(strategy, {}))
+            target = vec.positions_from_signals(entry, exit)
+            sim = vec.simulate_long_only(
+                ohlc["open"], ohlc["high"], ohlc["low"], ohlc["close"], target,
+                initial_capital=initial_capital,
+                transaction_cost=self.transaction_cost,
+                slippage=self.slippage,
+            )
+            metrics = vec.metrics_matrix(sim["equity"], dates, initial_capital, vec.round_trips(sim, n))
+
+            held = target[:, -2] > 0 if target.shape[1] > 1 else np.zeros(n, dtype=bool)
+            signal = np.where(
+                ~held & entry[:, -1], "BUY",
+                np.where(held & exit[:, -1], "SELL", np.where(held, "HOLD", "NONE"))
+            )
+
+            for i, ticker in enumerate(loaded):
+                rows.append({
+                    "ticker": ticker,
+                    "strategy": strategy,
+                    "signal": str(signal[i]),
+                    "in_position": bool(held[i]),
+                    "last_date": last_date,
+                    "last_close": float(last_close[i]),
+                    "metrics": {k: float(v[i]) for k, v in metrics.items()},
+                    "data_source": sources[ticker][0],
+                    "warnings": [f"Using mock data for {ticker}: {sources[ticker][1]}"] if sources[ticker][1] else [],
+                })
+        return rows
+
+def rank_results(
+    rows: List[Dict[str, Any]],
+    rank_by: str,
+    signals: Optional[List[str]] = None,
+    top: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Orders rows by current signal (actionable first), then by `rank_by` descending."""
+    if signals:
+        wanted = {s.upper() for s in signals}
+        rows = [r for r in rows if r["signal"] in wanted]
+
+    def key(row):
+        value = row["metrics"].get(rank_by, 0.0)
+        if not np.isfinite(value):
+            value = np.sign(value) * np.finfo(np.float64).max if value == value else 0.0
+        return (SIGNAL_PRIORITY.get(row["signal"], len(SIGNAL_PRIORITY)), -value)
+
+    rows = sorted(rows, key=key)
+    return rows[:top] if top else rows
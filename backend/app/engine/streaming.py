@@ -0,0 +1,140 @@
+import backtrader as bt
+import math
+import time
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class LatencyHistogram:
+    """
+    Fixed-size log-scale histogram of latencies (microseconds): constant memory however
+    long the run. Buckets are BUCKETS_PER_DECADE per power of ten from 0.1µs to 100s, so
+    percentiles are within ~12% (one bucket); count, mean and max are exact.
+    """
+
+    BUCKETS_PER_DECADE = 20
+    MIN_US = 0.1
+    DECADES = 9
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (self.BUCKETS_PER_DECADE * self.DECADES + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def add(self, latency_us: float):
+        self.count += 1
+        self.total_us += latency_us
+        if latency_us > self.max_us:
+            self.max_us = latency_us
+        bucket = 0
+        if latency_us > self.MIN_US:
+            bucket = min(len(self.counts) - 1, int(math.log10(latency_us / self.MIN_US) * self.BUCKETS_PER_DECADE) + 1)
+        self.counts[bucket] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th percentile (capped at the max)."""
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.max_us, self.MIN_US * 10 ** (bucket / self.BUCKETS_PER_DECADE))
+        return self.max_us
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {}
+        return {
+            "count": self.count,
+            "mean_us": self.total_us / self.count,
+            "p50_us": self.percentile(50),
+            "p99_us": self.percentile(99),
+            "max_us": self.max_us,
+        }
+
+class StreamingAnalyzer(bt.Analyzer):
+    """
+    Emits compact per-bar equity, order and trade events while the backtest runs.
+
+    `emit` is called from the engine thread and may block (backpressure); it returns
+    False once the consumer is gone, which stops the run at the next bar.
+    Per-bar latency covers everything the engine does for a bar (feed load, broker
+    matching, indicators, strategy logic, analyzers) and excludes time spent blocked
+    in `emit`. Latencies are kept in a LatencyHistogram, so memory stays constant.
+    """
+
+    params = (
+        ('emit', None),  # Callable[[dict], bool]
+    )
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self._bar_start = None
+        self._blocked = 0.0  # Seconds spent in `emit` since the bar clock started
+        self._stopped = False
+
+    def start(self):
+        self._bar_start = time.perf_counter()
+
+    def _send(self, message: Dict[str, Any]):
+        if self._stopped:
+            return
+        started = time.perf_counter()
+        delivered = self.params.emit(message)
+        self._blocked += time.perf_counter() - started
+        if not delivered:
+            self._stopped = True
+            self.strategy.env.runstop()
+
+    def notify_order(self, order):
+        if order.status == order.Completed:
+            self._send({
+                "t": "order",
+                "i": len(self.strategy) - 1,
+                "s": "B" if order.isbuy() else "S",
+                "px": order.executed.price,
+                "sz": order.executed.size,
+                "cm": order.executed.comm,
+            })
+        elif order.status in [order.Canceled, order.Margin, order.Rejected]:
+            self._send({
+                "t": "order",
+                "i": len(self.strategy) - 1,
+                "s": "B" if order.isbuy() else "S",
+                "x": order.getstatusname(),
+            })
+
+    def notify_trade(self, trade):
+        if trade.isclosed:
+            self._send({
+                "t": "trade",
+                "i": len(self.strategy) - 1,
+                "pnl": trade.pnl,
+                "net": trade.pnlcomm,
+            })
+
+    def next(self):
+        # Order and trade notifications of this bar were emitted inside the window
+        latency_us = (time.perf_counter() - self._bar_start - self._blocked) * 1e6
+        self.latency.add(latency_us)
+
+        self._send({
+            "t": "bar",
+            "i": len(self.strategy) - 1,
+            "d": self.strategy.datetime.date().isoformat(),
+            "px": self.data.close[0],
+            "e": self.strategy.broker.getvalue(),
+            "c": self.strategy.broker.getcash(),
+            "us": round(latency_us, 1),
+        })
+        # Restart the clock after emitting so backpressure waits are not counted
+        self._bar_start = time.perf_counter()
+        self._blocked = 0.0
+
+    def get_analysis(self):
+        return {
+            "latency": self.latency.summary(),
+            "stopped": self._stopped,
+        }
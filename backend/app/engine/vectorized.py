@@ -0,0 +1,402 @@
+"""
+Vectorized counterparts of the engine's indicators, signals and execution model.
+
+All functions operate on 2D float arrays shaped (tickers, bars) (1D arrays are treated
+as a single row). Leading NaNs mark bars before a series starts; indicators are NaN
+until their window is full, and comparisons against NaN are False, which mirrors
+Backtrader's minimum-period warm-up.
+"""
+import numpy as np
+from typing import Callable, Dict, Tuple
+
+# Annualization factor for daily data (kept in sync with analytics.metrics)
+TRADING_DAYS = 252
+
+def _as_2d(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return x[np.newaxis, :] if x.ndim == 1 else x
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Lags each row by `periods` bars, padding with NaN."""
+    x = _as_2d(x)
+    out = np.full_like(x, np.nan)
+    if periods < x.shape[1]:
+        out[:, periods:] = x[:, :x.shape[1] - periods]
+    return out
+
+def ffill(x: np.ndarray) -> np.ndarray:
+    """Forward-fills NaNs along each row (leading NaNs stay NaN)."""
+    x = _as_2d(x)
+    idx = np.where(np.isnan(x), 0, np.arange(x.shape[1]))
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    out = x[np.arange(x.shape[0])[:, None], idx]
+    return out
+
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average via cumulative sums: O(bars) regardless of period."""
+    x = _as_2d(x)
+    period = int(period)
+    out = np.full_like(x, np.nan)
+    if period <= 0 or period > x.shape[1]:
+        return out
+    valid = ~np.isnan(x)
+    csum = np.cumsum(np.where(valid, x, 0.0), axis=1)
+    ccount = np.cumsum(valid, axis=1)
+    window_sum = csum[:, period - 1:].copy()
+    window_sum[:, 1:] -= csum[:, :-period]
+    window_count = ccount[:, period - 1:].copy()
+    window_count[:, 1:] -= ccount[:, :-period]
+    out[:, period - 1:] = np.where(window_count == period, window_sum / period, np.nan)
+    return out
+
+def ema(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Exponential moving average seeded with the SMA of the first `period` values
+    (Backtrader convention). The recursion runs over bars but is vectorized across rows.
+    """
+    x = _as_2d(x)
+    period = int(period)
+    out = np.full_like(x, np.nan)
+    if period <= 0 or period > x.shape[1]:
+        return out
+    alpha = 2.0 / (1.0 + period)
+    seed = sma(x, period)
+    prev = np.full(x.shape[0], np.nan)
+    for t in range(x.shape[1]):
+        prev = np.where(np.isnan(prev), seed[:, t], prev * (1.0 - alpha) + x[:, t] * alpha)
+        out[:, t] = prev
+    return out
+
+def momentum(x: np.ndarray, period: int) -> np.ndarray:
+    """Price(t) - Price(t - period)."""
+    x = _as_2d(x)
+    return x - shift(x, int(period))
+
+def rsi_sma(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI with simple-average smoothing of up/down moves (Backtrader's RSI_SMA)."""
+    close = _as_2d(close)
+    diff = close - shift(close, 1)
+    up = sma(np.where(np.isnan(diff), np.nan, np.maximum(diff, 0.0)), period)
+    down = sma(np.where(np.isnan(diff), np.nan, np.maximum(-diff, 0.0)), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = up / down
+        rsi = 100.0 - 100.0 / (1.0 + rs)
+    # No down moves in the window: fully overbought
+    rsi = np.where((down == 0) & ~np.isnan(up), 100.0, rsi)
+    return rsi
+
+def crossover(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    +1 where `a` crosses above `b`, -1 where it crosses below, 0 otherwise.
+    Like Backtrader's CrossOver, equality does not reset the previous side.
+    """
+    diff = _as_2d(a) - _as_2d(b)
+    nonzero = ffill(np.where(diff == 0, np.nan, diff))
+    prev = shift(nonzero, 1)
+    up = (prev < 0) & (diff > 0)
+    down = (prev > 0) & (diff < 0)
+    return up.astype(np.float64) - down.astype(np.float64)
+
+def positions_from_signals(entry: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """
+    Long-only state machine: go long on `entry` while flat, go flat on `exit` while long.
+    Exit wins when both fire on the same bar. Returns 0/1 target positions per bar.
+    """
+    entry = np.asarray(entry, dtype=bool)
+    exit = np.asarray(exit, dtype=bool)
+    state = np.where(exit, 0.0, np.where(entry, 1.0, np.nan))
+    state = ffill(state)
+    return np.nan_to_num(state, nan=0.0)
+
+def positions_within_cash(
+    entry: np.ndarray,
+    exit: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    size: float = 1.0,
+    initial_capital: float = 100000.0,
+    transaction_cost: float = 0.001,
+    slippage: float = 0.0005,
+) -> np.ndarray:
+    """
+    positions_from_signals for one series, with the broker's cash check on entries: a
+    buy of `size` shares is rejected, and the series stays flat until the next entry
+    signal, unless the cash on hand covers it (plus commission) both at the signal
+    bar's close (submission check) and at the slipped fill price on the next open.
+    Loops over trades, not bars.
+    """
+    entry, exit = (np.asarray(x, dtype=bool).ravel() for x in (entry, exit))
+    open_, high, low, close = (np.asarray(x, dtype=np.float64).ravel() for x in (open_, high, low, close))
+    bars = len(close)
+    buy_price = np.clip(open_ * (1.0 + slippage), low, high)
+    sell_price = np.clip(open_ * (1.0 - slippage), low, high)
+    entries = np.flatnonzero(entry & ~exit)  # Exit wins when both fire
+    exits = np.flatnonzero(exit)
+
+    target = np.zeros(bars)
+    cash = initial_capital
+    i = 0
+    while i < len(entries):
+        t = entries[i]
+        if t + 1 < bars:
+            cost = size * max(close[t], buy_price[t + 1]) * (1.0 + transaction_cost)
+            if cost > cash:
+                i += 1
+                continue
+        e = np.searchsorted(exits, t, side="right")
+        if e == len(exits):
+            target[t:] = 1.0
+            break
+        e = exits[e]
+        target[t:e] = 1.0
+        if e + 1 < bars:
+            buy = size * buy_price[t + 1]
+            sell = size * sell_price[e + 1]
+            cash += sell - buy - (sell + buy) * transaction_cost
+        i = np.searchsorted(entries, e, side="right")
+    return target
+
+def simulate_long_only(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    target: np.ndarray,
+    size: float = 1.0,
+    initial_capital: float = 100000.0,
+    transaction_cost: float = 0.001,
+    slippage: float = 0.0005,
+) -> Dict[str, np.ndarray]:
+    """
+    Executes target positions with the engine's fill model, for every row at once:
+    a signal on bar t fills at the open of bar t+1, slipped by `slippage` against the
+    trader and capped to that bar's high/low, paying `transaction_cost` on traded value.
+
+    Returns equity/cash matrices and per-fill arrays (row, bar, signed size, price, commission, slippage).
+    """
+    open_, high, low, close = (_as_2d(a) for a in (open_, high, low, close))
+    target = _as_2d(target)
+    rows, bars = close.shape
+
+    # Orders placed at the close of t execute on t+1
+    held = np.zeros_like(target)
+    held[:, 1:] = target[:, :-1]
+    delta = np.diff(held, axis=1, prepend=0.0) * size
+
+    side = np.sign(delta)
+    price = np.clip(open_ * (1.0 + side * slippage), low, high)
+    price = np.where(delta != 0, price, 0.0)
+    traded_value = np.abs(delta) * price
+    commission = traded_value * transaction_cost
+
+    cash_flow = -delta * price - commission
+    cash = initial_capital + np.cumsum(np.nan_to_num(cash_flow), axis=1)
+    units = held * size
+    equity = cash + units * np.nan_to_num(ffill(close))
+
+    fill_rows, fill_bars = np.nonzero(delta)
+    fill_size = delta[fill_rows, fill_bars]
+    fill_price = price[fill_rows, fill_bars]
+    return {
+        "equity": equity,
+        "cash": cash,
+        "fill_rows": fill_rows,
+        "fill_bars": fill_bars,
+        "fill_size": fill_size,
+        "fill_price": fill_price,
+        "fill_commission": commission[fill_rows, fill_bars],
+        # Cost vs the execution bar's open (positive = paid)
+        "fill_slippage": (fill_price - open_[fill_rows, fill_bars]) * fill_size,
+    }
+
+def round_trips(sim: Dict[str, np.ndarray], rows: int) -> Dict[str, np.ndarray]:
+    """
+    Pairs entry and exit fills into closed trades (open trades at the end are ignored).
+    Returns per-trade arrays: row, entry/exit bar, entry/exit price, size, pnl, pnl_net,
+    commission and slippage.
+    """
+    r, b = sim["fill_rows"], sim["fill_bars"]
+    size, price, comm = sim["fill_size"], sim["fill_price"], sim["fill_commission"]
+    buys = size > 0
+    sells = ~buys
+
+    # Long-only: fills alternate buy/sell within a row, starting with a buy
+    n_exits = np.bincount(r[sells], minlength=rows)
+    buy_rank = _rank_within_row(r[buys])
+    keep = buy_rank < n_exits[r[buys]]
+
+    entry_idx = np.nonzero(buys)[0][keep]
+    exit_idx = np.nonzero(sells)[0]
+    qty = size[entry_idx]
+    pnl = (price[exit_idx] - price[entry_idx]) * qty
+    return {
+        "row": r[exit_idx],
+        "entry_bar": b[entry_idx],
+        "exit_bar": b[exit_idx],
+        "entry_price": price[entry_idx],
+        "exit_price": price[exit_idx],
+        "size": qty,
+        "pnl": pnl,
+        "pnl_net": pnl - comm[entry_idx] - comm[exit_idx],
+        "commission": comm[entry_idx] + comm[exit_idx],
+        "slippage": sim["fill_slippage"][entry_idx] + sim["fill_slippage"][exit_idx],
+    }
+
+def reprice_fills(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    fill_bars: np.ndarray,
+    fill_sizes: np.ndarray,
+    transaction_costs: np.ndarray,
+    slippages: np.ndarray,
+    initial_capital: float = 100000.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Prices one fixed fill schedule (bar index and signed size per fill, in execution
+    order) on a single series, once per (transaction_cost, slippage) row, with the
+    engine's fill model: open slipped against the trader, capped to the bar's high/low.
+
+    Returns the equity matrix (rows, bars) and closed trades in the round_trips layout
+    (row, pnl, pnl_net, commission). Trades open and close where the running position
+    leaves and returns to zero; the open trade at the end is ignored.
+    """
+    open_, high, low, close = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+    fill_bars = np.asarray(fill_bars, dtype=np.int64)
+    fill_sizes = np.asarray(fill_sizes, dtype=np.float64)
+    costs = np.asarray(transaction_costs, dtype=np.float64)[:, np.newaxis]
+    slips = np.asarray(slippages, dtype=np.float64)[:, np.newaxis]
+    rows, bars = costs.shape[0], close.shape[0]
+
+    position = np.cumsum(fill_sizes)
+    before = position - fill_sizes
+    flat = np.abs(position) < 1e-9
+    if (before * position < 0).any():
+        raise ValueError("Fill schedules that reverse a position in one order cannot be re-priced")
+
+    # (rows, fills) prices and costs
+    side = np.sign(fill_sizes)
+    price = np.clip(open_[fill_bars] * (1.0 + side * slips), low[fill_bars], high[fill_bars])
+    commission = np.abs(fill_sizes) * price * costs
+    gross_flow = -fill_sizes * price
+
+    cash_flow = np.zeros((rows, bars))
+    np.add.at(cash_flow, (slice(None), fill_bars), gross_flow - commission)
+    units = np.zeros(bars)
+    np.add.at(units, fill_bars, fill_sizes)
+    equity = initial_capital + np.cumsum(cash_flow, axis=1) + np.cumsum(units) * close
+
+    # Closed trades: contiguous runs of fills from a flat position back to flat
+    closes = np.flatnonzero(flat)
+    starts = np.flatnonzero(np.abs(before) < 1e-9)[:len(closes)]
+    if len(closes):
+        end = closes[-1] + 1
+        pnl = np.add.reduceat(gross_flow[:, :end], starts, axis=1)
+        trade_commission = np.add.reduceat(commission[:, :end], starts, axis=1)
+    else:
+        pnl = trade_commission = np.zeros((rows, 0))
+    return {
+        "equity": equity,
+        "fill_price": price,
+        "fill_commission": commission,
+        "row": np.repeat(np.arange(rows), len(closes)),
+        "pnl": pnl.ravel(),
+        "pnl_net": (pnl - trade_commission).ravel(),
+        "commission": trade_commission.ravel(),
+    }
+
+def _rank_within_row(rows: np.ndarray) -> np.ndarray:
+    """0-based occurrence number of each element within its (sorted) row group."""
+    if rows.size == 0:
+        return rows
+    starts = np.r_[0, np.nonzero(np.diff(rows))[0] + 1]
+    counts = np.diff(np.r_[starts, rows.size])
+    return np.arange(rows.size) - np.repeat(starts, counts)
+
+def metrics_matrix(
+    equity: np.ndarray,
+    dates: np.ndarray,
+    initial_capital: float,
+    trades: Dict[str, np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """
+    Row-wise equivalent of analytics.metrics.calculate_metrics (same definitions and guards).
+    `dates` is a datetime64 array aligned with the equity columns.
+    """
+    equity = _as_2d(equity)
+    rows, bars = equity.shape
+    zeros = np.zeros(rows)
+    out = {k: zeros.copy() for k in (
+        "total_return", "cagr", "sharpe_ratio", "volatility", "max_drawdown",
+        "win_rate", "profit_factor", "avg_trade_net_pnl", "total_trades"
+    )}
+
+    trade_rows = trades["row"]
+    pnl_net = trades["pnl_net"]
+    counts = np.bincount(trade_rows, minlength=rows).astype(np.float64)
+    out["total_trades"] = counts
+
+    if bars >= 2:
+        final = equity[:, -1]
+        out["total_return"] = (final - initial_capital) / initial_capital
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = equity[:, 1:] / equity[:, :-1] - 1.0
+        if returns.shape[1] > 1:
+            vol = np.std(returns, axis=1, ddof=1) * np.sqrt(TRADING_DAYS)
+            out["volatility"] = vol
+            mean_ret = returns.mean(axis=1) * TRADING_DAYS
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out["sharpe_ratio"] = np.where(vol > 1e-9, mean_ret / vol, 0.0)
+
+        peak = np.maximum.accumulate(equity, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, (equity - peak) / peak, 0.0)
+        out["max_drawdown"] = drawdown.min(axis=1)
+
+        days = (dates[-1] - dates[0]).astype("timedelta64[D]").astype(np.int64)
+        if days > 0 and initial_capital > 0:
+            years = days / 365.25
+            with np.errstate(invalid="ignore"):
+                out["cagr"] = np.where(final > 0, (final / initial_capital) ** (1 / years) - 1, 0.0)
+
+    wins = np.bincount(trade_rows, weights=(pnl_net > 0), minlength=rows)
+    gross_profit = np.bincount(trade_rows, weights=np.where(pnl_net > 0, pnl_net, 0.0), minlength=rows)
+    gross_loss = np.abs(np.bincount(trade_rows, weights=np.where(pnl_net <= 0, pnl_net, 0.0), minlength=rows))
+    total_net = np.bincount(trade_rows, weights=pnl_net, minlength=rows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["win_rate"] = np.where(counts > 0, wins / counts, 0.0)
+        out["avg_trade_net_pnl"] = np.where(counts > 0, total_net / counts, 0.0)
+        out["profit_factor"] = np.where(
+            gross_loss > 1e-9,
+            gross_profit / gross_loss,
+            np.where(gross_profit > 0, np.inf, 0.0),
+        )
+    return out
+
+# --- Built-in strategy kernels -------------------------------------------------------
+# Each returns (entry, exit) boolean matrices and mirrors the Backtrader strategy of the
+# same name, including its parameter names and defaults.
+
+def ma_crossover_signals(ohlc: Dict[str, np.ndarray], short_window: int = 20, long_window: int = 50):
+    cross = crossover(sma(ohlc["close"], short_window), sma(ohlc["close"], long_window))
+    return cross > 0, cross < 0
+
+def rsi_mean_reversion_signals(
+    ohlc: Dict[str, np.ndarray], rsi_period: int = 14, lower_threshold: float = 30, upper_threshold: float = 70
+):
+    rsi = rsi_sma(ohlc["close"], rsi_period)
+    return rsi < lower_threshold, rsi > upper_threshold
+
+def momentum_signals(ohlc: Dict[str, np.ndarray], momentum_period: int = 10, threshold: float = 0.0):
+    mom = momentum(ohlc["close"], momentum_period)
+    return mom > threshold, mom < -threshold
+
+VECTOR_STRATEGIES: Dict[str, Callable[..., Tuple[np.ndarray, np.ndarray]]] = {
+    "ma_crossover": ma_crossover_signals,
+    "rsi_mean_reversion": rsi_mean_reversion_signals,
+    "momentum": momentum_signals,
+}
@@ -1,8 +1,16 @@
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from backend.app.core.config import settings
 from backend.app.api.backtest import router as backtest_router
+from backend.app.api.batch import router as batch_router
 from backend.app.api.health import router as health_router
+from backend.app.api.journals import router as journals_router
+from backend.app.api.profiles import router as profiles_router
+from backend.app.api.replay import router as replay_router
+from backend.app.api.scan import router as scan_router
+from backend.app.api.sensitivity import router as sensitivity_router
+from backend.app.utils.warmup import FirstResponseMiddleware, startup_timer, warm_up
 import logging
 
 # Setup Logging
@@ -25,10 +33,23 @@ if settings.cors_origins:
         allow_headers=["*"],
     )
 
+# Start-up timing (time to first response, reported by /health)
+app.add_middleware(FirstResponseMiddleware, timer=startup_timer)
+
 # Include Routers
 app.include_router(backtest_router, prefix=settings.API_PREFIX, tags=["Backtest"])
+app.include_router(batch_router, prefix=settings.API_PREFIX, tags=["Batch"])
 app.include_router(health_router, prefix=settings.API_PREFIX, tags=["Health"])
+app.include_router(profiles_router, prefix=settings.API_PREFIX, tags=["Profiling"])
+app.include_router(journals_router, prefix=settings.API_PREFIX, tags=["Journal"])
+app.include_router(replay_router, prefix=settings.API_PREFIX, tags=["Replay"])
+app.include_router(scan_router, prefix=settings.API_PREFIX, tags=["Scanner"])
+app.include_router(sensitivity_router, prefix=settings.API_PREFIX, tags=["Cost Sensitivity"])
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Application starting up...")
+    if settings.WARMUP_ENABLED:
+        # Blocks start-up (and so readiness) until warm, within WARMUP_BUDGET_SECONDS
+        await run_in_threadpool(warm_up, startup_timer)
+    startup_timer.mark_ready()
@@ -1,14 +1,23 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import date
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from backend.app.strategies import CUSTOM_STRATEGY
+import itertools
 
 class BacktestRequest(BaseModel):
     ticker: str = Field(..., min_length=1, description="Stock ticker symbol (e.g., AAPL)")
     start_date: date = Field(..., description="Start date of the backtest")
     end_date: date = Field(..., description="End date of the backtest")
     initial_capital: float = Field(100000.0, gt=0, description="Initial capital in USD")
-    strategy: str = Field(..., description="Strategy name (e.g., ma_crossover)")
+    strategy: str = Field(CUSTOM_STRATEGY, description="Strategy name (e.g., ma_crossover), or 'custom' with strategy_spec")
     parameters: Dict[str, Any] = Field(default_factory=dict, description="Strategy parameters")
+    strategy_spec: Optional[Dict[str, Any]] = Field(None, description="Declarative strategy (indicators + entry/exit rules), run vectorized")
+    allow_mock_data: Optional[bool] = Field(None, description="Fall back to synthetic data if the provider fails (default: server setting)")
+    low_memory: Optional[bool] = Field(None, description="Bounded buffers and downsampled curves for very long histories (default: server setting)")
+    max_points: Optional[int] = Field(None, ge=0, description="Downsample the equity and benchmark curves to at most this many points, keeping peaks and troughs (0 = every bar; default: server setting)")
+    profile: bool = Field(False, description="Profile this run (requires PROFILING_ENABLED); see GET /api/profiles/{id}")
+    journal: bool = Field(False, description="Record signals, orders and fills in an event journal; see GET /api/journals/{id}")
+    timeframes: List[str] = Field(default_factory=list, description="Extra aggregate feeds for multi-timeframe strategies (weekly, monthly, daily, <N>min, <N>h)")
     
     @field_validator('ticker')
     def uppercase_ticker(cls, v):
@@ -19,3 +28,151 @@ class BacktestRequest(BaseModel):
         if 'start_date' in values.data and v <= values.data['start_date']:
             raise ValueError('end_date must be after start_date')
         return v
+
+    @field_validator('strategy_spec')
+    def validate_strategy_spec(cls, v):
+        if v is not None:
+            # Imported here so loading the schemas doesn't pull in NumPy/pandas
+            from backend.app.engine.declarative import compile_strategy
+            compile_strategy(v)
+        return v
+
+    @field_validator('timeframes')
+    def validate_timeframes(cls, v):
+        # Imported here so loading the schemas doesn't pull in pandas
+        from backend.app.data.resample import parse_timeframe
+        for timeframe in v:
+            parse_timeframe(timeframe)
+        return list(dict.fromkeys(v))
+
+    @field_validator('max_points')
+    def validate_max_points(cls, v):
+        if v is not None and 0 < v < 20:
+            raise ValueError('max_points must be 0 (every bar) or at least 20')
+        return v
+
+    @model_validator(mode='after')
+    def validate_custom_strategy(self):
+        if self.strategy_spec is not None and self.strategy != CUSTOM_STRATEGY:
+            raise ValueError(f"strategy must be '{CUSTOM_STRATEGY}' when strategy_spec is given")
+        if self.strategy_spec is None and self.strategy == CUSTOM_STRATEGY:
+            raise ValueError('strategy_spec is required for custom strategies')
+        if self.strategy_spec is not None and self.journal:
+            raise ValueError('journal is not supported for declarative strategies (they place no orders)')
+        if self.strategy_spec is not None and self.timeframes:
+            raise ValueError('timeframes are not supported for declarative strategies')
+        return self
+
+    def run_options_set(self) -> List[str]:
+        """Names of the run options (low_memory, max_points, journal, profile) this request sets."""
+        return [
+            name for name, value in (
+                ('low_memory', self.low_memory is not None),
+                ('max_points', self.max_points is not None),
+                ('journal', self.journal),
+                ('profile', self.profile),
+            ) if value
+        ]
+
+class BatchBacktestRequest(BaseModel):
+    requests: List[BacktestRequest] = Field(..., min_length=1, description="Backtests to execute")
+    include_curves: bool = Field(False, description="Return full equity curves and trades instead of metrics only")
+
+class SweepRequest(BaseModel):
+    ticker: str = Field(..., min_length=1, description="Stock ticker symbol (e.g., AAPL)")
+    start_date: date = Field(..., description="Start date of the backtest")
+    end_date: date = Field(..., description="End date of the backtest")
+    initial_capital: float = Field(100000.0, gt=0, description="Initial capital in USD")
+    strategy: str = Field(..., description="Strategy name (e.g., ma_crossover)")
+    parameters: Dict[str, Any] = Field(default_factory=dict, description="Fixed strategy parameters")
+    parameter_grid: Dict[str, List[Any]] = Field(..., description="Parameter values to sweep (cartesian product)")
+    include_curves: bool = Field(False, description="Return full equity curves and trades instead of metrics only")
+    allow_mock_data: Optional[bool] = Field(None, description="Fall back to synthetic data if the provider fails (default: server setting)")
+
+    @field_validator('parameter_grid')
+    def validate_grid(cls, v):
+        if not v or any(len(values) == 0 for values in v.values()):
+            raise ValueError('parameter_grid must contain at least one value per parameter')
+        return v
+
+    def expand(self) -> List[BacktestRequest]:
+        """Expands the grid into one BacktestRequest per parameter combination."""
+        keys = list(self.parameter_grid.keys())
+        return [
+            BacktestRequest(
+                ticker=self.ticker,
+                start_date=self.start_date,
+                end_date=self.end_date,
+                initial_capital=self.initial_capital,
+                strategy=self.strategy,
+                parameters={**self.parameters, **dict(zip(keys, combo))},
+                allow_mock_data=self.allow_mock_data,
+            )
+            for combo in itertools.product(*(self.parameter_grid[k] for k in keys))
+        ]
+
+class ShardRequest(BaseModel):
+    """Internal: a slice of a batch dispatched by a coordinator to a worker node."""
+    shard_id: int
+    indices: List[int]
+    requests: List[BacktestRequest]
+    include_curves: bool = False
+
+class ReplayRequest(BacktestRequest):
+    speed: float = Field(0.0, ge=0, description="Bars per second to replay (0 = as fast as possible)")
+
+    @model_validator(mode='after')
+    def validate_replay_options(self):
+        # BacktestRequest options the replay doesn't honor: reject rather than ignore them
+        unsupported = self.run_options_set()
+        if unsupported:
+            raise ValueError(f"replay does not support {', '.join(unsupported)} (it streams every bar)")
+        return self
+
+class CostSensitivityRequest(BacktestRequest):
+    transaction_costs: List[float] = Field(
+        default_factory=lambda: [0.0005, 0.001, 0.002], min_length=1, max_length=100,
+        description="Commission rates to evaluate (fraction of traded value, 0.001 = 10 bps)"
+    )
+    slippages: List[float] = Field(
+        default_factory=lambda: [0.0005, 0.001, 0.002], min_length=1, max_length=100,
+        description="Slippage rates to evaluate (fraction of the fill price)"
+    )
+
+    @field_validator('transaction_costs', 'slippages')
+    def validate_rates(cls, v):
+        if any(not 0 <= rate < 1 for rate in v):
+            raise ValueError('rates must be between 0 (inclusive) and 1 (exclusive)')
+        return v
+
+    @model_validator(mode='after')
+    def validate_simulated_strategy(self):
+        if self.strategy_spec is not None:
+            raise ValueError('cost sensitivity needs a registered strategy (declarative specs are priced by the vectorized runner)')
+        # BacktestRequest options this analysis doesn't honor: reject rather than ignore them
+        unsupported = self.run_options_set()
+        if unsupported:
+            raise ValueError(f"cost sensitivity does not support {', '.join(unsupported)} (it returns metrics only)")
+        return self
+
+class ScanRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, description="Universe of ticker symbols to scan")
+    start_date: date = Field(..., description="Start of the history used for signals and metrics")
+    end_date: date = Field(..., description="End of the history (the 'current' bar)")
+    initial_capital: float = Field(100000.0, gt=0, description="Initial capital in USD")
+    strategies: List[str] = Field(default_factory=lambda: ["ma_crossover", "rsi_mean_reversion"], min_length=1)
+    parameters: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Per-strategy parameter overrides")
+    signals: Optional[List[str]] = Field(None, description="Only return these current signals (BUY, SELL, HOLD, NONE)")
+    rank_by: str = Field("sharpe_ratio", description="MetricCard field used to rank results")
+    top: Optional[int] = Field(None, gt=0, description="Maximum number of results to return")
+    allow_mock_data: Optional[bool] = Field(None, description="Fall back to synthetic data if the provider fails (default: server setting)")
+
+    @field_validator('tickers')
+    def uppercase_tickers(cls, v):
+        return list(dict.fromkeys(t.upper() for t in v))
+
+    @field_validator('end_date')
+    def validate_dates(cls, v, values):
+        if 'start_date' in values.data and v <= values.data['start_date']:
+            raise ValueError('end_date must be after start_date')
+        return v
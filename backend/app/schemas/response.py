@@ -28,13 +28,98 @@ class TradeRecord(BaseModel):
     pnl_net: float
     size: float
     duration: float
+    commission: Optional[float] = None
+    slippage: Optional[float] = None
 
 class BenchmarkResult(BaseModel):
     equity_curve: List[EquityPoint]
     metrics: Dict[str, float]
 
+class ProfileSummary(BaseModel):
+    id: str
+    mode: str
+    wall_seconds: float
+    samples: int
+    breakdown: Dict[str, float]  # Approximate seconds per area (data, engine, strategies, analytics, serialization, other)
+    url: str
+
+class JournalSummary(BaseModel):
+    id: str
+    events: int
+    dropped: int  # Oldest events overwritten once JOURNAL_CAPACITY was reached
+    analytics: Dict[str, Any]  # Order-level statistics (fill rate, slippage vs signal price, ...)
+    url: str
+
 class BacktestResponse(BaseModel):
     metrics: MetricCard
     equity_curve: List[EquityPoint]
     trades: List[TradeRecord]
     benchmark: Optional[BenchmarkResult] = None
+    data_source: Optional[str] = None  # Provider name, or "mock" for synthetic data
+    warnings: List[str] = []
+    profile: Optional[ProfileSummary] = None
+    journal: Optional[JournalSummary] = None
+
+class BatchItemResult(BaseModel):
+    index: int
+    ticker: str
+    strategy: str
+    parameters: Dict[str, Any]
+    status: str  # "ok" | "error"
+    metrics: Optional[MetricCard] = None
+    result: Optional[BacktestResponse] = None
+    journal: Optional[JournalSummary] = None  # Stored on the node that ran the item
+    data_source: Optional[str] = None  # Provider name, or "mock" for synthetic data
+    warnings: List[str] = []
+    error: Optional[str] = None
+    worker: Optional[str] = None
+
+class BatchStats(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    shards: int = 0
+    dispatches: int = 0
+    retries: int = 0
+    stolen: int = 0
+    workers: Dict[str, int] = {}
+    elapsed_seconds: float = 0.0
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+    stats: BatchStats
+
+class ShardResponse(BaseModel):
+    shard_id: int
+    results: List[BatchItemResult]
+
+class CostSensitivityPoint(BaseModel):
+    transaction_cost: float
+    slippage: float
+    metrics: MetricCard
+
+class CostSensitivityResponse(BaseModel):
+    base: CostSensitivityPoint  # The simulated run, at the server's TRANSACTION_COST / SLIPPAGE
+    points: List[CostSensitivityPoint]  # Every transaction_cost x slippage, costs outer
+    fills: int
+    trades: int
+    simulate_seconds: float
+    reprice_seconds: float
+    data_source: Optional[str] = None
+    warnings: List[str] = []
+
+class ScanResult(BaseModel):
+    ticker: str
+    strategy: str
+    signal: str  # BUY | SELL | HOLD | NONE for the latest bar
+    in_position: bool
+    last_date: date
+    last_close: float
+    metrics: MetricCard
+    data_source: Optional[str] = None  # Provider name, or "mock" for synthetic data
+    warnings: List[str] = []
+
+class ScanResponse(BaseModel):
+    results: List[ScanResult]
+    errors: Dict[str, str]
+    stats: Dict[str, float]
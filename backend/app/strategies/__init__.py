@@ -0,0 +1,136 @@
+"""
+Lazy strategy registry.
+
+Strategies are discovered without importing them (and so without importing Backtrader):
+  - every module in this package (other than `base`) is a strategy named after the module,
+    resolved to the single StrategyBase subclass it defines;
+  - installed distributions can add strategies through the `atss.strategies` entry point
+    group, e.g. in pyproject.toml:
+
+        [project.entry-points."atss.strategies"]
+        breakout = "my_package.breakout:Breakout"
+
+A strategy's module is imported the first time it is looked up.
+"""
+
+import importlib
+import inspect
+import logging
+import pkgutil
+import threading
+from collections.abc import Mapping
+from importlib.metadata import entry_points
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Strategy name used by requests that carry a declarative spec
+CUSTOM_STRATEGY = "custom"
+
+ENTRY_POINT_GROUP = "atss.strategies"
+
+# Package modules that hold shared code rather than a strategy
+_NON_STRATEGY_MODULES = {"base"}
+
+_MISSING = object()
+
+class StrategyRegistry(Mapping):
+    """
+    Maps strategy names to classes, importing each strategy on first use.
+    Names are known up front; a strategy whose import fails maps to None (and is left
+    out of `available()`), like an optional dependency that isn't installed.
+    """
+
+    def __init__(self, package: str = __name__, group: str = ENTRY_POINT_GROUP):
+        self.package = package
+        self.group = group
+        self._targets: Optional[Dict[str, object]] = None
+        self._loaded: Dict[str, Optional[type]] = {}
+        self._lock = threading.RLock()
+
+    def _discover(self) -> Dict[str, object]:
+        targets: Dict[str, object] = {}
+        package = importlib.import_module(self.package)
+        for info in pkgutil.iter_modules(package.__path__):
+            if info.ispkg or info.name.startswith("_") or info.name in _NON_STRATEGY_MODULES:
+                continue
+            targets[info.name] = f"{self.package}.{info.name}"
+
+        for entry_point in entry_points(group=self.group):
+            if entry_point.name in targets or entry_point.name == CUSTOM_STRATEGY:
+                logger.warning(f"Ignoring plugin strategy '{entry_point.name}' ({entry_point.value}): name already taken")
+                continue
+            targets[entry_point.name] = entry_point.value
+        return targets
+
+    @property
+    def targets(self) -> Dict[str, object]:
+        """Name -> 'module', 'module:Class' or a registered class. Discovered once."""
+        if self._targets is None:
+            with self._lock:
+                if self._targets is None:
+                    self._targets = self._discover()
+        return self._targets
+
+    def register(self, name: str, target):
+        """Adds a strategy by class or 'module:Class' path (replaces an existing name)."""
+        if name == CUSTOM_STRATEGY:
+            raise ValueError(f"'{CUSTOM_STRATEGY}' is reserved for declarative strategies")
+        with self._lock:
+            self.targets[name] = target
+            self._loaded.pop(name, None)
+
+    def _load(self, name: str, target) -> Optional[type]:
+        if inspect.isclass(target):
+            return target
+        try:
+            module_name, _, attr = str(target).partition(":")
+            module = importlib.import_module(module_name)
+            if attr:
+                obj = module
+                for part in attr.split("."):
+                    obj = getattr(obj, part)
+                return obj
+            return self._strategy_class(module)
+        except (ImportError, AttributeError) as e:
+            logger.warning(f"Strategy '{name}' is unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _strategy_class(module) -> Optional[type]:
+        from backend.app.strategies.base import StrategyBase
+
+        classes = [
+            obj for obj in vars(module).values()
+            if inspect.isclass(obj) and issubclass(obj, StrategyBase) and obj.__module__ == module.__name__
+        ]
+        if len(classes) != 1:
+            logger.warning(
+                f"Module {module.__name__} defines {len(classes)} strategies; "
+                f"register it as 'module:Class' instead"
+            )
+            return None
+        return classes[0]
+
+    def __getitem__(self, name: str) -> Optional[type]:
+        strategy_cls = self._loaded.get(name, _MISSING)
+        if strategy_cls is not _MISSING:
+            return strategy_cls
+        target = self.targets[name]  # KeyError for unknown names
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = self._load(name, target)
+            return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.targets)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def available(self) -> List[str]:
+        """Names of the strategies that import successfully (imports all of them)."""
+        return [name for name in self if self[name] is not None]
+
+# Process-wide registry used by the API and the engine tooling
+strategy_registry = StrategyRegistry()
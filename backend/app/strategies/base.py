@@ -1,5 +1,7 @@
 import backtrader as bt
 from abc import abstractmethod
+from backend.app.engine.checkpoint import restore_checkpoint
+from backend.app.engine.journal import CANCEL_REASONS, SIGNAL, SUBMIT, FILL, CANCEL
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,9 +13,23 @@ class StrategyBase(bt.Strategy):
     Wraps Backtrader's functionality to meet project requirements.
     """
     
+    # Low-memory mode may run with bounded line buffers (Cerebro exactbars=1), which only
+    # keep the history indicators need. Opt in with True in strategies that read history
+    # only through indicators; those indexing raw history (e.g. self.data.close[-n]) must
+    # keep the default.
+    bounded_buffers = False
+
+    # Higher timeframes the strategy reads, e.g. ("weekly",). The Backtester adds one
+    # aggregate feed per timeframe after the base feed, named after it (see timeframe_data).
+    # A bar appears on the last base bar of its period, once it is complete.
+    timeframes = ()
+
     # Define parameters structure in subclasses
     params = (
         ('name', 'basetrategey'),
+        ('checkpoint', None),      # BacktestCheckpoint to resume from (set by the Backtester)
+        ('checkpoint_bar', 0),     # Bar (1-based) on which the checkpoint is re-applied
+        ('journal', None),         # EventJournal recording signals, orders and fills (optional)
     )
 
     def __init__(self):
@@ -24,6 +40,13 @@ class StrategyBase(bt.Strategy):
         self.signals = {} # efficient signal tracking
         self.initialize()
 
+    def timeframe_data(self, timeframe: str):
+        """
+        The aggregate feed for `timeframe` (declared in `timeframes` or requested per run),
+        e.g. `bt.indicators.SMA(self.timeframe_data("weekly").close, period=10)`.
+        """
+        return self.getdatabyname(timeframe)
+
     @abstractmethod
     def initialize(self):
         """
@@ -37,6 +60,15 @@ class StrategyBase(bt.Strategy):
         Called by Backtrader on every new data bar.
         Orchestrates the lifecycle: Generate Signals -> Execute.
         """
+        if self.params.checkpoint is not None:
+            bar = len(self.data)
+            if bar < self.params.checkpoint_bar:
+                # Warm-up bars of a resumed run: already traded in the original run
+                return
+            if bar == self.params.checkpoint_bar:
+                restore_checkpoint(self, self.params.checkpoint)
+                return
+
         signal = self.generate_signals()
         
         if signal:
@@ -51,6 +83,26 @@ class StrategyBase(bt.Strategy):
         """
         pass
 
+    def journal_event(self, kind, side, order=None, price=None, size=None, commission=0.0, reason=0):
+        """
+        Records an event in the run's journal (no-op without one). Defaults: the current
+        bar's close as price, no order ref, size left to the sizer.
+        """
+        journal = self.params.journal
+        if journal is None:
+            return
+        journal.record(
+            kind,
+            len(self.data),
+            self.data.datetime[0],
+            side=side,
+            order=order.ref if order is not None else 0,
+            price=self.data.close[0] if price is None else price,
+            size=float('nan') if size is None else size,
+            commission=commission,
+            reason=reason,
+        )
+
     def execute_trade(self, signal):
         """
         Executes a trade based on the generated signal.
@@ -62,42 +114,72 @@ class StrategyBase(bt.Strategy):
         # Subclasses can override if complex execution logic is needed
         
         size = signal.get('size', None) # If None, simpler sizers are used or full capital
+        side = 1 if signal['action'] == 'BUY' else -1
+        self.journal_event(SIGNAL, side, size=size)
         
         if signal['action'] == 'BUY':
             if not self.position:
-                logger.info(f"[{self.datetime.date()}] BUY Signal executing")
-                self.buy(size=size)
+                # Per-event logs are DEBUG: the journal is the cheap way to keep them
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"[{self.datetime.date()}] BUY Signal executing")
+                order = self.buy(size=size)
+                self.journal_event(SUBMIT, 1, order=order, size=size)
             
         elif signal['action'] == 'SELL':
             if self.position:
-                logger.info(f"[{self.datetime.date()}] SELL Signal executing")
-                self.close() # Close position clearly
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"[{self.datetime.date()}] SELL Signal executing")
+                position = self.position.size
+                order = self.close() # Close position clearly
+                self.journal_event(SUBMIT, -1 if position > 0 else 1, order=order, size=abs(position))
                 
                 # If it's a short strategy, we might do self.sell() here. 
                 # For this simulator, we assume Long-Only or Long-Short via 'sell' to open short?
                 # User constraints didn't specify Long-Only, but typical simple strategies are.
                 # 'close_positions' was requested as a specific method.
 
+    def get_checkpoint_state(self) -> dict:
+        """
+        Extra strategy state (beyond indicators, broker and trades) to persist in a checkpoint.
+        Override in strategies that keep custom attributes across bars.
+        """
+        return {}
+
+    def restore_checkpoint_state(self, state: dict):
+        """
+        Counterpart of get_checkpoint_state, called on the checkpoint bar of a resumed run.
+        """
+        pass
+
     def close_positions(self):
         """
         Force close all positions.
         """
         if self.position:
-            logger.info(f"[{self.datetime.date()}] Force Closing Positions")
-            self.close()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[{self.datetime.date()}] Force Closing Positions")
+            position = self.position.size
+            order = self.close()
+            self.journal_event(SUBMIT, -1 if position > 0 else 1, order=order, size=abs(position))
 
     def notify_order(self, order):
         """
-        Logging order status changes.
+        Journals and logs order status changes.
         """
         if order.status in [order.Submitted, order.Accepted]:
             return
 
+        side = 1 if order.isbuy() else -1
         if order.status in [order.Completed]:
-            if order.isbuy():
-                logger.info(f"BUY EXECUTED, Price: {order.executed.price:.2f}, Cost: {order.executed.value:.2f}, Comm: {order.executed.comm:.2f}")
-            elif order.issell():
-                logger.info(f"SELL EXECUTED, Price: {order.executed.price:.2f}, Cost: {order.executed.value:.2f}, Comm: {order.executed.comm:.2f}")
+            self.journal_event(
+                FILL, side, order=order,
+                price=order.executed.price, size=order.executed.size, commission=order.executed.comm,
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                action = "BUY" if order.isbuy() else "SELL"
+                logger.debug(f"{action} EXECUTED, Price: {order.executed.price:.2f}, Cost: {order.executed.value:.2f}, Comm: {order.executed.comm:.2f}")
             
-        elif order.status in [order.Canceled, order.Margin, order.Rejected]:
-            logger.warning("Order Canceled/Margin/Rejected")
+        elif order.status in [order.Canceled, order.Margin, order.Rejected, order.Expired]:
+            reason = [order.Canceled, order.Margin, order.Rejected, order.Expired].index(order.status)
+            self.journal_event(CANCEL, side, order=order, size=order.created.size, reason=reason)
+            logger.warning(f"Order {CANCEL_REASONS[reason].capitalize()}")
@@ -8,6 +8,9 @@ class MaCrossover(StrategyBase):
     Sell when Short MA crosses below Long MA.
     """
     
+    # Reads history only through indicators: low-memory mode can bound its buffers
+    bounded_buffers = True
+
     # Parameters definition with defaults
     params = (
         ('short_window', 20),
@@ -10,6 +10,9 @@ class MomentumStrategy(StrategyBase):
     Parameters:
     - period (10): Lookback period
     """
+    # Reads history only through indicators: low-memory mode can bound its buffers
+    bounded_buffers = True
+
     params = (
         ("momentum_period", 10),
         ("threshold", 0.0),
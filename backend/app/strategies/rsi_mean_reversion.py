@@ -12,6 +12,9 @@ class RsiMeanReversion(StrategyBase):
     - low_threshold (30): Buy signal
     - high_threshold (70): Sell signal
     """
+    # Reads history only through indicators: low-memory mode can bound its buffers
+    bounded_buffers = True
+
     params = (
         ("rsi_period", 14),
         ("lower_threshold", 30),
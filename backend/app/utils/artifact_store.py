@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, Optional
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+META_FILE = "meta.json"
+
+class ArtifactStore:
+    """
+    Disk-backed store for per-run artifacts (profiles, event journals).
+    Each artifact is a directory of named files plus a metadata document. Keeping them on
+    disk lets any worker process on the host serve an artifact another process produced.
+    The oldest artifacts are pruned beyond `max_entries`.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_entries: int = 100):
+        self.root = root or os.path.join(tempfile.gettempdir(), "atss-artifacts")
+        self.max_entries = max_entries
+
+    def put(self, kind: str, files: Dict[str, bytes], meta: Optional[Dict[str, Any]] = None) -> str:
+        """Stores the files atomically and returns the new artifact id."""
+        os.makedirs(self.root, exist_ok=True)
+        artifact_id = uuid.uuid4().hex
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.root)
+        try:
+            for name, content in files.items():
+                with open(os.path.join(staging, name), "wb") as f:
+                    f.write(content)
+            document = {
+                **(meta or {}),
+                "id": artifact_id,
+                "kind": kind,
+                "created": time.time(),
+                "files": {name: len(content) for name, content in files.items()},
+            }
+            with open(os.path.join(staging, META_FILE), "w") as f:
+                json.dump(document, f)
+            os.rename(staging, os.path.join(self.root, artifact_id))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._prune()
+        return artifact_id
+
+    def _path(self, artifact_id: str) -> Optional[str]:
+        if not _ID_PATTERN.match(artifact_id):
+            return None
+        path = os.path.join(self.root, artifact_id)
+        return path if os.path.isdir(path) else None
+
+    def get(self, artifact_id: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Returns the artifact's metadata (None if unknown, pruned or of another kind)."""
+        path = self._path(artifact_id)
+        if path is None:
+            return None
+        try:
+            with open(os.path.join(path, META_FILE)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if kind is not None and meta.get("kind") != kind:
+            return None
+        return meta
+
+    def read(self, artifact_id: str, name: str) -> Optional[bytes]:
+        meta = self.get(artifact_id)
+        if meta is None or name not in meta["files"]:
+            return None
+        try:
+            with open(os.path.join(self.root, artifact_id, name), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _prune(self):
+        try:
+            entries = [
+                entry for entry in os.scandir(self.root)
+                if entry.is_dir() and _ID_PATTERN.match(entry.name)
+            ]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+# Singleton shared by the profiling and journal endpoints
+artifact_store = ArtifactStore(
+    root=settings.ARTIFACT_DIR or None,
+    max_entries=settings.ARTIFACT_MAX_ENTRIES,
+)
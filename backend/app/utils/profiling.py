@@ -0,0 +1,134 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Where time is attributed, by source path. Checked in order, so the app's own packages
+# win over the libraries they wrap.
+CATEGORIES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("data", ("/backend/app/data/", "/yfinance/", "/curl_cffi/")),
+    ("strategies", ("/backend/app/strategies/",)),
+    ("engine", ("/backend/app/engine/", "/backtrader/")),
+    ("analytics", ("/backend/app/analytics/",)),
+    ("serialization", ("/backend/app/schemas/", "/pydantic/", "/pydantic_core/", "/fastapi/encoders", "/json/")),
+)
+OTHER = "other"
+PROFILER_MODES = ("deterministic", "sampling")
+MAX_STACK_DEPTH = 256
+
+def categorize(filename: str) -> Optional[str]:
+    path = filename.replace("\\", "/")
+    for category, markers in CATEGORIES:
+        if any(marker in path for marker in markers):
+            return category
+    return None
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler:
+    """
+    Samples one thread's Python stack at a fixed interval from a background thread.
+    Produces collapsed stacks (flamegraph input) and a per-category sample count, where
+    each sample goes to the innermost frame that belongs to a known category (so pandas
+    called from analytics counts as analytics).
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels, category = [], None
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                labels.append(_frame_label(code))
+                if category is None:
+                    category = categorize(code.co_filename)
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+            self.categories[category or OTHER] += 1
+            self.samples += 1
+
+class ProfileCapture:
+    """Result of a profiled call: wall time, sampled stacks and (deterministic mode) pstats."""
+
+    def __init__(self, mode: str, wall_seconds: float, sampler: StackSampler, profiler: Optional[cProfile.Profile]):
+        self.mode = mode
+        self.wall_seconds = wall_seconds
+        self.sampler = sampler
+        self.profiler = profiler
+
+    def breakdown(self) -> Dict[str, float]:
+        """Approximate wall seconds per category (sample share x wall time)."""
+        total = self.sampler.samples
+        out = {category: 0.0 for category, _ in CATEGORIES}
+        out[OTHER] = 0.0
+        if total:
+            for category, count in self.sampler.categories.items():
+                out[category] = self.wall_seconds * count / total
+        return out
+
+    def collapsed_stacks(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.sampler.stacks.most_common())
+
+    def artifacts(self) -> Dict[str, bytes]:
+        files = {"stacks.txt": self.collapsed_stacks().encode()}
+        if self.profiler is not None:
+            self.profiler.create_stats()
+            # Same format as pstats.Stats.dump_stats, loadable with pstats / snakeviz
+            files["profile.pstats"] = marshal.dumps(self.profiler.stats)
+            report = io.StringIO()
+            pstats.Stats(self.profiler, stream=report).sort_stats("cumulative").print_stats(50)
+            files["summary.txt"] = report.getvalue().encode()
+        return files
+
+def profile_call(fn: Callable[[], Any], mode: str = "deterministic", interval: float = 0.005) -> Tuple[Any, ProfileCapture]:
+    """
+    Runs `fn` in the current thread under the stack sampler, plus cProfile in
+    "deterministic" mode (exact call counts, but slows Python-heavy code down).
+    """
+    if mode not in PROFILER_MODES:
+        raise ValueError(f"Unknown profiler mode '{mode}'. Available: {list(PROFILER_MODES)}")
+
+    sampler = StackSampler(threading.get_ident(), interval)
+    profiler = cProfile.Profile() if mode == "deterministic" else None
+
+    sampler.start()
+    started = time.perf_counter()
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile per process: sample this run only
+            profiler, mode = None, "sampling"
+    try:
+        result = fn()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall = time.perf_counter() - started
+        sampler.stop()
+    return result, ProfileCapture(mode, wall, sampler, profiler)
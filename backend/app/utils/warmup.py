@@ -0,0 +1,178 @@
+"""
+Start-up warm-up and time-to-first-response measurement.
+
+Importing the app is cheap (the engine, data provider and analytics load lazily), which
+moves that cost onto the first request. With WARMUP_ENABLED the server pays it during
+start-up instead: it imports the engine and strategies, runs a tiny synthetic backtest
+through the request pipeline and pre-forks the compute pool, all within
+WARMUP_BUDGET_SECONDS of process start. Steps that would start after the budget is spent
+are skipped, so warm-up never pushes readiness further than the budget allows.
+"""
+
+import importlib
+import logging
+import os
+import time
+from concurrent.futures import wait
+from typing import Any, Dict, Optional
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lazily imported modules a request needs that the warm-up backtest doesn't reach
+WARM_MODULES = (
+    "backend.app.data.market_data",
+    "backend.app.engine.declarative",
+    "backend.app.engine.scanner",
+)
+
+def _process_age() -> float:
+    """Seconds since this process started (from /proc on Linux), or 0.0 if unknown."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+class StartupTimer:
+    """Start-up milestones, in seconds since the process started."""
+
+    def __init__(self, budget_seconds: float = 0.0):
+        self.budget_seconds = budget_seconds
+        self.started = time.perf_counter() - _process_age()
+        self.ready: Optional[float] = None
+        self.first_response: Optional[float] = None
+        self.warmup: Dict[str, Any] = {}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def remaining(self) -> float:
+        return self.budget_seconds - self.elapsed()
+
+    def mark_ready(self):
+        self.ready = self.elapsed()
+        logger.info(f"Ready to serve {self.ready:.3f}s after process start")
+
+    def mark_first_response(self):
+        if self.first_response is not None:
+            return
+        self.first_response = self.elapsed()
+        if self.budget_seconds and self.first_response > self.budget_seconds:
+            logger.warning(
+                f"Time to first response {self.first_response:.3f}s exceeded the "
+                f"{self.budget_seconds:.1f}s budget"
+            )
+        else:
+            logger.info(f"Time to first response: {self.first_response:.3f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready_seconds": self.ready,
+            "time_to_first_response_seconds": self.first_response,
+            "budget_seconds": self.budget_seconds,
+            "within_budget": None if self.first_response is None else self.first_response <= self.budget_seconds,
+            "warmup": self.warmup,
+        }
+
+class FirstResponseMiddleware:
+    """ASGI middleware recording when the first HTTP response starts (then a pass-through)."""
+
+    def __init__(self, app, timer: "StartupTimer"):
+        self.app = app
+        self.timer = timer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.timer.first_response is not None:
+            return await self.app(scope, receive, send)
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                self.timer.mark_first_response()
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
+
+def touch_hot_paths(bars: int = 250):
+    """
+    Imports the engine, analytics and every registered strategy, then runs a short
+    backtest on synthetic prices through the same steps as a request (engine, metrics,
+    benchmark, response serialization).
+    """
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
+    import numpy as np
+    import pandas as pd
+    from backend.app.engine.backtester import Backtester
+    from backend.app.analytics.metrics import calculate_metrics
+    from backend.app.analytics.benchmark import calculate_benchmark
+    from backend.app.schemas.response import BacktestResponse
+    from backend.app.strategies import strategy_registry
+
+    strategy_registry.available()
+
+    # Seeded generator: leaves the global NumPy random state (used for mock data) alone
+    rng = np.random.default_rng(0)
+    close = 100.0 * np.cumprod(1 + rng.normal(0.0005, 0.02, bars))
+    data = pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=bars, freq="B"),
+    )
+    result = Backtester(
+        strategy_cls=strategy_registry["ma_crossover"],
+        data=data,
+        params={"short_window": 5, "long_window": 20},
+    ).run()
+    metrics = calculate_metrics(result["equity_curve"], result["trades"], 100000.0)
+    BacktestResponse.model_validate({
+        "metrics": metrics,
+        "equity_curve": result["equity_curve"],
+        "trades": result["trades"].to_dicts(),
+        "benchmark": calculate_benchmark(data, 100000.0),
+    }).model_dump(mode="json")
+
+def warm_up(timer: StartupTimer) -> Dict[str, Any]:
+    """
+    Runs the warm-up steps that fit in the remaining budget and records each step's
+    duration (or "skipped") in `timer.warmup`.
+    """
+    from backend.app.cluster.worker import prewarm_compute_pool
+
+    report = timer.warmup
+    started = time.perf_counter()
+
+    # Pool processes spawn and warm in the background while this process warms up
+    pool_futures = []
+    if settings.WARMUP_PREFORK_POOL and timer.remaining() > 0:
+        pool_futures = prewarm_compute_pool()
+
+    if timer.remaining() > 0:
+        step = time.perf_counter()
+        try:
+            touch_hot_paths()
+            report["hot_paths_seconds"] = time.perf_counter() - step
+        except Exception as e:
+            logger.error(f"Warm-up backtest failed: {e}")
+            report["hot_paths_seconds"] = None
+    else:
+        report["hot_paths_seconds"] = "skipped"
+
+    if pool_futures:
+        step = time.perf_counter()
+        done, not_done = wait(pool_futures, timeout=max(0.0, timer.remaining()))
+        report["pool_processes_warm"] = len({f.result() for f in done if f.exception() is None})
+        report["pool_processes_pending"] = len(not_done)
+        report["pool_wait_seconds"] = time.perf_counter() - step
+    elif settings.WARMUP_PREFORK_POOL:
+        report["pool_processes_warm"] = "skipped"
+
+    report["total_seconds"] = time.perf_counter() - started
+    logger.info(f"Warm-up finished in {report['total_seconds']:.3f}s: {report}")
+    return report
+
+# Process-wide start-up timings (exposed by /health)
+startup_timer = StartupTimer(budget_seconds=settings.WARMUP_BUDGET_SECONDS)
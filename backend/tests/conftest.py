@@ -0,0 +1,38 @@
+import os
+
+# Tests run offline on synthetic data, before the settings singleton is created
+os.environ.setdefault("DATA_PROVIDER", "mock")
+os.environ.setdefault("MOCK_DATA_FALLBACK", "False")
+os.environ.setdefault("SHARED_MEMORY_ENABLED", "False")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", default=False, help="Also run tests marked slow")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: long-running test, skipped unless --run-slow is given")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip = pytest.mark.skip(reason="slow: pass --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
+
+def mock_series(ticker: str = "TEST", start: str = "2015-01-01", end: str = "2020-12-31", seed: int = 7) -> pd.DataFrame:
+    """A seeded, validated synthetic OHLCV series with capitalized columns."""
+    from backend.app.data.market_data import market_data_service
+    from backend.app.data.validators import validate_market_data
+
+    np.random.seed(seed)
+    df = market_data_service.generate_mock_data(ticker, start, end)
+    df.columns = [c.capitalize() for c in df.columns]
+    return validate_market_data(df, ticker)
+
+@pytest.fixture
+def series() -> pd.DataFrame:
+    return mock_series()
@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+
+from backend.app.analytics.metrics import calculate_metrics
+from backend.app.engine.backtester import Backtester
+from backend.app.engine.checkpoint import checkpoint_store
+from backend.app.strategies.ma_crossover import MaCrossover
+from backend.app.strategies.momentum import MomentumStrategy
+from backend.app.strategies.rsi_mean_reversion import RsiMeanReversion
+from backend.tests.conftest import mock_series
+
+CASES = [
+    (MaCrossover, {"short_window": 5, "long_window": 20}),
+    (RsiMeanReversion, {}),
+    (MomentumStrategy, {"momentum_period": 3}),
+]
+
+# Bars at which the growing series is re-run (the last run covers the whole series)
+CUTS = [120, 347, 348, 700, 1011]
+
+@pytest.fixture(autouse=True)
+def empty_checkpoint_store():
+    checkpoint_store.clear()
+    yield
+    checkpoint_store.clear()
+
+@pytest.mark.parametrize("strategy_cls, params", CASES, ids=[cls.__name__ for cls, _ in CASES])
+def test_resumed_run_matches_full_rerun(strategy_cls, params, caplog):
+    data = mock_series(start="2012-01-01", end="2016-12-31", seed=11)
+    full = Backtester(strategy_cls, data, params).run()
+
+    with caplog.at_level(logging.INFO, logger="backend.app.engine.backtester"):
+        for bars in CUTS + [len(data)]:
+            resumed = Backtester(strategy_cls, data.iloc[:bars], params, checkpoint_key="TEST").run()
+    assert sum("Resuming from checkpoint" in message for message in caplog.messages) == len(CUTS)
+
+    assert resumed["equity_curve"] == full["equity_curve"]
+    assert resumed["trades"].to_dicts() == full["trades"].to_dicts()
+    assert resumed["final_value"] == full["final_value"]
+    assert calculate_metrics(resumed["equity_curve"], resumed["trades"], 100000.0) == \
+        calculate_metrics(full["equity_curve"], full["trades"], 100000.0)
+    assert len(full["trades"]) > 0
+
+def test_revised_history_runs_in_full():
+    data = mock_series(start="2012-01-01", end="2014-12-31", seed=11)
+    params = {"short_window": 5, "long_window": 20}
+    Backtester(MaCrossover, data.iloc[:300], params, checkpoint_key="TEST").run()
+
+    revised = data.copy()
+    revised.iloc[100, revised.columns.get_loc("Close")] *= 1.01
+    rerun = Backtester(MaCrossover, revised, params, checkpoint_key="TEST").run()
+    assert rerun["equity_curve"] == Backtester(MaCrossover, revised, params).run()["equity_curve"]
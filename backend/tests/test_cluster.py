@@ -0,0 +1,94 @@
+"""
+End-to-end sharding harness: starts two worker nodes (uvicorn on local ports, mock data
+provider) and runs a sharded batch through the coordinator against them.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from backend.app.api.backtest import execute_backtest
+from backend.app.cluster.coordinator import SweepCoordinator
+from backend.app.schemas.request import SweepRequest
+
+pytest.importorskip("uvicorn")
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+WORKERS = 2
+STARTUP_TIMEOUT_SECONDS = 60.0
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_healthy(url: str, process: subprocess.Popen):
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Worker {url} exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{url}/api/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Worker {url} did not start within {STARTUP_TIMEOUT_SECONDS}s")
+
+@pytest.fixture(scope="module")
+def worker_urls():
+    env = {
+        **os.environ,
+        "DATA_PROVIDER": "mock",
+        "WORKER_CAPACITY": "1",
+        "COORDINATOR_WORKERS": "",
+        "SHARED_MEMORY_ENABLED": "False",
+    }
+    processes, urls = [], []
+    try:
+        for _ in range(WORKERS):
+            port = _free_port()
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+                cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            ))
+            urls.append(f"http://127.0.0.1:{port}")
+        for url, process in zip(urls, processes):
+            _wait_healthy(url, process)
+        yield urls
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+def test_sharded_batch_splits_across_workers_and_matches_local_run(worker_urls):
+    requests = SweepRequest(
+        ticker="SWEEP",
+        start_date="2016-01-01",
+        end_date="2020-12-31",
+        strategy="ma_crossover",
+        parameter_grid={"short_window": [5, 10, 15, 20], "long_window": [30, 50]},
+    ).expand()
+    coordinator = SweepCoordinator(worker_urls, shard_size=2, max_retries=1, timeout=120.0)
+
+    items = asyncio.run(coordinator.run(requests))
+
+    assert coordinator.shard_count == 4
+    assert all(coordinator.worker_stats()[url] > 0 for url in worker_urls)
+    assert {item["worker"] for item in items} == set(worker_urls)
+    assert [item["index"] for item in items] == list(range(len(requests)))
+    for item, request in zip(items, requests):
+        assert item["status"] == "ok", item.get("error")
+        assert item["parameters"] == request.parameters
+        assert item["metrics"] == execute_backtest(request)["metrics"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from backend.app.analytics.metrics import calculate_metrics
+from backend.app.engine.backtester import Backtester
+from backend.app.engine.declarative import compile_strategy, run_declarative_backtest
+from backend.app.strategies.ma_crossover import MaCrossover
+from backend.tests.conftest import mock_series
+
+CROSSOVER_SPEC = {
+    "indicators": {"fast": {"type": "sma", "period": 5}, "slow": {"type": "sma", "period": 20}},
+    "entry": {"op": "cross_above", "left": "fast", "right": "slow"},
+    "exit": {"op": "cross_below", "left": "fast", "right": "slow"},
+}
+
+class SizedCrossover(MaCrossover):
+    """MaCrossover buying a fixed number of shares, like a declarative spec's `size`."""
+    params = (('size', 1.0),)
+
+    def generate_signals(self):
+        signal = super().generate_signals()
+        if signal and signal['action'] == 'BUY':
+            signal['size'] = self.params.size
+        return signal
+
+def _ohlcv(close):
+    close = np.asarray(close, dtype=np.float64)[np.newaxis, :]
+    return {field: close for field in ("open", "high", "low", "close", "volume")}
+
+def test_not_does_not_fire_during_warm_up():
+    compiled = compile_strategy({
+        "entry": {"op": "not", "arg": {"op": "gt", "left": "close", "right": {"indicator": "sma", "period": 5}}},
+        "exit": {"op": "not", "arg": {"op": "cross_above", "left": "close", "right": {"indicator": "sma", "period": 3}}},
+    })
+    entry, exit = compiled.signals(_ohlcv(np.arange(10.0)))
+    assert not entry.any()  # Rising prices stay above their SMA once it exists
+    assert not exit[0, :3].any() and exit[0, 3:].all()
+
+@pytest.mark.parametrize("size", [1.0, 640.0, 700.0])
+def test_matches_engine_including_cash_rejections(size):
+    data = mock_series(seed=3)
+    declarative = run_declarative_backtest(compile_strategy({**CROSSOVER_SPEC, "size": size}), data, "TEST")
+    engine = Backtester(SizedCrossover, data, {"short_window": 5, "long_window": 20, "size": size}).run()
+
+    assert len(declarative["trades"]) == len(engine["trades"]) > 0
+    np.testing.assert_allclose(
+        [point["equity"] for point in declarative["equity_curve"]],
+        [point["equity"] for point in engine["equity_curve"]],
+        rtol=1e-9,
+    )
+
+def test_low_memory_keeps_metrics_with_a_thinned_curve():
+    compiled = compile_strategy(CROSSOVER_SPEC)
+    data = mock_series(seed=3)
+    full = run_declarative_backtest(compiled, data, ticker="TEST")
+    low = run_declarative_backtest(compiled, data, ticker="TEST", low_memory=True, max_curve_points=100)
+
+    assert "equity_stats" not in full
+    assert len(low["equity_curve"]) <= 101 and low["equity_curve"][-1] == full["equity_curve"][-1]
+    expected = calculate_metrics(full["equity_curve"], full["trades"], 100000.0)
+    actual = calculate_metrics(low["equity_curve"], low["trades"], 100000.0, equity_stats=low["equity_stats"])
+    assert actual == pytest.approx(expected, rel=1e-9, abs=1e-12)
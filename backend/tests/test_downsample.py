@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.analytics.downsample import downsample_curves, downsample_indices, lttb_indices, minmax_indices
+from backend.app.main import app
+
+REQUEST = {"ticker": "CURVE", "start_date": "2015-01-01", "end_date": "2019-12-31", "strategy": "ma_crossover"}
+
+def _walk(n: int = 5000, seed: int = 0) -> np.ndarray:
+    return 100.0 * np.cumprod(1 + np.random.default_rng(seed).normal(0.0003, 0.01, n))
+
+def _max_drawdown(values: np.ndarray) -> float:
+    return float((values / np.maximum.accumulate(values) - 1.0).min())
+
+@pytest.mark.parametrize("select", [minmax_indices, lttb_indices])
+def test_keeps_first_and_last_within_budget(select):
+    y = _walk()
+    indices = select(y, 200)
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert len(indices) <= 200
+    assert (np.diff(indices) > 0).all()
+    assert np.array_equal(select(y[:150], 200), np.arange(150))  # Short curves are untouched
+
+def test_minmax_preserves_extrema_and_drawdown():
+    y = _walk()
+    kept = y[minmax_indices(y, 200)]
+    assert kept.max() == y.max() and kept.min() == y.min()
+    assert _max_drawdown(kept) == _max_drawdown(y)
+
+def test_minmax_shares_one_selection_across_series():
+    a, b = _walk(seed=1), _walk(seed=2)
+    indices = minmax_indices(np.vstack([a, b]), 200)
+    for y in (a, b):
+        assert y[indices].max() == y.max() and y[indices].min() == y.min()
+    with pytest.raises(ValueError, match="at least 6"):
+        minmax_indices(np.vstack([a, b]), 5)
+
+def test_lttb_keeps_spikes():
+    y = np.ones(5000)
+    y[1234], y[3456] = 5.0, -3.0
+    assert {1234, 3456} <= set(lttb_indices(y, 100).tolist())
+
+def test_keep_indices_are_forced_within_half_the_budget():
+    y = _walk()
+    keep = [10, 2000, 4321]
+    assert set(keep) <= set(downsample_indices(y, 100, "lttb", keep=keep).tolist())
+    assert len(downsample_indices(y, 100, "minmax", keep=keep)) <= 100
+    # More than half the budget: ignored rather than crowding out the curve's shape
+    assert not set(range(1, 60)) <= set(downsample_indices(y, 100, "lttb", keep=list(range(1, 60))).tolist())
+    with pytest.raises(ValueError, match="Unknown downsampling method"):
+        downsample_indices(y, 100, "average")
+
+def test_downsample_curves_keeps_curves_aligned():
+    dates = [f"d{i}" for i in range(1000)]
+    equity = [{"date": d, "equity": v} for d, v in zip(dates, _walk(1000, 3))]
+    benchmark = [{"date": d, "equity": v} for d, v in zip(dates, _walk(1000, 4))]
+    small_equity, small_benchmark, missing = downsample_curves([equity, benchmark, None], 100, keep_dates=["d500"])
+    assert [p["date"] for p in small_equity] == [p["date"] for p in small_benchmark]
+    assert "d500" in {p["date"] for p in small_equity}
+    assert missing is None
+
+def test_backtest_returns_downsampled_curves():
+    client = TestClient(app)
+    full = client.post("/api/backtest", json=REQUEST).json()
+    small = client.post("/api/backtest", json={**REQUEST, "max_points": 60}).json()
+
+    assert len(small["equity_curve"]) <= 60 < len(full["equity_curve"])
+    assert small["metrics"] == full["metrics"]  # Metrics use every bar
+    assert small["equity_curve"][0] == full["equity_curve"][0]
+    assert small["equity_curve"][-1] == full["equity_curve"][-1]
+    assert [p["date"] for p in small["benchmark"]["equity_curve"]] == [p["date"] for p in small["equity_curve"]]
+    equity = [p["equity"] for p in full["equity_curve"]]
+    assert min(p["equity"] for p in small["equity_curve"]) == min(equity)
+    assert max(p["equity"] for p in small["equity_curve"]) == max(equity)
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import backtrader as bt
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.engine.journal import CANCEL, CANCEL_REASONS, FILL, SIGNAL, SUBMIT, EventJournal, order_analytics
+from backend.app.main import app
+from backend.app.utils.artifact_store import artifact_store
+
+REQUEST = {"ticker": "JOURNAL", "start_date": "2015-01-01", "end_date": "2019-12-31", "strategy": "ma_crossover", "journal": True}
+
+def _day(day: int) -> float:
+    return bt.date2num(datetime(2020, 1, day))
+
+def test_ring_buffer_keeps_the_newest_events_in_order():
+    journal = EventJournal(capacity=4)
+    for bar in range(1, 7):
+        journal.record(SIGNAL, bar, _day(bar), side=1, price=100.0 + bar)
+    assert (len(journal), journal.total, journal.dropped) == (4, 6, 2)
+    assert journal.events()["bar"].tolist() == [3, 4, 5, 6]
+    assert str(journal.events()["date"][0]) == "2020-01-03T00:00:00"
+    with pytest.raises(ValueError):
+        EventJournal(capacity=0)
+
+def test_exports_round_trip():
+    journal = EventJournal(capacity=8)
+    journal.record(SIGNAL, 1, _day(1), side=1, price=100.0)
+    journal.record(SUBMIT, 1, _day(1), side=1, order=7, price=100.0)
+    journal.record(CANCEL, 2, _day(2), side=1, order=7, reason=CANCEL_REASONS.index("margin"))
+
+    assert EventJournal.load_binary(journal.to_binary()).tobytes() == journal.events().tobytes()
+    signal, submit, cancel = [json.loads(line) for line in journal.to_ndjson().splitlines()]
+    assert signal == {"kind": "signal", "bar": 1, "date": "2020-01-01T00:00:00", "side": "buy", "price": 100.0, "size": None}
+    assert submit["order"] == 7 and "order" not in signal
+    assert cancel["reason"] == "margin"
+
+    not_a_journal = EventJournal(capacity=1)
+    not_a_journal._data = np.zeros(1, dtype=[("x", "f8")])
+    with pytest.raises(ValueError, match="Not an event journal"):
+        EventJournal.load_binary(not_a_journal.to_binary())
+
+def test_order_analytics():
+    journal = EventJournal(capacity=16)
+    journal.record(SUBMIT, 1, _day(1), side=1, order=1, price=100.0, size=10)
+    journal.record(FILL, 2, _day(2), side=1, order=1, price=101.0, size=10, commission=1.0)
+    journal.record(SUBMIT, 5, _day(5), side=-1, order=2, price=110.0, size=10)
+    journal.record(FILL, 6, _day(6), side=-1, order=2, price=109.0, size=-10, commission=1.5)
+    journal.record(SUBMIT, 8, _day(8), side=1, order=3, price=105.0, size=10)
+    journal.record(CANCEL, 9, _day(9), side=1, order=3, reason=CANCEL_REASONS.index("margin"))
+    stats = journal.order_analytics()
+
+    assert (stats["orders"], stats["fills"], stats["cancels"]) == (3, 2, {"margin": 1})
+    assert stats["fill_rate"] == pytest.approx(2 / 3)
+    assert stats["commission"] == pytest.approx(2.5)
+    # Both fills cost money versus the signal close: +1.00 on the buy, +1.00 on the sell
+    assert stats["slippage_cost"] == pytest.approx(20.0)
+    assert stats["slippage_bps"]["max"] == pytest.approx(100.0)
+    assert stats["slippage_bps"]["mean"] == pytest.approx((100.0 + 1e4 / 110) / 2)
+    assert stats["fill_delay_bars"] == {"mean": 1.0, "median": 1.0, "p95": 1.0, "max": 1.0}
+
+def test_fills_without_their_submission_are_left_out_of_slippage():
+    journal = EventJournal(capacity=2)
+    journal.record(SUBMIT, 1, _day(1), side=1, order=1, price=100.0, size=10)
+    journal.record(FILL, 2, _day(2), side=1, order=1, price=101.0, size=10)
+    journal.record(FILL, 3, _day(3), side=-1, order=2, price=102.0, size=-10)  # Overwrites the submission
+    stats = order_analytics(journal.events(), dropped=journal.dropped)
+    assert (stats["fills"], stats["dropped"], stats["slippage_cost"]) == (2, 1, 0.0)
+
+def test_backtest_journal_is_stored_and_served(monkeypatch, tmp_path):
+    monkeypatch.setattr(artifact_store, "root", str(tmp_path))
+    client = TestClient(app)
+    summary = client.post("/api/backtest", json=REQUEST).json()["journal"]
+    assert summary["events"] > 0 and summary["dropped"] == 0
+    assert summary["analytics"]["fills"] > 0 and summary["analytics"]["fill_rate"] > 0
+
+    lines = client.get(summary["url"], params={"format": "ndjson"}).text.splitlines()
+    assert len(lines) == summary["events"]
+    assert {json.loads(line)["kind"] for line in lines} <= {"signal", "submit", "fill", "cancel"}
+    events = EventJournal.load_binary(client.get(summary["url"], params={"format": "binary"}).content)
+    assert order_analytics(events) == summary["analytics"]
+    assert client.get(summary["url"], params={"format": "csv"}).status_code == 400
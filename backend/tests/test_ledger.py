@@ -0,0 +1,68 @@
+import backtrader as bt
+import numpy as np
+import pytest
+
+from backend.app.engine.execution import TradeLogger
+from backend.app.engine.ledger import TradeLedger
+
+def _row(ledger: TradeLedger, **overrides):
+    values = dict(
+        entry_date="2020-01-02", exit_date="2020-01-10", entry_price=100.0, exit_price=110.0,
+        size=10.0, pnl=100.0, pnl_net=98.0, commission=2.0, slippage=0.5, duration=8.0,
+    )
+    values.update(overrides)
+    ledger.append(**values)
+
+def test_ledger_grows_and_exposes_columns():
+    ledger = TradeLedger("TEST", capacity=1)
+    for i in range(5):
+        _row(ledger, pnl_net=float(i))
+    assert len(ledger) == 5
+    assert ledger["pnl_net"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    copy = ledger.copy()
+    _row(ledger)
+    assert len(copy) == 5 and len(ledger) == 6
+
+    both = TradeLedger.concat([copy, TradeLedger.from_arrays(pnl_net=np.array([7.0, 8.0]))])
+    assert both.ticker == "TEST"
+    assert both["pnl_net"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 7.0, 8.0]
+
+def test_to_dicts_reports_dates_and_sanitizes_non_finite_values():
+    ledger = TradeLedger("TEST")
+    _row(ledger, exit_price=np.nan, slippage=np.inf)
+    (row,) = ledger.to_dicts()
+    assert row["ticker"] == "TEST"
+    assert str(row["entry_date"]) == "2020-01-02" and str(row["exit_date"]) == "2020-01-10"
+    assert row["exit_price"] == 0.0 and row["slippage"] == 0.0
+    assert row["pnl_net"] == 98.0
+
+class Scripted(bt.Strategy):
+    """Long 10 on bar 5, reverses to short 10 on bar 10, closes on bar 15."""
+    params = (("orders", {5: 10, 10: -20, 15: 10}),)
+
+    def next(self):
+        size = self.params.orders.get(len(self))
+        if size:
+            (self.buy if size > 0 else self.sell)(size=abs(size))
+
+def test_trade_logger_records_real_fills_and_splits_reversals(series):
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=series.iloc[:30]))
+    cerebro.addstrategy(Scripted)
+    cerebro.addanalyzer(TradeLogger, _name="trades", capacity=1)
+    cerebro.broker.setcash(1e6)
+    cerebro.broker.setcommission(commission=0.001)
+    ledger = cerebro.run()[0].analyzers.trades.ledger
+
+    # Market orders fill at the next bar's open (bar 5 -> row 5, bar 10 -> row 10, ...)
+    opens = series["Open"].to_numpy()
+    assert len(ledger) == 2
+    assert ledger["size"].tolist() == [10.0, -10.0]
+    np.testing.assert_allclose(ledger["entry_price"], [opens[5], opens[10]])
+    np.testing.assert_allclose(ledger["exit_price"], [opens[10], opens[15]])
+    np.testing.assert_allclose(ledger["pnl"], (ledger["exit_price"] - ledger["entry_price"]) * ledger["size"])
+    commission = 0.001 * 10 * (ledger["entry_price"] + ledger["exit_price"])
+    np.testing.assert_allclose(ledger["commission"], commission)
+    np.testing.assert_allclose(ledger["pnl_net"], ledger["pnl"] - commission)
+    assert ledger["slippage"].tolist() == pytest.approx([0.0, 0.0])
@@ -0,0 +1,80 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from backend.app.analytics.metrics import calculate_metrics
+from backend.app.engine.backtester import Backtester
+from backend.app.strategies.base import StrategyBase
+from backend.app.strategies.ma_crossover import MaCrossover
+from backend.app.strategies.momentum import MomentumStrategy
+from backend.app.strategies.rsi_mean_reversion import RsiMeanReversion
+from backend.tests.conftest import mock_series
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Peak RSS budget of a 1M-bar low-memory run (LIMITATIONS.md: ~296 MB measured, ~320 MB budget)
+MILLION_BAR_RSS_BUDGET_MB = 320
+
+class RawHistoryStrategy(StrategyBase):
+    """Indexes raw history directly, so it must not run on bounded buffers."""
+
+    def initialize(self):
+        pass
+
+    def next(self):
+        if len(self) > 30 and self.data.close[0] > self.data.close[-30]:
+            pass
+
+def test_bounded_buffers_are_opt_in():
+    assert StrategyBase.bounded_buffers is False
+    assert Backtester(RawHistoryStrategy, mock_series(), {}, low_memory=True).exactbars == 0
+    for strategy_cls in (MaCrossover, RsiMeanReversion, MomentumStrategy):
+        assert Backtester(strategy_cls, mock_series(), {}, low_memory=True).exactbars == 1
+
+@pytest.mark.parametrize("strategy_cls", [MaCrossover, RsiMeanReversion, MomentumStrategy])
+def test_low_memory_run_matches_normal_run(strategy_cls):
+    data = mock_series()
+    normal = Backtester(strategy_cls, data, {}).run()
+    low = Backtester(strategy_cls, data, {}, low_memory=True, max_curve_points=500).run()
+
+    assert low["final_value"] == normal["final_value"]
+    assert len(low["equity_curve"]) <= 500
+    assert low["equity_curve"][-1] == normal["equity_curve"][-1]
+    expected = calculate_metrics(normal["equity_curve"], normal["trades"], 100000.0)
+    actual = calculate_metrics(low["equity_curve"], low["trades"], 100000.0, equity_stats=low["equity_stats"])
+    assert actual == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+MILLION_BAR_RUN = textwrap.dedent("""
+    import logging, resource
+    import numpy as np, pandas as pd
+    from backend.app.engine.backtester import Backtester
+    from backend.app.strategies.ma_crossover import MaCrossover
+
+    logging.disable(logging.CRITICAL)
+    n = 1_000_000
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    open_ = close * (1 + rng.normal(0, 0.002, n))
+    data = pd.DataFrame(
+        {"Open": open_, "High": np.maximum(open_, close) * 1.002, "Low": np.minimum(open_, close) * 0.998,
+         "Close": close, "Volume": 1e6},
+        index=pd.date_range("2000-01-03", periods=n, freq="min"),
+    )
+    result = Backtester(MaCrossover, data, {}, low_memory=True, max_curve_points=2000).run()
+    assert len(result["trades"]) > 0
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+""")
+
+@pytest.mark.slow
+@pytest.mark.skipif(sys.platform != "linux", reason="ru_maxrss is reported in KB on Linux")
+def test_million_bar_low_memory_run_stays_within_budget():
+    # A fresh process, so the peak RSS is this run's alone (takes ~10-13 minutes)
+    completed = subprocess.run(
+        [sys.executable, "-c", MILLION_BAR_RUN],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True, timeout=3600,
+    )
+    peak_mb = float(completed.stdout.strip().splitlines()[-1])
+    assert peak_mb < MILLION_BAR_RSS_BUDGET_MB
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from backend.app.data.market_data import MarketDataProvider, MarketDataService, RateLimitError, TransientProviderError
+from backend.app.data.validators import DataValidationError
+
+class ScriptedProvider(MarketDataProvider):
+    """Returns `frame` after raising the scripted errors, one per call."""
+    name = "scripted"
+
+    def __init__(self, frame: pd.DataFrame, errors=(), gate: threading.Event = None):
+        self.frame = frame
+        self.errors = list(errors)
+        self.gate = gate
+        self.calls = 0
+
+    def download(self, ticker, start_date, end_date):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.frame.copy()
+
+def _service(provider, max_retries=3):
+    return MarketDataService(provider=provider, max_workers=4, max_retries=max_retries, backoff_base=0.0, backoff_max=0.0)
+
+def _raw(series):
+    raw = series.copy()
+    raw.attrs = {}
+    return raw
+
+def test_concurrent_identical_fetches_download_once(series):
+    gate = threading.Event()
+    provider = ScriptedProvider(_raw(series), gate=gate)
+    service = _service(provider)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(service.fetch_historical_data("TEST", "2015-01-01", "2020-12-31", False)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)  # Let every caller join the in-flight fetch
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert provider.calls == 1
+    assert len(results) == 8
+    # Each caller gets its own copy of the same data
+    assert len({id(df) for df in results}) == 8
+    for df in results:
+        pd.testing.assert_frame_equal(df, results[0])
+        assert df.attrs["data_source"] == "scripted"
+
+def test_retryable_errors_are_retried(series):
+    provider = ScriptedProvider(_raw(series), errors=[RateLimitError("slow down"), TransientProviderError("reset")])
+    df = _service(provider).fetch_historical_data("TEST", "2015-01-01", "2020-12-31", False)
+    assert provider.calls == 3
+    assert df.attrs["data_source"] == "scripted" and "fallback_reason" not in df.attrs
+
+def test_unavailable_provider_fails_unless_mock_is_allowed(series):
+    errors = [RateLimitError("slow down")] * 10
+    with pytest.raises(ValueError, match="Failed to fetch"):
+        _service(ScriptedProvider(_raw(series), errors=list(errors)), max_retries=1).fetch_historical_data("TEST", "2015-01-01", "2020-12-31", False)
+
+    provider = ScriptedProvider(_raw(series), errors=list(errors))
+    df = _service(provider, max_retries=1).fetch_historical_data("TEST", "2015-01-01", "2020-12-31", True)
+    assert provider.calls == 2
+    assert df.attrs["data_source"] == "mock"
+    assert "unavailable" in df.attrs["fallback_reason"]
+
+def test_empty_data_falls_back_only_when_allowed():
+    with pytest.raises(DataValidationError, match="No data found"):
+        _service(ScriptedProvider(pd.DataFrame())).fetch_historical_data("TEST", "2015-01-01", "2020-12-31", False)
+
+    df = _service(ScriptedProvider(pd.DataFrame())).fetch_historical_data("TEST", "2015-01-01", "2020-12-31", True)
+    assert df.attrs["data_source"] == "mock"
+    assert df.attrs["fallback_reason"] == "scripted returned no data"
+
+def test_other_provider_errors_never_fall_back(series):
+    provider = ScriptedProvider(_raw(series), errors=[KeyError("Close")])
+    with pytest.raises(ValueError, match="Failed to fetch"):
+        _service(provider).fetch_historical_data("TEST", "2015-01-01", "2020-12-31", True)
+    assert provider.calls == 1
+
+def test_fetch_many_reports_errors_per_ticker(series):
+    class OneBadTicker(ScriptedProvider):
+        def download(self, ticker, start_date, end_date):
+            return pd.DataFrame() if ticker == "BAD" else super().download(ticker, start_date, end_date)
+
+    results = _service(OneBadTicker(_raw(series))).fetch_many(["GOOD", "BAD"], "2015-01-01", "2020-12-31", False)
+    assert isinstance(results["GOOD"], pd.DataFrame)
+    assert isinstance(results["BAD"], DataValidationError)
@@ -0,0 +1,84 @@
+import pstats
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.config import settings
+from backend.app.main import app
+from backend.app.utils.artifact_store import ArtifactStore, artifact_store
+from backend.app.utils.profiling import CATEGORIES, OTHER, profile_call
+
+REQUEST = {"ticker": "PROF", "start_date": "2015-01-01", "end_date": "2019-12-31", "strategy": "ma_crossover", "profile": True}
+
+def _busy(seconds: float = 0.05) -> int:
+    deadline = time.perf_counter() + seconds
+    calls = 0
+    while time.perf_counter() < deadline:
+        calls += 1
+    return calls
+
+def test_deterministic_profile_has_samples_stats_and_breakdown(tmp_path):
+    result, capture = profile_call(_busy, mode="deterministic", interval=0.001)
+    assert result > 0
+    assert capture.sampler.samples > 0
+    breakdown = capture.breakdown()
+    assert set(breakdown) == {category for category, _ in CATEGORIES} | {OTHER}
+    assert sum(breakdown.values()) == pytest.approx(capture.wall_seconds)
+
+    files = capture.artifacts()
+    assert "_busy" in files["stacks.txt"].decode()
+    if capture.mode == "deterministic":  # Falls back to sampling if another cProfile is active
+        (tmp_path / "run.pstats").write_bytes(files["profile.pstats"])
+        stats = pstats.Stats(str(tmp_path / "run.pstats"))
+        assert any(name == "_busy" for (_, _, name) in stats.stats)
+        assert b"_busy" in files["summary.txt"]
+
+def test_sampling_profile_has_no_pstats():
+    _, capture = profile_call(_busy, mode="sampling", interval=0.001)
+    assert capture.mode == "sampling" and capture.profiler is None
+    assert set(capture.artifacts()) == {"stacks.txt"}
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown profiler mode"):
+        profile_call(_busy, mode="tracing")
+
+def test_artifact_store_round_trip_and_pruning(tmp_path):
+    store = ArtifactStore(root=str(tmp_path), max_entries=2)
+    first = store.put("profile", {"stacks.txt": b"a;b 1\n"}, meta={"mode": "sampling"})
+    assert store.get(first, kind="profile")["files"] == {"stacks.txt": 6}
+    assert store.get(first, kind="journal") is None
+    assert store.read(first, "stacks.txt") == b"a;b 1\n"
+    assert store.read(first, "missing.txt") is None
+    assert store.get("../../etc") is None
+
+    time.sleep(0.01)
+    store.put("profile", {})
+    time.sleep(0.01)
+    store.put("profile", {})
+    assert store.get(first) is None  # Oldest pruned beyond max_entries
+
+@pytest.fixture
+def profiling(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILER_MODE", "sampling")
+    monkeypatch.setattr(artifact_store, "root", str(tmp_path))
+
+def test_profiled_backtest_stores_a_retrievable_profile(profiling):
+    client = TestClient(app)
+    response = client.post("/api/backtest", json=REQUEST)
+    assert response.status_code == 200
+    profile = response.json()["profile"]
+    assert profile["samples"] > 0 and profile["breakdown"]["engine"] > 0
+
+    meta = client.get(profile["url"]).json()
+    assert meta["ticker"] == "PROF" and meta["formats"] == ["json", "collapsed"]
+    stacks = client.get(profile["url"], params={"format": "collapsed"})
+    assert stacks.status_code == 200 and stacks.text.strip()
+    assert client.get(profile["url"], params={"format": "pstats"}).status_code == 404  # Sampling mode
+    assert client.get(profile["url"], params={"format": "svg"}).status_code == 400
+    assert client.get("/api/profiles/" + "0" * 32).status_code == 404
+
+def test_profiling_is_refused_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", False)
+    assert TestClient(app).post("/api/backtest", json=REQUEST).status_code == 403
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.config import settings
+from backend.app.engine.streaming import LatencyHistogram, StreamingAnalyzer
+from backend.app.main import app
+
+REQUEST = {"ticker": "REPLAY", "start_date": "2015-01-01", "end_date": "2019-12-31", "strategy": "ma_crossover"}
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+@pytest.fixture
+def processed_bars(monkeypatch):
+    """Counts bars the engine has processed (the analyzer runs once per bar)."""
+    bars = [0]
+    original = StreamingAnalyzer.next
+
+    def counting_next(self):
+        bars[0] += 1
+        original(self)
+
+    monkeypatch.setattr(StreamingAnalyzer, "next", counting_next)
+    return bars
+
+def test_replay_streams_every_bar_and_a_latency_summary(client):
+    with client.websocket_connect("/api/replay") as ws:
+        ws.send_json(REQUEST)
+        messages = []
+        while not messages or messages[-1]["t"] not in ("end", "error"):
+            messages.append(ws.receive_json())
+
+    assert messages[0]["t"] == "start" and messages[0]["source"] == "mock"
+    bars = [m["i"] for m in messages if m["t"] == "bar"]
+    assert bars == list(range(len(bars)))
+    end = messages[-1]
+    assert end["t"] == "end" and end["bars"] == len(bars)
+    assert end["latency"]["count"] == len(bars)
+    assert end["latency"]["p50_us"] <= end["latency"]["p99_us"] <= end["latency"]["max_us"]
+
+def test_slow_consumer_pauses_the_engine(client, processed_bars, monkeypatch):
+    monkeypatch.setattr(settings, "REPLAY_QUEUE_SIZE", 4)
+    with client.websocket_connect("/api/replay") as ws:
+        # Paced at 50 bars/sec: the engine could otherwise finish ~1300 bars in well under a second
+        ws.send_json({**REQUEST, "speed": 50})
+        received = 0
+        while received < 20:
+            received += ws.receive_json()["t"] == "bar"
+        # The engine may only run ahead by what the bounded queue holds
+        assert processed_bars[0] <= received + settings.REPLAY_QUEUE_SIZE + 2
+        time.sleep(0.3)
+        ws.send_json({"op": "stop"})
+    assert processed_bars[0] < 100
+
+@pytest.mark.parametrize("option", [{"journal": True}, {"low_memory": True}, {"max_points": 100}, {"profile": True}])
+def test_replay_rejects_options_it_does_not_honor(client, option):
+    with client.websocket_connect("/api/replay") as ws:
+        ws.send_json({**REQUEST, **option})
+        message = ws.receive_json()
+    assert message["t"] == "error"
+    assert "replay does not support" in message["detail"][0]["msg"]
+
+def test_latency_histogram_is_bounded_and_close():
+    histogram = LatencyHistogram()
+    for latency in range(1, 100001):
+        histogram.add(float(latency))
+    assert len(histogram.counts) == LatencyHistogram.BUCKETS_PER_DECADE * LatencyHistogram.DECADES + 1
+    summary = histogram.summary()
+    assert summary["count"] == 100000 and summary["max_us"] == 100000.0
+    assert summary["mean_us"] == pytest.approx(50000.5)
+    assert summary["p50_us"] == pytest.approx(50000, rel=0.13)
+    assert summary["p99_us"] == pytest.approx(99000, rel=0.13)
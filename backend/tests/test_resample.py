@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from backend.app.data import resample as resample_module
+from backend.app.data.resample import ResampleCache, build_aggregate
+from backend.app.data.validators import validate_market_data
+from backend.tests.conftest import mock_series
+
+def test_weekly_aggregate_matches_pandas(series):
+    weekly = build_aggregate(series, "weekly").frame
+    expected = series.resample("W-SUN").agg(
+        {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    ).dropna()
+    np.testing.assert_allclose(weekly[["Open", "High", "Low", "Close"]].to_numpy(), expected[["Open", "High", "Low", "Close"]].to_numpy())
+    # Stamped with the week's last trading day, so it is never visible early
+    assert (weekly.index.dayofweek <= 4).all()
+    assert (weekly.index.to_period("W-SUN") == expected.index.to_period("W-SUN")).all()
+
+def test_cache_reuses_aggregate_of_same_series(series):
+    cache = ResampleCache(max_entries=8)
+    first = cache.get(series, "weekly")
+    assert cache.get(series.copy(), "weekly") is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_cache_rebuilds_for_derived_frames(series):
+    cache = ResampleCache(max_entries=8)
+    base = cache.get(series, "weekly")
+
+    # Derived frames inherit the validated frame's attrs (report and fingerprint)
+    for derived in (series * 0.5, series.assign(Close=series["Close"] + 1.0), series.iloc[:-3]):
+        assert derived.attrs.get("validation") == series.attrs["validation"]
+        aggregate = cache.get(derived, "weekly")
+        assert aggregate is not base
+        pd.testing.assert_frame_equal(aggregate.frame, build_aggregate(derived, "weekly").frame)
+
+def test_cache_distinguishes_series_with_same_dates():
+    cache = ResampleCache(max_entries=8)
+    a = cache.get(mock_series(seed=1), "monthly")
+    b = cache.get(mock_series(seed=2), "monthly")
+    assert not np.allclose(a.frame["Close"], b.frame["Close"])
+
+def _fetched(series, start, end):
+    """A date range of `series` as a separate fetch returns it: a new, validated frame."""
+    return validate_market_data(series.loc[start:end].copy(), "TEST")
+
+def test_date_ranges_reuse_one_aggregation(series, monkeypatch):
+    cache = ResampleCache(max_entries=8)
+    cache.get(series, "weekly")
+    builds = []
+    monkeypatch.setattr(resample_module, "build_aggregate", lambda *args: builds.append(args) or build_aggregate(*args))
+
+    # Ranges starting and ending mid-week: the partial edge weeks are recomputed
+    for start, end in (("2016-03-09", "2017-08-16"), ("2018-01-03", "2019-11-27")):
+        sub = _fetched(series, start, end)
+        for _ in range(2):
+            pd.testing.assert_frame_equal(cache.get(sub, "weekly").frame, build_aggregate(sub, "weekly").frame)
+    assert builds == []
+    assert (cache.hits, cache.misses) == (4, 1)
+
+def test_slice_matches_aggregate_of_range(series):
+    monthly = build_aggregate(series, "monthly")
+    expected = build_aggregate(series.loc["2017-02-15":"2018-06-20"], "monthly").frame
+    pd.testing.assert_frame_equal(monthly.slice("2017-02-15", "2018-06-20"), expected)
+    pd.testing.assert_frame_equal(monthly.slice(), monthly.frame)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from backend.app.analytics.metrics import calculate_metrics
+from backend.app.engine import scanner as scanner_module
+from backend.app.engine.backtester import Backtester
+from backend.app.engine.scanner import UniverseScanner
+from backend.app.strategies import strategy_registry
+from backend.tests.conftest import mock_series
+
+STRATEGIES = ["ma_crossover", "rsi_mean_reversion", "momentum"]
+
+@pytest.fixture
+def frames(monkeypatch):
+    full = mock_series("FULL", seed=3)
+    gappy = mock_series("GAPPY", seed=5)
+    # Missing sessions and no bars for the last days of the range
+    gappy = gappy.iloc[np.arange(len(gappy)) % 7 != 3].iloc[:-4]
+    frames = {"FULL": full, "GAPPY": gappy}
+    monkeypatch.setattr(
+        scanner_module.market_data_service, "fetch_many",
+        lambda tickers, *args: {ticker: frames[ticker].copy() for ticker in tickers},
+    )
+    return frames
+
+def test_scanner_matches_engine_on_each_calendar(frames):
+    scanner = UniverseScanner(transaction_cost=0.001, slippage=0.0005, chunk_size=2)
+    rows, errors, stats = scanner.scan(list(frames), "2015-01-01", "2020-12-31", STRATEGIES, {}, 100000.0)
+    assert not errors and len(rows) == len(frames) * len(STRATEGIES)
+
+    for row in rows:
+        data = frames[row["ticker"]]
+        # Each ticker reports its own last bar, not the chunk's latest date
+        assert row["last_date"] == data.index[-1].date()
+        assert row["last_close"] == data["Close"].iloc[-1]
+
+        result = Backtester(strategy_registry[row["strategy"]], data, {}, 100000.0, 0.001, 0.0005).run()
+        expected = calculate_metrics(result["equity_curve"], result["trades"], 100000.0)
+        for name in ("total_return", "cagr", "sharpe_ratio", "volatility", "max_drawdown", "total_trades"):
+            assert row["metrics"][name] == pytest.approx(expected[name], rel=1e-9, abs=1e-12), (row["ticker"], row["strategy"], name)
@@ -0,0 +1,34 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.analytics.metrics import calculate_metrics
+from backend.app.engine.backtester import Backtester
+from backend.app.engine.sensitivity import run_cost_sensitivity
+from backend.app.main import app
+from backend.app.strategies import strategy_registry
+
+COSTS = [0.0, 0.003]
+SLIPPAGES = [0.0, 0.01]
+REQUEST = {"ticker": "SENS", "start_date": "2015-01-01", "end_date": "2019-12-31", "strategy": "ma_crossover"}
+
+@pytest.mark.parametrize("strategy", ["ma_crossover", "rsi_mean_reversion", "momentum"])
+def test_repriced_grid_matches_full_reruns(series, strategy):
+    strategy_cls = strategy_registry[strategy]
+    result = run_cost_sensitivity(strategy_cls, series, {}, COSTS, SLIPPAGES)
+    assert [(p["transaction_cost"], p["slippage"]) for p in result["points"]] == [(c, s) for c in COSTS for s in SLIPPAGES]
+
+    for point in result["points"]:
+        rerun = Backtester(
+            strategy_cls=strategy_cls, data=series, params={},
+            transaction_cost=point["transaction_cost"], slippage=point["slippage"],
+        ).run()
+        expected = calculate_metrics(rerun["equity_curve"], rerun["trades"], 100000.0)
+        for name, value in expected.items():
+            assert point["metrics"][name] == pytest.approx(value, rel=1e-9, abs=1e-9), (point, name)
+
+@pytest.mark.parametrize("option", [{"low_memory": True}, {"max_points": 100}, {"journal": True}, {"profile": True}])
+def test_rejects_options_it_would_ignore(option):
+    response = TestClient(app).post("/api/cost-sensitivity", json={**REQUEST, **option})
+    assert response.status_code == 422
+    assert "cost sensitivity does not support" in response.text
+    assert next(iter(option)) in response.text
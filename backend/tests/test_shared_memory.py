@@ -0,0 +1,132 @@
+import gc
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.data import shared_memory
+from backend.app.data.shared_memory import SharedMarketDataStore, _open_segment, _unlink_segment, segment_name, segment_size
+from backend.app.data.validators import recorded_report
+from backend.tests.conftest import mock_series
+
+pytestmark = pytest.mark.skipif(
+    shared_memory.fcntl is None or not os.path.isdir(shared_memory.SHM_DIR),
+    reason="needs POSIX shared memory",
+)
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(max_bytes: int = 1 << 20, ttl_seconds: float = 0):
+        store = SharedMarketDataStore(max_bytes=max_bytes, ttl_seconds=ttl_seconds, registry_path=str(tmp_path / "registry.json"))
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.clear()
+
+def _key(ticker: str):
+    return ("mock", ticker, "2015-01-01", "2020-12-31")
+
+def _path(store: SharedMarketDataStore, key) -> str:
+    return os.path.join(shared_memory.SHM_DIR, segment_name(key, store.namespace))
+
+def _entry(store: SharedMarketDataStore, key):
+    with open(store.registry_path) as f:
+        return json.load(f)["segments"].get(segment_name(key, store.namespace))
+
+def test_publish_get_round_trip_is_zero_copy(make_store, series):
+    store = make_store()
+    published = store.publish(_key("A"), series, "mock")
+    fetched = store.get(_key("A"))
+
+    # Stored as nanosecond timestamps and float64 values, whatever the source resolution
+    expected = series[list(shared_memory.FIELDS)].astype(np.float64)
+    expected.index = expected.index.as_unit("ns")
+    for frame in (published, fetched):
+        pd.testing.assert_frame_equal(frame, expected, check_freq=False, check_names=False)
+        assert frame.attrs["data_source"] == "mock"
+        assert recorded_report(frame) is not None  # Trusted without revalidating
+    # Both frames are views of the same mapping, which is read-only
+    close = fetched["Close"].to_numpy()
+    assert np.shares_memory(published["Close"].to_numpy(), close)
+    assert not close.flags.writeable
+
+def test_references_are_released_with_the_last_frame(make_store, series):
+    store = make_store()
+    frame = store.publish(_key("A"), series, "mock")
+    view = store.get(_key("A"))
+    assert _entry(store, _key("A"))["refs"] == [os.getpid()]
+
+    del frame
+    gc.collect()
+    store._reap()
+    assert _entry(store, _key("A"))["refs"] == [os.getpid()]  # `view` still maps it
+
+    del view
+    gc.collect()
+    store._reap()
+    assert _entry(store, _key("A"))["refs"] == []
+    assert store.stats()["attached_here"] == 0
+
+def test_least_recently_used_segment_is_evicted_past_the_byte_cap(make_store, series):
+    store = make_store(max_bytes=2 * segment_size(len(series)))
+    for ticker in ("A", "B"):
+        store.publish(_key(ticker), series, "mock")
+        time.sleep(0.01)
+    store.get(_key("A"))  # A is now more recently used than B
+    gc.collect()  # Drop every frame: unreferenced segments are evicted by recency alone
+    store._reap()
+
+    assert store.publish(_key("C"), series, "mock") is not None
+    assert store.get(_key("B")) is None
+    assert not os.path.exists(_path(store, _key("B")))
+    assert store.get(_key("A")) is not None and store.get(_key("C")) is not None
+    assert store.stats()["bytes"] <= store.max_bytes
+
+def test_expired_segments_are_not_served_and_get_unlinked(make_store, series):
+    store = make_store(ttl_seconds=0.2)
+    store.publish(_key("A"), series, "mock")
+    time.sleep(0.3)
+    assert store.get(_key("A")) is None
+    assert store.stats()["segments"] == 0
+    assert not os.path.exists(_path(store, _key("A")))
+
+def test_clear_unlinks_every_segment(make_store, series):
+    store = make_store()
+    frames = [store.publish(_key(ticker), series, "mock") for ticker in ("A", "B")]
+    paths = [_path(store, _key(ticker)) for ticker in ("A", "B")]
+    assert all(os.path.exists(path) for path in paths)
+
+    store.clear()
+    assert not any(os.path.exists(path) for path in paths)
+    assert store.stats()["segments"] == 0
+    # Mapped frames stay readable after the names are gone
+    assert frames[0]["Close"].iloc[-1] == series["Close"].iloc[-1]
+
+def _stale_segment(name: str):
+    _open_segment(name, create=True, size=4096).close()
+    past = time.time() - 10 * shared_memory.ORPHAN_GRACE_SECONDS
+    os.utime(os.path.join(shared_memory.SHM_DIR, name), (past, past))
+
+def test_orphan_sweep_only_reaps_own_namespace(tmp_path):
+    store = SharedMarketDataStore(max_bytes=1 << 20, ttl_seconds=0, registry_path=str(tmp_path / "a.json"))
+    other = SharedMarketDataStore(max_bytes=1 << 20, ttl_seconds=0, registry_path=str(tmp_path / "b.json"))
+    assert store.namespace != other.namespace
+
+    own = store.namespace + "0" * 16
+    foreign = other.namespace + "0" * 16
+    _stale_segment(own)
+    _stale_segment(foreign)
+    try:
+        store.stats()  # Touching the registry runs the cleanup
+        assert not os.path.exists(os.path.join(shared_memory.SHM_DIR, own))
+        assert os.path.exists(os.path.join(shared_memory.SHM_DIR, foreign))
+    finally:
+        _unlink_segment(own)
+        _unlink_segment(foreign)
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from backend.app.strategies import CUSTOM_STRATEGY, StrategyRegistry, strategy_registry
+from backend.app.strategies.base import StrategyBase
+
+STRATEGY_MODULE = '''
+from backend.app.strategies.base import StrategyBase
+
+class {name}(StrategyBase):
+    def initialize(self):
+        pass
+'''
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    """A strategies package with two strategies, a shared module and a broken import."""
+    root = tmp_path / "plugin_strategies"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    (root / "base.py").write_text("raise RuntimeError('shared code is never loaded as a strategy')\n")
+    (root / "alpha.py").write_text(STRATEGY_MODULE.format(name="Alpha"))
+    (root / "beta.py").write_text(STRATEGY_MODULE.format(name="Beta"))
+    (root / "broken.py").write_text("import not_an_installed_package\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "plugin_strategies"
+    for module in [m for m in sys.modules if m.startswith("plugin_strategies")]:
+        del sys.modules[module]
+
+def test_strategies_are_discovered_without_importing_them(package):
+    registry = StrategyRegistry(package=package, group="atss.tests.none")
+    assert sorted(registry) == ["alpha", "beta", "broken"]
+    assert f"{package}.alpha" not in sys.modules
+
+    alpha = registry["alpha"]
+    assert alpha.__name__ == "Alpha" and issubclass(alpha, StrategyBase)
+    assert f"{package}.alpha" in sys.modules and f"{package}.beta" not in sys.modules
+    assert registry["alpha"] is alpha
+
+def test_failed_imports_map_to_none_and_are_not_available(package):
+    registry = StrategyRegistry(package=package, group="atss.tests.none")
+    assert registry["broken"] is None
+    assert registry.available() == ["alpha", "beta"]
+    with pytest.raises(KeyError):
+        registry["missing"]
+
+def test_register_by_path_and_reserved_name(package):
+    registry = StrategyRegistry(package=package, group="atss.tests.none")
+    registry.register("gamma", f"{package}.beta:Beta")
+    assert registry["gamma"] is registry["beta"]
+    with pytest.raises(ValueError, match="reserved"):
+        registry.register(CUSTOM_STRATEGY, f"{package}.alpha:Alpha")
+
+def test_built_in_strategies_are_registered():
+    assert {"ma_crossover", "rsi_mean_reversion", "momentum"} <= set(strategy_registry.available())
+
+def test_importing_the_app_does_not_load_the_engine():
+    code = textwrap.dedent("""
+        import sys
+        import backend.app.main
+        heavy = ("backtrader", "pandas", "numpy", "yfinance", "backend.app.strategies.ma_crossover")
+        print(",".join(module for module in heavy if module in sys.modules))
+    """)
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=Path(__file__).resolve().parents[2],
+    ).stdout.strip()
+    assert loaded == ""
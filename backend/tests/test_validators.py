@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.data.validators import (
+    REQUIRED_COLUMNS, DataValidationError, buffer_identity, fingerprint_frame, recorded_report,
+    stamp_report, validate_frame, validate_market_data,
+)
+from backend.tests.conftest import mock_series
+
+def _raw(series: pd.DataFrame) -> pd.DataFrame:
+    raw = series.copy()
+    raw.attrs = {}
+    return raw
+
+def test_report_carries_a_content_fingerprint(series):
+    report = recorded_report(series)
+    assert report is not None and report["rows"] == len(series)
+    assert report["fingerprint"] == fingerprint_frame(_raw(series), columns=REQUIRED_COLUMNS)
+    # Column order doesn't change the fingerprint (providers differ)
+    assert fingerprint_frame(_raw(series)[REQUIRED_COLUMNS[::-1]]) == fingerprint_frame(_raw(series))
+    assert fingerprint_frame(mock_series(seed=8), columns=REQUIRED_COLUMNS) != report["fingerprint"]
+
+def test_revalidation_reuses_the_recorded_report(series):
+    validated, report = validate_frame(series, "TEST")
+    assert validated is series and report.cached
+
+    restamped = series.copy()
+    stamp_report(restamped)  # Same content on new buffers, as the data service hands out
+    assert recorded_report(restamped) == recorded_report(series)
+
+@pytest.mark.parametrize("derive", [
+    lambda df: df * 0.5,
+    lambda df: df.assign(Close=df["Close"] + 1.0),
+    lambda df: df.iloc[:-3],
+    lambda df: df.copy(),
+    lambda df: df.ffill(),
+])
+def test_derived_frames_lose_the_report(series, derive):
+    derived = derive(series)
+    assert derived.attrs.get("validation") == series.attrs["validation"]  # pandas copies attrs
+    assert buffer_identity(derived) != series.attrs["validated_buffers"]
+    assert recorded_report(derived) is None
+    _, report = validate_frame(derived, "TEST")
+    assert not report.cached
+
+def test_unsorted_and_duplicate_bars_are_fixed_with_one_copy(series):
+    raw = _raw(series.iloc[:50])
+    messy = pd.concat([raw.iloc[10:], raw.iloc[:10], raw.iloc[[5]]])
+    validated, report = validate_frame(messy, "TEST")
+    assert report.resorted and report.duplicates_dropped == 1
+    pd.testing.assert_frame_equal(validated, raw, check_freq=False)
+    assert report.fingerprint == fingerprint_frame(raw, columns=REQUIRED_COLUMNS)
+
+def test_consistency_issues_warn_or_fail_in_strict_mode(series):
+    raw = _raw(series.iloc[:50])
+    raw.iloc[3, raw.columns.get_loc("High")] = raw["Low"].iloc[3] - 1.0
+    _, report = validate_frame(raw, "TEST", strict=False)
+    assert report.issues == {"high_below_open_close": 1}
+    with pytest.raises(DataValidationError, match="failed consistency checks"):
+        validate_frame(raw, "TEST", strict=True)
+
+def test_missing_prices_and_columns_are_rejected(series):
+    raw = _raw(series.iloc[:50])
+    raw.iloc[7, raw.columns.get_loc("Close")] = np.nan
+    with pytest.raises(DataValidationError, match="missing price values"):
+        validate_market_data(raw, "TEST")
+    with pytest.raises(DataValidationError, match="Missing required columns"):
+        validate_market_data(_raw(series).drop(columns="Volume"), "TEST")
@@ -0,0 +1,49 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from backend.app.api.backtest import execute_backtest
+from backend.app.cluster import worker
+from backend.app.data.market_data import MarketDataProvider, market_data_service
+from backend.app.schemas.request import BacktestRequest
+from backend.tests.conftest import mock_series
+
+class CountingProvider(MarketDataProvider):
+    """Serves one fixed series (no data for EMPTY) and counts downloads per ticker."""
+    name = "counting"
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.calls = {}
+
+    def download(self, ticker, start_date, end_date):
+        self.calls[ticker] = self.calls.get(ticker, 0) + 1
+        return pd.DataFrame() if ticker == "EMPTY" else self.frame.copy()
+
+@pytest.fixture
+def provider(monkeypatch):
+    frame = mock_series(seed=11)
+    frame.attrs = {}
+    provider = CountingProvider(frame)
+    monkeypatch.setattr(market_data_service, "provider", provider)
+    yield provider
+    worker._reset_compute_pool()
+
+def _request(ticker: str, short_window: int) -> BacktestRequest:
+    return BacktestRequest(
+        ticker=ticker, start_date="2015-01-01", end_date="2020-12-31", strategy="ma_crossover",
+        parameters={"short_window": short_window, "long_window": 40}, allow_mock_data=False,
+    )
+
+def test_batch_fetches_each_series_once_in_the_parent(provider):
+    requests = [_request("ONCE", window) for window in (5, 10, 20)] + [_request("EMPTY", 5)]
+    items = asyncio.run(worker.execute_locally(list(range(len(requests))), requests))
+
+    assert provider.calls == {"ONCE": 1, "EMPTY": 1}
+    # Pool processes ran on the parent's series: fetching their own would have produced
+    # the mock provider's data instead
+    for item, request in zip(items[:3], requests):
+        assert item["status"] == "ok" and item["data_source"] == "counting"
+        assert item["metrics"] == execute_backtest(request, data=provider.frame.copy())["metrics"]
+    assert items[3]["status"] == "error" and items[3]["error"] == "No data found for ticker: EMPTY"
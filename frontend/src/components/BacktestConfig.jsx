@@ -4,6 +4,9 @@ import ParameterForm from './ParameterForm';
 import RunBacktest from './RunBacktest';
 import { getStrategyDefaults } from '../utils/strategies';
 
+// Points the charts can draw smoothly; the server downsamples longer curves
+const MAX_CHART_POINTS = 2000;
+
 const BacktestConfig = ({ onRunBacktest, isLoading }) => {
     const [ticker, setTicker] = useState('AAPL');
     const [startDate, setStartDate] = useState('2020-01-01');
@@ -38,7 +41,8 @@ const BacktestConfig = ({ onRunBacktest, isLoading }) => {
             end_date: endDate,
             initial_capital: parseFloat(initialCapital),
             strategy,
-            parameters
+            parameters,
+            max_points: MAX_CHART_POINTS
         };
 
         onRunBacktest(payload);
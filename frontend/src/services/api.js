@@ -18,6 +18,7 @@ const api = axios.create({
  * @param {string} payload.strategy - Strategy name
  * @param {number} payload.initial_capital - Starting cash
  * @param {Object} payload.parameters - Strategy parameters
+ * @param {number} [payload.max_points] - Downsample the returned curves to this many points
  * 
  * @returns {Promise<Object>} Backend response data (metrics, equity curve, etc.)
  * @throws {Error} User-friendly error message